@@ -1,15 +1,14 @@
 import os
 from copy import deepcopy
 
-from flask import Flask, request, redirect, session, abort
+import click
+from flask import Flask, request, redirect, abort
 from flask_login import LoginManager
 from flask_wtf.csrf import CSRFProtect, CSRFError
 from werkzeug.local import Local, LocalProxy
 
-import dmapiclient
 from dmutils import init_app
 from dmcontent.content_loader import ContentLoader
-from dmcontent.utils import try_load_manifest, try_load_metadata, try_load_messages
 from dmutils.user import User
 from dmutils.external import external as external_blueprint
 from dmutils.timing import logged_duration
@@ -17,11 +16,15 @@ from dmutils.timing import logged_duration
 from govuk_frontend_jinja.flask_ext import init_govuk_frontend
 
 from config import configs
+from .api_clients import DataAPIClient, SearchAPIClient, get_request_memo
+from .content_loaders import SharedContentLoader, load_framework_content, warm_manifests
+from .content_snapshot import load_content_snapshot
+from . import sessions
 
 
 login_manager = LoginManager()
-data_api_client = dmapiclient.DataAPIClient()
-search_api_client = dmapiclient.SearchAPIClient()
+data_api_client = DataAPIClient()
+search_api_client = SearchAPIClient()
 csrf = CSRFProtect()
 
 # we use our own Local for objects we explicitly want to be able to retain between requests but shouldn't
@@ -29,20 +32,22 @@ csrf = CSRFProtect()
 _local = Local()
 
 
-def _make_content_loader_factory(application, frameworks, initial_instance=None):
-    # for testing purposes we allow an initial_instance to be provided
-    primary_cl = initial_instance if initial_instance is not None else ContentLoader('app/content')
-    for framework_data in frameworks:
-        if not framework_data['slug'] in application.config.get('DM_FRAMEWORK_CONTENT_MAP', {}):
-            if framework_data['framework'] == 'g-cloud':
-                primary_cl.load_manifest(framework_data['slug'], 'services', 'services_search_filters')
-                # we need to be able to display old services, even on expired frameworks
-                primary_cl.load_manifest(framework_data['slug'], 'services', 'display_service')
-                primary_cl.load_manifest(framework_data['slug'], 'services', 'download_results')
-                try_load_metadata(primary_cl, application, framework_data, ['following_framework'])
-            elif framework_data['framework'] == 'digital-outcomes-and-specialists':
-                primary_cl.load_manifest(framework_data['slug'], 'briefs', 'display_brief')
-                try_load_manifest(primary_cl, application, framework_data, 'briefs', 'briefs_search_filters')
+def _make_content_loader_factory(application, frameworks, initial_instance=None, snapshot=None):
+    if snapshot is not None and initial_instance is None:
+        # everything we could need has already been loaded into the snapshot
+        primary_cl = snapshot.content_loader
+    else:
+        # for testing purposes we allow an initial_instance to be provided
+        primary_cl = initial_instance if initial_instance is not None else ContentLoader('app/content')
+        lazy = application.config.get('DM_LAZY_LOAD_CONTENT')
+        load_framework_content(application, primary_cl, frameworks, lazy=lazy)
+
+        if lazy and application.config.get('DM_WARM_CONTENT_IN_BACKGROUND'):
+            warm_manifests(application, primary_cl, frameworks)
+
+    if application.config.get('DM_SHARED_CONTENT_LOADER'):
+        # every thread reads the same manifests, questions and metadata - only messages are loaded per thread
+        return lambda: SharedContentLoader(primary_cl)
 
     # seal primary_cl in a closure by returning a function which will only ever return an independent copy of it.
     # this is of course only guaranteed when the initial_instance argument wasn't used.
@@ -64,8 +69,11 @@ def get_content_loader():
 
 
 content_loader = LocalProxy(get_content_loader)
-from .main.helpers.framework_helpers import get_latest_live_framework
+from .main.helpers.cache_control_helpers import purge_surrogate_keys, set_public_cache_headers
+from .main.helpers.cache_helpers import init_caches
+from .main.helpers.framework_helpers import framework_registry, get_latest_live_framework
 from .main.helpers.search_save_helpers import SavedSearchStateEnum
+from .main.presenters.search_summary import SummaryRules
 
 
 def create_app(config_name):
@@ -74,6 +82,12 @@ def create_app(config_name):
     # allow using govuk-frontend Nunjucks templates
     init_govuk_frontend(application)
 
+    # registered before every other after_request hook so that it runs after them, when it can tell whether the
+    # response sets a cookie
+    application.after_request(set_public_cache_headers)
+    # registered before dmutils' own after_request hooks so that it runs after the one setting the cookie probe
+    application.after_request(sessions.drop_repeated_cookie_probe)
+
     init_app(
         application,
         configs[config_name],
@@ -82,12 +96,20 @@ def create_app(config_name):
         search_api_client=search_api_client,
     )
 
+    sessions.init_app(application)
+    framework_registry.init_app(application)
+    init_caches(application)
+
+    content_snapshot = load_content_snapshot(application)
+
     # replace placeholder _content_loader_factory with properly initialized one
     global _content_loader_factory
     _content_loader_factory = _make_content_loader_factory(
         application,
-        data_api_client.find_frameworks().get('frameworks'),
+        framework_registry.get_frameworks(data_api_client),
+        snapshot=content_snapshot,
     )
+    SummaryRules.load_rules(summary_rules=content_snapshot.summary_rules if content_snapshot else None)
 
     from .metrics import metrics as metrics_blueprint, gds_metrics
     from .main import main as main_blueprint
@@ -130,10 +152,21 @@ def create_app(config_name):
             else:
                 return redirect(request.path[:-1], code=301)
 
-    @application.before_request
-    def refresh_session():
-        session.permanent = True
-        session.modified = True
+    @application.after_request
+    def log_api_request_memo_stats(response):
+        memo = get_request_memo()
+        if memo is not None and memo.hits:
+            application.logger.debug(
+                "Saved {hits} API round-trips ({misses} made) by memoizing identical reads",
+                extra={'hits': memo.hits, 'misses': memo.misses},
+            )
+        return response
+
+    @application.cli.command('purge-edge-cache')
+    @click.argument('keys', nargs=-1, required=True)
+    def purge_edge_cache(keys):
+        """Drops pages tagged with any of KEYS (e.g. service-123, framework-g-cloud-12 or search) from edge caches"""
+        purge_surrogate_keys(*keys)
 
     @application.context_processor
     def inject_saved_search_temp_message_statuses():
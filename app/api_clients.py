@@ -0,0 +1,92 @@
+from copy import deepcopy
+
+from flask import current_app, g, has_request_context
+
+import dmapiclient
+from gds_metrics.metrics import Counter
+
+
+API_REQUEST_MEMO_TOTAL = Counter(
+    'buyer_frontend_api_request_memo_total',
+    'API GET requests answered from (hit) or added to (miss) the per-request memo',
+    ['result'],
+)
+
+
+class RequestMemo(object):
+    """Responses to the GET requests made so far in the current request, and how often they were reused"""
+
+    def __init__(self):
+        self.responses = {}
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self.responses.clear()
+
+
+def _freeze(params):
+    if not params:
+        return ()
+    if hasattr(params, 'lists'):
+        params = params.lists()
+    elif hasattr(params, 'items'):
+        params = params.items()
+
+    return tuple(sorted(
+        (key, tuple(value) if isinstance(value, (list, tuple)) else value)
+        for key, value in params
+    ))
+
+
+def get_request_memo():
+    """Returns the memo for the current request, or None if memoization isn't possible or is disabled"""
+    if not has_request_context() or not current_app.config.get('DM_API_REQUEST_MEMOIZATION'):
+        return None
+
+    if '_api_request_memo' not in g:
+        g._api_request_memo = RequestMemo()
+
+    return g._api_request_memo
+
+
+class RequestMemoizationMixin(object):
+    """
+    Memoizes GET requests for the lifetime of the current Flask request, so identical reads made by a view and the
+    helpers it calls only go to the API once. Any other method is treated as a write and clears the memo, so reads
+    that follow a write always see its effects.
+
+    Responses are deep-copied on the way out because views annotate them in place.
+    """
+
+    def _request(self, method, url, data=None, params=None, *, client_wait_for_response=True):
+        memo = get_request_memo()
+        if memo is None or method != 'GET':
+            if memo is not None:
+                memo.clear()
+            return super()._request(
+                method, url, data=data, params=params, client_wait_for_response=client_wait_for_response
+            )
+
+        key = (self.base_url, url, _freeze(params))
+        if key in memo.responses:
+            memo.hits += 1
+            API_REQUEST_MEMO_TOTAL.labels('hit').inc()
+            return deepcopy(memo.responses[key])
+
+        response = super()._request(
+            method, url, data=data, params=params, client_wait_for_response=client_wait_for_response
+        )
+        memo.misses += 1
+        API_REQUEST_MEMO_TOTAL.labels('miss').inc()
+        memo.responses[key] = deepcopy(response)
+
+        return response
+
+
+class DataAPIClient(RequestMemoizationMixin, dmapiclient.DataAPIClient):
+    pass
+
+
+class SearchAPIClient(RequestMemoizationMixin, dmapiclient.SearchAPIClient):
+    pass
@@ -17,21 +17,33 @@ wrapper should be tagged with ids in a similar vein, e.g. with the prefix `js-dm
 content will change should have the class `js-dm-live-search-fade` to capture the fade in/out used to telegraph new
 content.
 
+Elements that the view can render on their own should also have a `data-live-search-fragment` attribute naming the
+fragment, and a `data-live-search-depends-on` attribute with a space-separated list of the form fields their content
+depends on if that isn't all of them. Only the fragments depending on a field that has changed are asked for.
+
 When the form detects a change, it will post to the form's associated endpoint after injecting a `live-results=true`
-query parameter. The view must intercept this and return a JSON blob with the below structure:
+query parameter, and a `live-results-fragments` query parameter with a comma-separated list of the fragments to
+update. The view must intercept this and return a JSON blob with the below structure, with an entry for each of the
+fragments asked for:
 
 endpoint response (application/json):
   {
     "example-1": {
       "selector": "#example1-selector",
+      "hash": "<hash of HTML>",
       "html": "<HTML>"
     }
     "example-2": {
       "selector": "#example2-selector",
-      "html": "<HTML>"
+      "hash": "<hash of HTML>",
+      "unchanged": true
     }
   }
 
+Once a fragment has been updated, the hash of the HTML now showing is sent back in the next request's
+`live-results-hashes` query parameter, as comma-separated `name:hash` pairs. The view leaves out the HTML of any fragment
+whose hash hasn't changed and marks it as `unchanged` instead.
+
 */
 
 (function ($) {
@@ -48,6 +60,8 @@ endpoint response (application/json):
       this.state = false;
       this.previousState = false;
       this.resultsCache = {};
+      this.fragmentHashes = {};
+      this.fragmentHtml = {};
   
       if(window.history && window.history.pushState && window.history.replaceState) {
         this.$form.find('button.js-dm-live-search').addClass('app-js-hidden');
@@ -127,24 +141,62 @@ endpoint response (application/json):
       return $.param(this.state) !== this.$form.serialize();
     };
   
+    LiveSearch.prototype.changedFields = function changedFields(){
+      var fromState = this.previousState || this.originalState;
+      var changed = {};
+      var serializeField = function(state, name){
+        return $.param($.grep(state, function(field){ return field.name === name; }));
+      };
+  
+      $.each(fromState.concat(this.state), function(i, field){
+        if(!(field.name in changed)){
+          changed[field.name] = serializeField(fromState, field.name) !== serializeField(this.state, field.name);
+        }
+      }.bind(this));
+      return changed;
+    };
+  
+    LiveSearch.prototype.fragmentsToUpdate = function fragmentsToUpdate(){
+      var changed = this.changedFields();
+      var fragments = [];
+  
+      this.$wrapper.find('[data-live-search-fragment]').each(function(i, el){
+        var $el = $(el);
+        var dependsOn = $el.attr('data-live-search-depends-on');
+        var needsUpdate = typeof dependsOn === 'undefined' || $.grep(dependsOn.split(' '), function(name){
+          return changed[name];
+        }).length > 0;
+  
+        if(needsUpdate){
+          fragments.push($el.attr('data-live-search-fragment'));
+        }
+      });
+      return fragments;
+    };
+  
     LiveSearch.prototype.updateResults = function updateResults(){
       this.showLoadingIndicators();
   
       var liveSearch = this;
+      var fragments = this.fragmentsToUpdate().join(',');
       var searchState = $.param(this.state);
       var liveState = this.$form.serializeArray();
-      var cachedResultData = this.cache(searchState);
+      var cachedResultData = this.cache(searchState + '#' + fragments);
   
       liveState.push({'name': 'live-results', 'value': true})
+      liveState.push({'name': 'live-results-fragments', 'value': fragments})
+      liveState.push({'name': 'live-results-hashes', 'value': this.knownHashes(fragments)})
   
       if(typeof(cachedResultData) === 'undefined') {
         return $.ajax({
           url: this.$form.attr('action'),
           data: $.param(liveState),
-          searchState: searchState
+          searchState: searchState,
+          fragments: fragments
   
         }).done(function(response){
-          liveSearch.cache(this.searchState, response);
+          response = liveSearch.fillUnchangedFragments(response);
+          liveSearch.cache(this.searchState + '#' + this.fragments, response);
           liveSearch.displayFilterResults(response, this.searchState);
   
         }).fail(function(response){
@@ -158,6 +210,28 @@ endpoint response (application/json):
       }
     };
   
+    LiveSearch.prototype.knownHashes = function knownHashes(fragments){
+      var hashes = [];
+      $.each(fragments.split(','), function(i, name){
+        if(name in this.fragmentHashes){
+          hashes.push(name + ':' + this.fragmentHashes[name]);
+        }
+      }.bind(this));
+      return hashes.join(',');
+    };
+  
+    LiveSearch.prototype.fillUnchangedFragments = function fillUnchangedFragments(response){
+      // Fragments the page already had come back without their HTML, so put back the copy we kept of it
+      for (var name in response) {
+        if(response[name]['unchanged']){
+          response[name]['html'] = this.fragmentHtml[response[name]['hash']];
+        } else {
+          this.fragmentHtml[response[name]['hash']] = response[name]['html'];
+        }
+      }
+      return response;
+    };
+  
     LiveSearch.prototype.showLoadingIndicators = function showLoadingIndicators() {
       $('div[class=js-dm-live-search-fade]').css('opacity', '0.25')
       $('#js-dm-live-search-info').text('Loading...');
@@ -171,7 +245,10 @@ endpoint response (application/json):
       // The !(state === "") is required for browser versions which trigger the popstate event on first pageload
       if(state == $.param(this.state) && !(state === "")) {
         for (var blockToReplace in response) {
-          this.replaceBlock(response[blockToReplace]['selector'], response[blockToReplace]['html']);
+          if(response[blockToReplace]['hash'] !== this.fragmentHashes[blockToReplace]){
+            this.replaceBlock(response[blockToReplace]['selector'], response[blockToReplace]['html']);
+            this.fragmentHashes[blockToReplace] = response[blockToReplace]['hash'];
+          }
         }
   
         $('div[class=js-dm-live-search-fade]').css('opacity', '1')
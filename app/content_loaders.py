@@ -0,0 +1,212 @@
+from collections import defaultdict
+from collections.abc import Mapping
+from functools import partial
+from threading import Lock, Thread
+
+from dmcontent.content_loader import ContentLoader
+from dmcontent.errors import ContentNotFoundError
+from dmcontent.utils import LazyDict, try_load_manifest, try_load_metadata
+from gds_metrics.metrics import Histogram
+
+
+CONTENT_MANIFEST_LOAD_DURATION = Histogram(
+    'buyer_frontend_content_manifest_load_duration_seconds',
+    'Time taken to load a lazily loaded framework content manifest',
+    ['framework', 'manifest'],
+)
+
+#: Framework statuses whose manifests are warmed up in the background, in the order they are warmed
+WARMUP_FRAMEWORK_STATUSES = ('live', 'standstill', 'pending', 'open', 'coming')
+
+
+class ReadOnlyMapping(Mapping):
+    """
+    A read-only view of a mapping. Unlike `MappingProxyType`, looking up a missing key in it raises a `KeyError` even if
+    the mapping is a `defaultdict`, rather than adding the key to it.
+    """
+
+    def __init__(self, mapping):
+        self._mapping = mapping
+
+    def __getitem__(self, key):
+        if key not in self._mapping:
+            raise KeyError(key)
+        return self._mapping[key]
+
+    def __iter__(self):
+        return iter(self._mapping)
+
+    def __len__(self):
+        return len(self._mapping)
+
+
+class SharedContentLoader(ContentLoader):
+    """
+    A cheap, per-thread view onto a fully populated "primary" `ContentLoader`.
+
+    Manifests, questions and metadata are shared with the primary loader rather than copied, so they must all be
+    loaded into it before any views are created and can't be loaded through a view. Views only see them through
+    read-only mappings, so looking up a framework that isn't there can't add it to the primary's `defaultdict`s for
+    every other view to see.
+
+    Messages are loaded by views on demand, so each view gets its own `_messages` mapping - the message blocks already
+    loaded into the primary are shared, but `load_messages` only ever replaces blocks in the view's own mapping.
+    """
+
+    def __init__(self, primary):
+        self.content_path = primary.content_path
+        self._content = ReadOnlyMapping(primary._content)
+        self._metadata = ReadOnlyMapping(primary._metadata)
+        self._questions = ReadOnlyMapping(primary._questions)
+        self._messages = defaultdict(dict, {
+            framework_slug: dict(blocks) for framework_slug, blocks in primary._messages.items()
+        })
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Shared content is read-only: load it into the primary content loader instead")
+
+    load_manifest = lazy_load_manifests = load_metadata = _read_only
+
+    def get_question(self, framework_slug, question_set, question):
+        if question not in self._questions.get(framework_slug, {}).get(question_set, {}):
+            # `ContentLoader.get_question` would load it into the shared questions
+            raise ContentNotFoundError(
+                "Question {} not loaded for {} {}".format(question, framework_slug, question_set)
+            )
+
+        return super().get_question(framework_slug, question_set, question)
+
+    def get_metadata(self, framework_slug, block, key=None):
+        if framework_slug not in self._metadata:
+            raise ContentNotFoundError(
+                "Metadata file at {} not loaded".format(self._metadata_path(framework_slug, block))
+            )
+
+        return super().get_metadata(framework_slug, block, key)
+
+    def load_messages(self, framework_slug, blocks):
+        # content can't change while the app is running, so there's no need to read a block we already have again
+        if isinstance(blocks, list):
+            blocks = [block for block in blocks if block not in self._messages[framework_slug]]
+
+        super().load_messages(framework_slug, blocks)
+
+
+class LazyManifests(LazyDict):
+    """
+    The manifests of one framework, each generated the first time it's asked for.
+
+    Unlike `LazyDict` this is thread-safe: however many threads ask for a manifest at once, it's only generated once.
+    A manifest that doesn't exist is forgotten, so later lookups fail fast with a `KeyError` like any other unknown
+    manifest.
+    """
+
+    def __init__(self, generate_manifest, framework_slug, manifests_to_question_sets):
+        super().__init__({
+            manifest: partial(generate_manifest, framework_slug, question_set, manifest)
+            for manifest, question_set in manifests_to_question_sets.items()
+        })
+        self.framework_slug = framework_slug
+        self._lock = Lock()
+
+    def __getitem__(self, manifest):
+        value = self._raw_dict[manifest]
+        if callable(value):
+            with self._lock:
+                value = self._raw_dict[manifest]
+                if callable(value):
+                    try:
+                        with CONTENT_MANIFEST_LOAD_DURATION.labels(self.framework_slug, manifest).time():
+                            value = self._raw_dict[manifest] = value()
+                    except ContentNotFoundError:
+                        del self._raw_dict[manifest]
+                        raise
+
+        return value
+
+    def __contains__(self, manifest):
+        # don't trigger loading the manifest like `Mapping.__contains__` would
+        return manifest in self._raw_dict
+
+    def __deepcopy__(self, memo):
+        # manifests are read-only once generated and generating them is thread-safe, so copies can share them
+        return self
+
+    def is_loaded(self, manifest):
+        return manifest in self._raw_dict and not callable(self._raw_dict[manifest])
+
+
+def load_framework_content(application, content_loader, frameworks, lazy=False):
+    """
+    Loads the manifests and metadata the app needs for each of `frameworks` into `content_loader`. If `lazy` is set,
+    manifests are only generated the first time they're used.
+    """
+    for framework_data in frameworks:
+        if not framework_data['slug'] in application.config.get('DM_FRAMEWORK_CONTENT_MAP', {}):
+            if framework_data['framework'] == 'g-cloud':
+                if lazy:
+                    lazy_load_manifests(content_loader, framework_data['slug'], {
+                        'services_search_filters': 'services',
+                        'display_service': 'services',
+                        'download_results': 'services',
+                    })
+                else:
+                    content_loader.load_manifest(framework_data['slug'], 'services', 'services_search_filters')
+                    # we need to be able to display old services, even on expired frameworks
+                    content_loader.load_manifest(framework_data['slug'], 'services', 'display_service')
+                    content_loader.load_manifest(framework_data['slug'], 'services', 'download_results')
+                try_load_metadata(content_loader, application, framework_data, ['following_framework'])
+            elif framework_data['framework'] == 'digital-outcomes-and-specialists':
+                if lazy:
+                    lazy_load_manifests(content_loader, framework_data['slug'], {
+                        'display_brief': 'briefs',
+                        'briefs_search_filters': 'briefs',
+                    })
+                else:
+                    content_loader.load_manifest(framework_data['slug'], 'briefs', 'display_brief')
+                    try_load_manifest(content_loader, application, framework_data, 'briefs', 'briefs_search_filters')
+
+
+def lazy_load_manifests(content_loader, framework_slug, manifests_to_question_sets):
+    """A thread-safe, instrumented version of `ContentLoader.lazy_load_manifests`"""
+    lazy_manifests = LazyManifests(content_loader.generate_manifest, framework_slug, manifests_to_question_sets)
+    lazy_manifests.update(content_loader._content.get(framework_slug, {}))
+    content_loader._content[framework_slug] = lazy_manifests
+
+
+def warm_manifests(application, content_loader, frameworks):
+    """
+    Starts a background thread loading the lazily loaded manifests of all frameworks with one of the
+    `WARMUP_FRAMEWORK_STATUSES`, live frameworks first. Expired frameworks are left to be loaded on first use.
+    """
+    framework_slugs = [
+        framework['slug'] for framework in sorted(
+            (f for f in frameworks if f['status'] in WARMUP_FRAMEWORK_STATUSES),
+            key=lambda f: WARMUP_FRAMEWORK_STATUSES.index(f['status']),
+        )
+    ]
+    thread = Thread(target=_warm_manifests, args=(application, content_loader, framework_slugs), daemon=True)
+    thread.start()
+
+    return thread
+
+
+def _warm_manifests(application, content_loader, framework_slugs):
+    for framework_slug in framework_slugs:
+        manifests = content_loader._content.get(framework_slug)
+        if not isinstance(manifests, LazyManifests):
+            continue
+
+        for manifest in list(manifests):
+            try:
+                manifests[manifest]
+            except ContentNotFoundError:
+                application.logger.info(
+                    "Could not load {manifest} manifest for {framework_slug}",
+                    extra={'manifest': manifest, 'framework_slug': framework_slug},
+                )
+
+    application.logger.info(
+        "Finished warming content manifests for {count} frameworks",
+        extra={'count': len(framework_slugs)},
+    )
@@ -0,0 +1,169 @@
+import hashlib
+import io
+import os
+import pickle
+import sys
+from functools import cached_property
+
+import dmcontent
+import yaml
+from dmcontent.content_loader import ContentLoader
+from dmcontent.utils import TemplateField
+
+from .content_loaders import load_framework_content
+
+
+#: Bump whenever what goes into a snapshot changes, so that older snapshots are ignored
+SNAPSHOT_FORMAT_VERSION = 3
+
+SUMMARY_RULES_PATH = os.path.join(os.path.dirname(__file__), 'main', 'helpers', 'search_summary_manifest.yml')
+
+FRAMEWORK_FAMILIES = ('g-cloud', 'digital-outcomes-and-specialists')
+
+
+class ContentSnapshot(object):
+    """
+    Framework content and search summary rules, loaded once and pickled at build time.
+
+    `version` is the `get_content_version` of the content at `content_path` the snapshot was built from, and
+    `environment` the `get_snapshot_environment` it was built in.
+    """
+
+    def __init__(self, version, environment, content_path, content_loader, summary_rules_path, summary_rules):
+        self.version = version
+        self.environment = environment
+        self.content_path = content_path
+        self.content_loader = content_loader
+        self.summary_rules_path = summary_rules_path
+        self.summary_rules = summary_rules
+
+
+class _SnapshotTemplateField(TemplateField):
+    """A `TemplateField` restored from a snapshot, which only compiles its template when it's first rendered"""
+
+    def __init__(self, source, markdown):
+        self.source = source
+        self.markdown = markdown
+
+    @cached_property
+    def template(self):
+        return self.make_template(self.source)
+
+
+class _SnapshotPickler(pickle.Pickler):
+    def reducer_override(self, obj):
+        # compiled templates can't be pickled, but their source can
+        if isinstance(obj, TemplateField):
+            return _SnapshotTemplateField, (obj.source, obj.markdown)
+        return NotImplemented
+
+
+def get_snapshot_environment():
+    """What, besides the content, determines whether a snapshot can be loaded - checked every time one is"""
+    return f"{SNAPSHOT_FORMAT_VERSION}:{dmcontent.__version__}:{sys.version_info[0]}.{sys.version_info[1]}"
+
+
+def get_content_version(content_path, summary_rules_path=SUMMARY_RULES_PATH):
+    """
+    A hash of the names, sizes and modification times of the content and summary rules files that a snapshot is built
+    from, which changes whenever any of them is edited, added or removed but doesn't need them to be read
+    """
+    version = hashlib.sha256()
+    paths = [summary_rules_path]
+    for root, dirs, filenames in os.walk(os.path.join(content_path, 'frameworks')):
+        dirs.sort()
+        paths.extend(os.path.join(root, filename) for filename in sorted(filenames))
+
+    for path in paths:
+        stat = os.stat(path)
+        version.update(f"{os.path.relpath(path, content_path)}:{stat.st_size}:{stat.st_mtime_ns}\0".encode())
+
+    return version.hexdigest()
+
+
+def get_frameworks_from_content(content_path):
+    """Stand-in `find_frameworks` results for every framework there is content for"""
+    frameworks = []
+    for framework_slug in sorted(os.listdir(os.path.join(content_path, 'frameworks'))):
+        family = next((family for family in FRAMEWORK_FAMILIES if framework_slug.startswith(family)), None)
+        if family:
+            frameworks.append({'slug': framework_slug, 'framework': family, 'status': 'live'})
+
+    return frameworks
+
+
+def build_content_snapshot(application, content_path, snapshot_path, summary_rules_path=SUMMARY_RULES_PATH):
+    """Loads all framework content and the search summary rules, and pickles them to `snapshot_path`"""
+    content_loader = ContentLoader(content_path)
+    frameworks = get_frameworks_from_content(content_path)
+    load_framework_content(application, content_loader, frameworks)
+
+    for framework in frameworks:
+        messages_path = os.path.join(content_path, 'frameworks', framework['slug'], 'messages')
+        if os.path.isdir(messages_path):
+            content_loader.load_messages(framework['slug'], sorted(
+                os.path.splitext(filename)[0] for filename in os.listdir(messages_path) if filename.endswith('.yml')
+            ))
+
+    with open(summary_rules_path) as f:
+        summary_rules = yaml.safe_load(f)
+
+    snapshot = ContentSnapshot(
+        get_content_version(content_path, summary_rules_path),
+        get_snapshot_environment(),
+        content_path,
+        content_loader,
+        summary_rules_path,
+        summary_rules,
+    )
+
+    buffer = io.BytesIO()
+    _SnapshotPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(snapshot)
+    # write atomically so a worker never reads a half-written snapshot
+    with open(f"{snapshot_path}.tmp", 'wb') as f:
+        f.write(buffer.getvalue())
+    os.replace(f"{snapshot_path}.tmp", snapshot_path)
+
+    return snapshot
+
+
+def load_content_snapshot(application):
+    """
+    Returns the snapshot at `DM_CONTENT_SNAPSHOT_PATH`, or None if there isn't one, it was built with a different
+    snapshot format, dmcontent or Python version, or the content has changed since it was built, in which case the
+    content should be loaded from YAML as usual.
+    """
+    snapshot_path = application.config.get('DM_CONTENT_SNAPSHOT_PATH')
+    if not snapshot_path or not os.path.exists(snapshot_path):
+        return None
+
+    try:
+        with open(snapshot_path, 'rb') as f:
+            snapshot = pickle.loads(f.read())
+        environment, content_path, version = snapshot.environment, snapshot.content_path, snapshot.version
+    except (EnvironmentError, pickle.UnpicklingError, AttributeError, ImportError) as e:
+        application.logger.warning(
+            "Failed to load content snapshot {snapshot_path}: {error}",
+            extra={'snapshot_path': snapshot_path, 'error': str(e)},
+        )
+        return None
+
+    if environment != get_snapshot_environment():
+        application.logger.warning(
+            "Ignoring content snapshot {snapshot_path} built for {environment}",
+            extra={'snapshot_path': snapshot_path, 'environment': environment},
+        )
+        return None
+
+    try:
+        content_version = get_content_version(content_path, snapshot.summary_rules_path)
+    except EnvironmentError:
+        content_version = None
+    if version != content_version:
+        application.logger.warning(
+            "Ignoring content snapshot {snapshot_path} as the content in {content_path} has changed since it was built",
+            extra={'snapshot_path': snapshot_path, 'content_path': content_path},
+        )
+        return None
+
+    return snapshot
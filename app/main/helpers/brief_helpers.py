@@ -1,26 +1,55 @@
+from collections import namedtuple
+
+
 SME, LARGE = ['micro', 'small', 'medium'], ['large']
 COMPLETED_BRIEF_RESPONSE_STATUSES = ['submitted', 'pending-awarded', 'awarded']
 ALL_BRIEF_RESPONSE_STATUSES = ['draft', 'submitted', 'pending-awarded', 'awarded']
 PUBLISHED_BRIEF_STATUSES = ['live', 'withdrawn', 'closed', 'awarded', 'cancelled', 'unsuccessful']
 
+_SIZE_GROUPS = {size: group for group, sizes in (("sme", SME), ("large", LARGE)) for size in sizes}
 
-def _count_brief_responses_by_size(brief_responses, size):
-    return len([response for response in brief_responses if response['supplierOrganisationSize'] in size])
 
+BriefResponsesSummary = namedtuple('BriefResponsesSummary', ['counts', 'winning_response', 'completed_supplier_ids'])
+
+
+def summarise_brief_responses(brief_responses, winning_response_id=None):
+    """
+    Everything a brief page needs to know about the brief's responses, from a single pass over them: the counts from
+    `count_brief_responses_by_size_and_status`, the response with id `winning_response_id` (if any) and the ids of the
+    suppliers that have completed a response.
+    """
+    counts = dict.fromkeys((
+        "incomplete_sme_responses",
+        "incomplete_large_responses",
+        "completed_sme_responses",
+        "completed_large_responses",
+    ), 0)
+    winning_response, completed_supplier_ids = None, set()
+
+    for response in brief_responses:
+        if winning_response is None and winning_response_id is not None and response['id'] == winning_response_id:
+            winning_response = response
+
+        if response['status'] == 'draft':
+            stage = "incomplete"
+        elif response['status'] in COMPLETED_BRIEF_RESPONSE_STATUSES:
+            stage = "completed"
+            completed_supplier_ids.add(response['supplierId'])
+        else:
+            continue
+
+        size = _SIZE_GROUPS.get(response['supplierOrganisationSize'])
+        if size:
+            counts[f"{stage}_{size}_responses"] += 1
 
-def count_brief_responses_by_size_and_status(brief_responses):
-    counts = {}
-    incomplete_brief_responses = [response for response in brief_responses if response['status'] == 'draft']
-    completed_brief_responses = [
-        response for response in brief_responses if response['status'] in COMPLETED_BRIEF_RESPONSE_STATUSES
-    ]
-    counts["incomplete_sme_responses"] = _count_brief_responses_by_size(incomplete_brief_responses, SME)
-    counts["incomplete_large_responses"] = _count_brief_responses_by_size(incomplete_brief_responses, LARGE)
     counts["incomplete_responses_total"] = counts["incomplete_sme_responses"] + counts["incomplete_large_responses"]
-    counts["completed_sme_responses"] = _count_brief_responses_by_size(completed_brief_responses, SME)
-    counts["completed_large_responses"] = _count_brief_responses_by_size(completed_brief_responses, LARGE)
     counts["completed_responses_total"] = counts["completed_sme_responses"] + counts["completed_large_responses"]
-    return counts
+
+    return BriefResponsesSummary(counts, winning_response, frozenset(completed_supplier_ids))
+
+
+def count_brief_responses_by_size_and_status(brief_responses):
+    return summarise_brief_responses(brief_responses).counts
 
 
 def format_winning_supplier_size(size):
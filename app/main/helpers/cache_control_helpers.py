@@ -0,0 +1,106 @@
+from functools import wraps
+
+import requests
+from flask import current_app, g, session
+from flask_login import current_user
+
+
+#: Statuses of responses that can be shared between anonymous users
+CACHEABLE_STATUSES = frozenset((200, 304, 410))
+
+
+def surrogate_key(kind, identifier):
+    """The surrogate key for the `kind` (framework, service, supplier, brief) of thing with the given `identifier`"""
+    return '{}-{}'.format(kind, identifier)
+
+
+def add_surrogate_keys(*keys):
+    """Tags the response to the current request with `keys`, so it can be purged from edge caches by any of them"""
+    g.setdefault('surrogate_keys', []).extend(key for key in keys if key not in g.surrogate_keys)
+
+
+def _is_shareable(response):
+    # a response for a logged-in user, or one that's going to set a cookie, must never be shared with anyone else
+    return not (
+        current_user.is_authenticated
+        or current_app.session_interface.should_set_cookie(current_app, session)
+        or '_flashes' in session
+        or 'Set-Cookie' in response.headers
+    )
+
+
+def set_cache_headers(response, policy):
+    """
+    Lets edge caches keep an anonymous user's `response` for the number of seconds `DM_PUBLIC_CACHE_MAX_AGES` gives
+    for `policy`, tagged with the request's surrogate keys and varying on the `DM_PUBLIC_CACHE_VARY` header, so that
+    it's never served to a logged-in user. Browsers are told to check back every time, so that they never show a
+    logged-out page to someone who's since logged in.
+
+    Responses for logged-in users are marked private instead. Other statuses are left alone.
+    """
+    if response.status_code not in CACHEABLE_STATUSES:
+        return response
+
+    shared_max_age = current_app.config['DM_PUBLIC_CACHE_MAX_AGES'].get(policy, 0)
+    if shared_max_age and _is_shareable(response):
+        response.cache_control.public = True
+        response.cache_control.max_age = 0
+        response.cache_control.s_maxage = shared_max_age
+        response.vary.add(current_app.config['DM_PUBLIC_CACHE_VARY'])
+        response.headers['Surrogate-Key'] = ' '.join([policy] + g.get('surrogate_keys', []))
+    else:
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+
+    return response
+
+
+def cache_publicly(policy):
+    """
+    Decorator for public views whose responses to anonymous users edge caches can share, under `policy`. The headers
+    are set by `set_public_cache_headers` once the response is otherwise finished.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            g.cache_policy = policy
+            return view(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def set_public_cache_headers(response):
+    """
+    `after_request` hook that calls `set_cache_headers` for responses from `cache_publicly` views. It must run after
+    every other hook (so be registered before them), so that it sees any cookie they set.
+    """
+    policy = g.get('cache_policy')
+    if policy is None:
+        return response
+
+    return set_cache_headers(response, policy)
+
+
+def purge_surrogate_keys(*keys):
+    """
+    Asks the edge cache at `DM_EDGE_CACHE_PURGE_URL` to drop every response tagged with any of `keys` (or with a
+    policy name, to drop all pages of that kind). Does nothing if there's no edge cache configured.
+    """
+    purge_url = current_app.config.get('DM_EDGE_CACHE_PURGE_URL')
+    if not purge_url or not keys:
+        return False
+
+    response = requests.post(
+        purge_url,
+        headers={
+            'Authorization': 'Bearer {}'.format(current_app.config['DM_EDGE_CACHE_PURGE_TOKEN']),
+            'Surrogate-Key': ' '.join(keys),
+        },
+        timeout=10,
+    )
+    response.raise_for_status()
+    current_app.logger.info("Purged edge cache of {keys}", extra={'keys': ' '.join(keys)})
+
+    return True
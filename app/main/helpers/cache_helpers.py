@@ -0,0 +1,161 @@
+from collections import OrderedDict
+from concurrent.futures import Future
+from threading import Lock
+from time import monotonic
+
+
+_caches = []
+
+
+def init_caches(app):
+    """(Re)configure every cache created with a `ttl_config_key` from the app config, dropping anything cached"""
+    for cache in _caches:
+        cache.init_app(app)
+
+
+class TTLCache(object):
+    """
+    Thread-safe, process-wide mapping whose entries expire `ttl` seconds after they were set.
+
+    The ttl is read from `ttl_config_key` in the app config by `init_app`. A ttl of 0 disables the cache: nothing is
+    stored and `get_or_set` always calls through to `create_value`.
+
+    If `maxsize` (or `maxsize_config_key`) is set, the least recently used entries are dropped to keep the cache to
+    that many entries. Likewise if `maxweight` (or `maxweight_config_key`) is set they're dropped to keep the total
+    `weigh(value)` of the entries (e.g. their size in bytes) to that.
+
+    Concurrent `get_or_set` calls for the same missing key are coalesced: only the first calls `create_value`, and the
+    others wait for and share its result. If `metric` is given, it's a counter labelled with the result of each
+    `get_or_set` call - 'hit', 'miss' or 'coalesced'.
+
+    Cached values are shared between threads and must be treated as read-only.
+    """
+
+    def __init__(
+        self, ttl_config_key=None, ttl=0, maxsize_config_key=None, maxsize=None, metric=None,
+        maxweight_config_key=None, maxweight=None, weigh=None,
+    ):
+        self.ttl_config_key = ttl_config_key
+        self.ttl = ttl
+        self.maxsize_config_key = maxsize_config_key
+        self.maxsize = maxsize
+        self.maxweight_config_key = maxweight_config_key
+        self.maxweight = maxweight
+        self.weigh = weigh
+        self.weight = 0
+        self.metric = metric
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._lock = Lock()
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        if ttl_config_key:
+            _caches.append(self)
+
+    def init_app(self, app):
+        self.ttl = app.config.get(self.ttl_config_key, 0)
+        if self.maxsize_config_key:
+            self.maxsize = app.config.get(self.maxsize_config_key)
+        if self.maxweight_config_key:
+            self.maxweight = app.config.get(self.maxweight_config_key)
+        self.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self._get(key, default)
+
+    def _get(self, key, default):
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] < monotonic():
+            self._pop(key)
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def set(self, key, value):
+        if not self.ttl:
+            return
+        weight = self.weigh(value) if self.weigh is not None else 0
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = (value, monotonic() + self.ttl, weight)
+            self.weight += weight
+            while self._entries and (
+                (self.maxsize is not None and len(self._entries) > self.maxsize)
+                or (self.maxweight is not None and self.weight > self.maxweight)
+            ):
+                self._pop(next(iter(self._entries)))
+
+    def _pop(self, key):
+        # called with the lock held
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.weight -= entry[2]
+
+    def get_or_set(self, key, create_value):
+        if not self.ttl:
+            self._record('miss')
+            return create_value()
+
+        missing = object()
+        with self._lock:
+            value = self._get(key, missing)
+            if value is not missing:
+                result = 'hit'
+            elif key in self._in_flight:
+                result, future = 'coalesced', self._in_flight[key]
+                self.coalesced += 1
+            else:
+                result, future = 'miss', self._in_flight.setdefault(key, Future())
+        self._record(result)
+
+        if result == 'hit':
+            return value
+        if result == 'coalesced':
+            return future.result()
+
+        try:
+            value = create_value()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            self.set(key, value)
+            future.set_result(value)
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+        return value
+
+    def _record(self, result):
+        if self.metric is not None:
+            self.metric.labels(result).inc()
+
+    def invalidate(self, key):
+        with self._lock:
+            self._pop(key)
+
+    def invalidate_where(self, predicate):
+        """Drops every entry whose key matches `predicate`"""
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.weight = 0
+            self.hits = 0
+            self.misses = 0
+            self.coalesced = 0
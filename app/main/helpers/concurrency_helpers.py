@@ -0,0 +1,94 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, wait
+from functools import wraps
+from threading import Lock
+from time import monotonic, perf_counter
+
+from flask import copy_current_request_context, current_app, has_app_context, has_request_context
+
+
+_executors = {}
+_executors_lock = Lock()
+
+
+def get_executor(name, max_workers):
+    """The process-wide thread pool called `name`, created the first time it's asked for"""
+    with _executors_lock:
+        executor = _executors.get((name, max_workers))
+        if executor is None:
+            executor = _executors[(name, max_workers)] = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix=name
+            )
+
+    return executor
+
+
+def _in_current_context(fn):
+    """Wraps `fn` so it runs in (a copy of) the request or app context it was wrapped in"""
+    if has_request_context():
+        return copy_current_request_context(fn)
+
+    if has_app_context():
+        app = current_app._get_current_object()
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with app.app_context():
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return fn
+
+
+def _timed(fn, metric, key):
+    @wraps(fn)
+    def wrapper():
+        start = perf_counter()
+        try:
+            return fn()
+        finally:
+            metric.labels(key).observe(perf_counter() - start)
+
+    return wrapper
+
+
+def call_concurrently(name, calls, max_workers, timeout, metric=None):
+    """
+    Calls each of the zero-argument callables in the `calls` dict on the `name` thread pool, in the current request
+    context, and waits up to `timeout` seconds for them all.
+
+    Returns a dict with the same keys as `calls` of `(result, exception)` pairs, where `exception` is whatever the call
+    raised or a `TimeoutError` if it didn't finish in time (and `result` is then None). Calls that time out are left to
+    finish in the background.
+
+    A `max_workers` of 0 makes the calls one after another in the current thread, with no timeout.
+
+    If given a `metric` (a histogram with one label), records the time each call took in it, labelled by its key.
+    """
+    if metric is not None:
+        calls = {key: _timed(call, metric, key) for key, call in calls.items()}
+
+    outcomes = {}
+    if not max_workers:
+        for key, call in calls.items():
+            try:
+                outcomes[key] = (call(), None)
+            except Exception as e:
+                outcomes[key] = (None, e)
+        return outcomes
+
+    executor = get_executor(name, max_workers)
+    deadline = monotonic() + timeout
+    futures = {key: executor.submit(_in_current_context(call)) for key, call in calls.items()}
+    wait(futures.values(), timeout=timeout)
+
+    for key, future in futures.items():
+        try:
+            outcomes[key] = (future.result(timeout=max(deadline - monotonic(), 0)), None)
+        except TimeoutError as e:
+            future.cancel()
+            outcomes[key] = (None, e)
+        except Exception as e:
+            outcomes[key] = (None, e)
+
+    return outcomes
@@ -0,0 +1,60 @@
+import hashlib
+import json
+
+from flask import current_app, make_response, request, session
+from flask_login import current_user
+
+
+def fingerprint(*parts):
+    """A short hash of `parts` (anything JSON-serializable) that changes whenever any of them do"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(json.dumps(part, sort_keys=True, default=repr).encode('utf-8'))
+        digest.update(b'\0')
+
+    return digest.hexdigest()[:32]
+
+
+def weak_etag(*parts):
+    """
+    A weak ETag for a page that's built from `parts` (anything JSON-serializable), which also covers the version of
+    the app rendering it and the user it's rendered for.
+    """
+    return fingerprint(current_app.config['VERSION'], current_user.get_id(), *parts)
+
+
+def search_results_fingerprint(search_api_response):
+    """The parts of a search API response that end up on a page, for `weak_etag`"""
+    return search_api_response['meta']['total'], search_api_response['documents']
+
+
+def aggregations_fingerprint(aggregations_by_lot):
+    """The lot and category counts from `get_lot_aggregations` that end up on a page (if any), for `weak_etag`"""
+    if aggregations_by_lot is None:
+        return None
+
+    return {
+        lot_slug: None if aggregations is None else aggregations.results
+        for lot_slug, aggregations in aggregations_by_lot.items()
+    }
+
+
+def not_modified_response(etag):
+    """
+    A 304 Not Modified response if the request's `If-None-Match` header includes `etag`, or None if the page should be
+    rendered. Pages with flashed messages waiting to be shown are always rendered.
+    """
+    if '_flashes' in session or not request.if_none_match.contains_weak(etag):
+        return None
+
+    return _tag_response(current_app.response_class(status=304), etag)
+
+
+def tag_response(rv, etag):
+    """Makes a response from the view's return value `rv` and gives it `etag`"""
+    return _tag_response(make_response(rv), etag)
+
+
+def _tag_response(response, etag):
+    response.set_etag(etag, weak=True)
+    return response
@@ -1,15 +1,212 @@
-from functools import lru_cache
+from collections import defaultdict
+from threading import Lock, Thread
+from time import monotonic
+from types import MappingProxyType
 
-from flask import abort
+from flask import abort, current_app
 
-from dmapiclient import HTTPError
+from dmapiclient import APIError, HTTPError
 from dmcontent.errors import ContentNotFoundError
 
 from ... import content_loader
+from .cache_helpers import TTLCache
+
+
+class FrameworkIndex(object):
+    """
+    Immutable lookup tables over one snapshot of the frameworks list, so that finding a framework by slug, family or
+    status doesn't mean scanning the whole (ever-growing) list again.
+    """
+
+    def __init__(self, frameworks):
+        self.frameworks = tuple(frameworks)
+
+        frameworks_by_family = defaultdict(list)
+        frameworks_by_family_and_status = defaultdict(list)
+        for framework in self.frameworks:
+            frameworks_by_family[framework['framework']].append(framework)
+            frameworks_by_family_and_status[(framework['framework'], framework['status'])].append(framework)
+
+        self.by_slug = MappingProxyType({framework['slug']: framework for framework in self.frameworks})
+        self._by_family = {family: tuple(frameworks) for family, frameworks in frameworks_by_family.items()}
+        self._by_family_and_status = {
+            key: tuple(frameworks) for key, frameworks in frameworks_by_family_and_status.items()
+        }
+        self._latest_live = {
+            family: get_latest_live_framework(frameworks, family) for family, frameworks in self._by_family.items()
+        }
+        self._last_live = {
+            family: self._latest_live[family] or max(frameworks, key=lambda f: f['id'])
+            for family, frameworks in self._by_family.items()
+        }
+        self._lots_by_slug = {
+            framework['slug']: MappingProxyType(get_lots_by_slug(framework)) for framework in self.frameworks
+        }
+
+    def get(self, framework_slug):
+        return self.by_slug.get(framework_slug)
+
+    def by_family(self, framework_family):
+        return self._by_family.get(framework_family, ())
+
+    def by_family_and_status(self, framework_family, status):
+        return self._by_family_and_status.get((framework_family, status), ())
+
+    def latest_live(self, framework_family):
+        """The live framework in the family with the highest id, or None"""
+        return self._latest_live.get(framework_family)
+
+    def latest_live_or_404(self, framework_family):
+        latest_live_framework = self.latest_live(framework_family)
+        if not latest_live_framework:
+            abort(404, f"No latest framework found for `{framework_family}` family")
+
+        return latest_live_framework
+
+    def last_live_or_404(self, framework_family):
+        """The latest live framework in the family, falling back to the latest framework if none are live"""
+        if framework_family not in self._last_live:
+            abort(404, f"No frameworks found for `{framework_family}` family")
+
+        return self._last_live[framework_family]
+
+    def lots_by_slug(self, framework_slug):
+        return self._lots_by_slug[framework_slug]
+
+
+class FrameworkRegistry(object):
+    """
+    Process-wide, thread-safe cache of the frameworks list returned by `find_frameworks`.
+
+    A `FrameworkIndex` is built once for each snapshot of the list.
+
+    Once the cached list is older than `ttl` seconds it is still served, but a single background thread is started
+    to fetch a fresh copy (stale-while-revalidate), so only the very first request of a worker ever waits for the API.
+    A `ttl` of 0 disables caching and every call goes straight to the API.
+
+    The frameworks list is shared between all threads and must be treated as read-only.
+    """
+
+    def __init__(self, ttl=0):
+        self.ttl = ttl
+        self._app = None
+        self._lock = Lock()
+        self._fetch_lock = Lock()
+        self._frameworks = None
+        self._index = None
+        self._fetched_at = None
+        self._refreshing = False
+        self._status_change_listeners = []
+
+    def init_app(self, app):
+        self._app = app
+        self.ttl = app.config.get('DM_FRAMEWORKS_CACHE_TTL', 0)
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._frameworks = None
+            self._index = None
+            self._fetched_at = None
+
+    def add_status_change_listener(self, listener):
+        """
+        Registers `listener` to be called with the set of slugs of frameworks whose status changed (or which appeared
+        or disappeared) whenever a refreshed frameworks list differs from the cached one.
+        """
+        self._status_change_listeners.append(listener)
+
+    def get_frameworks(self, data_api_client):
+        return self._get_snapshot(data_api_client)[0]
+
+    def get_index(self, data_api_client):
+        return self._get_snapshot(data_api_client)[1]
+
+    def _get_snapshot(self, data_api_client):
+        if not self.ttl:
+            frameworks = data_api_client.find_frameworks().get('frameworks')
+            return frameworks, FrameworkIndex(frameworks)
+
+        with self._lock:
+            snapshot, fetched_at = (self._frameworks, self._index), self._fetched_at
+
+        if fetched_at is None:
+            # nothing to serve yet - make concurrent cold-start requests share a single fetch
+            with self._fetch_lock:
+                with self._lock:
+                    snapshot, fetched_at = (self._frameworks, self._index), self._fetched_at
+                if fetched_at is None:
+                    snapshot = self._fetch(data_api_client)
+        elif monotonic() - fetched_at > self.ttl:
+            self._refresh_in_background(data_api_client)
+
+        return snapshot
+
+    def _fetch(self, data_api_client):
+        frameworks = data_api_client.find_frameworks().get('frameworks')
+        index = FrameworkIndex(frameworks)
+        with self._lock:
+            previous_frameworks = self._frameworks
+            self._frameworks = frameworks
+            self._index = index
+            self._fetched_at = monotonic()
+
+        if previous_frameworks is not None:
+            previous_statuses = {f['slug']: f['status'] for f in previous_frameworks}
+            statuses = {f['slug']: f['status'] for f in frameworks}
+            changed_slugs = {
+                slug for slug in previous_statuses.keys() | statuses.keys()
+                if previous_statuses.get(slug) != statuses.get(slug)
+            }
+            if changed_slugs:
+                for listener in self._status_change_listeners:
+                    listener(changed_slugs)
+
+        return frameworks, index
+
+    def _refresh_in_background(self, data_api_client):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        Thread(target=self._background_refresh, args=(data_api_client,), daemon=True).start()
+
+    def _background_refresh(self, data_api_client):
+        with self._app.app_context():
+            try:
+                self._fetch(data_api_client)
+            except APIError as e:
+                # keep serving the stale copy, we'll try again on the next request
+                current_app.logger.warning(
+                    "Failed to refresh frameworks: {error}",
+                    extra={'error': str(e)},
+                )
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+
+framework_registry = FrameworkRegistry()
+
+#: Strings derived from framework content, keyed by tuples starting with the framework slug and status so that
+#: entries are never served for a framework once it has changed status
+framework_content_cache = TTLCache('DM_FRAMEWORK_CONTENT_CACHE_TTL')
+framework_registry.add_status_change_listener(
+    lambda changed_slugs: framework_content_cache.invalidate_where(lambda key: key[0] in changed_slugs)
+)
+
+
+def get_frameworks(data_api_client):
+    return framework_registry.get_frameworks(data_api_client)
+
+
+def get_framework_index(data_api_client):
+    return framework_registry.get_index(data_api_client)
 
 
 def get_frameworks_by_slug(data_api_client):
-    return {framework['slug']: framework for framework in data_api_client.find_frameworks().get('frameworks')}
+    return get_framework_index(data_api_client).by_slug
 
 
 def get_latest_live_framework(all_frameworks, framework_family):
@@ -54,16 +251,21 @@ def get_lots_by_slug(framework_data):
     return {lot['slug']: lot for lot in framework_data['lots']}
 
 
-@lru_cache()
 def get_framework_description(data_api_client, framework_family):
-    frameworks = data_api_client.find_frameworks().get('frameworks')
-    framework = get_latest_live_framework(frameworks, framework_family)
+    framework = get_framework_index(data_api_client).latest_live(framework_family)
     if framework is None:
         return ''
 
-    content_loader.load_messages(framework['slug'], ['descriptions'])
+    return framework_content_cache.get_or_set(
+        (framework['slug'], framework['status'], 'descriptions', 'framework'),
+        lambda: _load_framework_description(framework['slug']),
+    )
+
+
+def _load_framework_description(framework_slug):
+    content_loader.load_messages(framework_slug, ['descriptions'])
 
-    return content_loader.get_message(framework['slug'], 'descriptions', 'framework')
+    return content_loader.get_message(framework_slug, 'descriptions', 'framework')
 
 
 def abort_if_not_further_competition_framework(framework):
@@ -0,0 +1,92 @@
+from dmcontent.content_loader import ContentSection
+from dmcontent.questions import Question
+from dmcontent.utils import TemplateField, template_environment
+from gds_metrics.metrics import Counter
+from jinja2 import meta
+
+from ... import content_loader
+from .cache_helpers import TTLCache
+from .etag_helpers import fingerprint
+
+
+FILTERED_MANIFEST_CACHE_TOTAL = Counter(
+    'buyer_frontend_filtered_manifest_cache_total',
+    'Filtered manifests served from (hit), filtered into (miss) or waited for in (coalesced) the filtered manifest '
+    'cache',
+    ['result'],
+)
+
+#: Manifests filtered by `get_filtered_manifest`, keyed by the framework slug, manifest name and a fingerprint of the
+#: values of the fields the filtering depends on, along with the `get_context_fields` of each manifest, keyed by just
+#: its framework slug and name
+filtered_manifest_cache = TTLCache(
+    'DM_FILTERED_MANIFEST_CACHE_TTL',
+    maxsize_config_key='DM_FILTERED_MANIFEST_CACHE_SIZE',
+    metric=FILTERED_MANIFEST_CACHE_TOTAL,
+)
+
+
+class _NotMemoizable(Exception):
+    pass
+
+
+def _collect_context_fields(item, fields):
+    if isinstance(item, TemplateField):
+        fields.update(meta.find_undeclared_variables(template_environment.parse(item.source)))
+    elif isinstance(item, ContentSection):
+        for key, value in object.__getattribute__(item, '__dict__').items():
+            if not key.startswith('_'):
+                _collect_context_fields(value, fields)
+    elif isinstance(item, Question):
+        _collect_context_fields(item._data, fields)
+    elif isinstance(item, dict):
+        if 'dynamic_field' in item:
+            # dynamic lists are expanded from the data itself, so their output isn't fixed by a few fields
+            raise _NotMemoizable()
+        fields.update(depends['on'] for depends in item.get('depends', ()))
+        for value in item.values():
+            _collect_context_fields(value, fields)
+    elif isinstance(item, (list, tuple)):
+        for value in item:
+            _collect_context_fields(value, fields)
+
+
+def get_context_fields(manifest):
+    """
+    The names of the fields of a document that filtering `manifest` by it depends on - those its questions' `depends`
+    rules look at and those its templated text refers to - or None if the filtered manifest depends on more than that.
+    """
+    fields = set()
+    try:
+        _collect_context_fields(manifest.sections, fields)
+    except _NotMemoizable:
+        return None
+
+    return frozenset(fields)
+
+
+def get_filtered_manifest(framework_slug, manifest_name, document):
+    """
+    `content_loader.get_manifest(framework_slug, manifest_name).filter(document)`, shared between all documents that
+    agree on the fields the filtering depends on (usually just the lot) for `DM_FILTERED_MANIFEST_CACHE_TTL` seconds.
+
+    The manifest is filtered by just those fields of `document`, so it's the same whichever of those documents is
+    asked for first. It's shared between requests and must not be modified - `summary` makes a copy.
+    """
+    def get_manifest():
+        # builds a new `ContentManifest` from the loaded content every time
+        return content_loader.get_manifest(framework_slug, manifest_name)
+
+    fields = filtered_manifest_cache.get_or_set(
+        (framework_slug, manifest_name),
+        lambda: get_context_fields(get_manifest()),
+    )
+    if fields is None:
+        return get_manifest().filter(document)
+
+    context = {field: document[field] for field in fields if field in document}
+
+    return filtered_manifest_cache.get_or_set(
+        (framework_slug, manifest_name, fingerprint(context)),
+        lambda: get_manifest().filter(context),
+    )
@@ -1,11 +1,178 @@
+from collections import namedtuple, OrderedDict
+from collections.abc import Mapping
+from copy import deepcopy
+import hashlib
 from math import ceil
 import re
+from time import perf_counter
+from types import MappingProxyType
 from typing import Dict, Sequence
 
 from flask import url_for
-from werkzeug.datastructures import MultiDict
+from werkzeug.datastructures import ImmutableMultiDict, MultiDict
 from werkzeug.urls import Href
 
+from gds_metrics.metrics import Counter, Histogram
+
+from .cache_helpers import TTLCache
+
+
+SEARCH_RESPONSE_CACHE_TOTAL = Counter(
+    'buyer_frontend_search_response_cache_total',
+    'Searches answered from (hit), sent on to the search API by (miss) or waited for in (coalesced) the search '
+    'response cache',
+    ['result'],
+)
+SEARCH_API_SEARCH_DURATION = Histogram(
+    'buyer_frontend_search_api_search_duration_seconds',
+    'Time taken by the search API to answer searches that weren\'t in the search response cache',
+    ['index'],
+)
+
+#: Search API responses keyed by the index, doc type and `SearchQuery` of the search API query
+search_response_cache = TTLCache(
+    'DM_SEARCH_RESPONSE_CACHE_TTL',
+    maxsize_config_key='DM_SEARCH_RESPONSE_CACHE_SIZE',
+    metric=SEARCH_RESPONSE_CACHE_TOTAL,
+)
+
+
+class FilterCatalogue(Mapping):
+    """
+    Read-only filter groups for a lot of a framework, in the form `filters_for_lot` returns them, for sharing between
+    requests. Also holds the sets of allowed (name, value) pairs and radio question ids needed to clean and group
+    request args, so that takes a set lookup per arg rather than a walk of the filters or content.
+    """
+
+    def __init__(self, filter_groups, radio_keys=frozenset()):
+        self._filter_groups = OrderedDict(
+            (key, _freeze_filter_group(filter_group)) for key, filter_group in filter_groups.items()
+        )
+        self.allowed_filters = frozenset(allowed_request_lot_filters(self._filter_groups.values()))
+        self.radio_keys = radio_keys
+
+    def __getitem__(self, key):
+        return self._filter_groups[key]
+
+    def __iter__(self):
+        return iter(self._filter_groups)
+
+    def __len__(self):
+        return len(self._filter_groups)
+
+
+def _freeze_filter_group(filter_group):
+    return MappingProxyType(dict(filter_group, filters=tuple(_freeze_filter(f) for f in filter_group['filters'])))
+
+
+def _freeze_filter(filter_item):
+    if 'children' in filter_item:
+        filter_item = dict(filter_item, children=tuple(_freeze_filter(child) for child in filter_item['children']))
+    return MappingProxyType(filter_item)
+
+
+class SearchQuery(ImmutableMultiDict):
+    """
+    The cleaned args of a search, with keys sorted and repeated values dropped (the order of a key's values is kept),
+    so that any two requests for the same search give equal queries with equal hashes.
+
+    Built once per request with `from_request_args` and passed through the search pipeline in place of the request
+    args, and used as the key for search caches.
+    """
+
+    def __init__(self, mapping=None):
+        pairs = MultiDict(mapping).items(multi=True) if mapping is not None else ()
+        super().__init__(sorted(OrderedDict.fromkeys(pairs), key=lambda pair: pair[0]))
+
+    @classmethod
+    def from_request_args(cls, request_args, lot_filters, lots_by_slug):
+        return cls(clean_request_args(request_args, lot_filters, lots_by_slug))
+
+    @property
+    def lot(self):
+        return self.get('lot')
+
+    @property
+    def keywords(self):
+        return self.get('q', '')
+
+    @property
+    def page(self):
+        """The page asked for, or None if it's missing or not a number"""
+        try:
+            return int(self['page'])
+        except (KeyError, ValueError, TypeError):
+            return None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({list(self.items(multi=True))!r})"
+
+
+LiveResultsFragment = namedtuple('LiveResultsFragment', ('selector', 'template_name'))
+
+#: The parts of a search page that live search can replace, by name, with the element each one replaces and the
+#: template that renders it
+LIVE_RESULTS_FRAGMENTS = OrderedDict((
+    ('results', LiveResultsFragment('#js-dm-live-search-results', 'search/_results_wrapper.html')),
+    ('categories', LiveResultsFragment('#js-dm-live-search-categories', 'search/_categories_wrapper.html')),
+    ('summary', LiveResultsFragment('#js-dm-live-search-summary', 'search/_summary.html')),
+    ('summary-accessible-hint', LiveResultsFragment(
+        '#js-dm-live-search-summary-accessible-hint', 'search/_summary_accessible_hint.html'
+    )),
+    ('save-form', LiveResultsFragment('#js-dm-live-save-search-form', 'search/_services_save_search.html')),
+    ('filter-title', LiveResultsFragment('#js-dm-live-filter-title', 'search/_filter_title.html')),
+))
+
+
+def get_live_results_fragments(request_args, available_fragments):
+    """
+    Returns the names of the live results fragments to render for a live search request: those of
+    `available_fragments` listed in its comma-separated `live-results-fragments` arg, or all of them if it hasn't got
+    one (as sent by older copies of the page's JavaScript). Returns None if it isn't a live search request at all.
+    """
+    if not request_args.get('live-results'):
+        return None
+
+    if 'live-results-fragments' not in request_args:
+        return tuple(available_fragments)
+
+    requested = set(request_args['live-results-fragments'].split(','))
+    return tuple(fragment for fragment in available_fragments if fragment in requested)
+
+
+def get_live_results_hashes(request_args):
+    """
+    The hashes of the fragments a live search request's page is already showing, by fragment name, from its
+    `live-results-hashes` arg of comma-separated `name:hash` pairs.
+    """
+    return dict(
+        pair.split(':', 1) for pair in request_args.get('live-results-hashes', '').split(',') if ':' in pair
+    )
+
+
+def hash_live_results_fragment(html):
+    return hashlib.sha256(html.encode('utf-8')).hexdigest()[:16]
+
+
+def get_live_results(rendered_fragments, known_hashes=None):
+    """
+    The body of the JSON response to a live search request, from the HTML of each of the `LIVE_RESULTS_FRAGMENTS` it
+    asked for by name: the element each one replaces and a hash of its HTML, along with the HTML itself unless its hash
+    is the same as the one in `known_hashes` (in which case it's marked as unchanged).
+    """
+    known_hashes = known_hashes or {}
+    live_results_dict = {}
+    for fragment, html in rendered_fragments.items():
+        fragment_hash = hash_live_results_fragment(html)
+
+        live_results_dict[fragment] = {"selector": LIVE_RESULTS_FRAGMENTS[fragment].selector, "hash": fragment_hash}
+        if known_hashes.get(fragment) == fragment_hash:
+            live_results_dict[fragment]["unchanged"] = True
+        else:
+            live_results_dict[fragment]["html"] = html
+
+    return live_results_dict
+
 
 def get_valid_lot_from_args_or_none(args, all_lots):
     lot = args.get('lot', None)
@@ -44,6 +211,8 @@ def get_request_url_without_any_filters(request, filters, view_name, **kwargs):
 
     all_request_filters.poplist('page')
     all_request_filters.poplist('live-results')
+    all_request_filters.poplist('live-results-fragments')
+    all_request_filters.poplist('live-results-hashes')
 
     search_link_builder = Href(url_for('.{}'.format(view_name), **kwargs))
     url = search_link_builder(all_request_filters)
@@ -93,7 +262,10 @@ def clean_request_args(request_args, lot_filters, lots_by_slug, for_aggregation=
     'lot' is only kept if the value is a valid lot.
 
     """
-    allowed_filters = allowed_request_lot_filters(lot_filters)
+    allowed_filters = (
+        lot_filters.allowed_filters if isinstance(lot_filters, FilterCatalogue)
+        else allowed_request_lot_filters(lot_filters)
+    )
 
     clean_args = MultiDict([
         f for f in request_args.items(multi=True)
@@ -115,7 +287,7 @@ def clean_request_args(request_args, lot_filters, lots_by_slug, for_aggregation=
     return clean_args
 
 
-def group_request_filters(request_filters, content_builder):
+def group_request_filters(request_filters, content_builder, radio_keys=None):
     """Groups filters using ','/& according to question type.
 
     * Questions of type "radios" result in OR filters - there's only one
@@ -130,7 +302,7 @@ def group_request_filters(request_filters, content_builder):
     """
     filter_query = {}
     for key, values in request_filters.lists():
-        if is_radio_type(content_builder, key):
+        if is_radio_type(content_builder, key, radio_keys):
             filter_query[key] = ','.join(values)
         elif len(values) == 1:
             filter_query[key] = values[-1]
@@ -140,14 +312,14 @@ def group_request_filters(request_filters, content_builder):
     return filter_query
 
 
-def ungroup_request_filters(request_filters, content_builder):
+def ungroup_request_filters(request_filters, content_builder, radio_keys=None):
     """Carries out the inverse of the above method which is required when going from search api url parameters
     to frontend url parameters. Where group_request_filters takes request_filters as a MultiDict, this method
     takes request_filters as a tuple of tuple pairs ((param_name, param_value), ...)"""
     filter_query = []
 
     for key, value in request_filters:
-        if is_radio_type(content_builder, key):
+        if is_radio_type(content_builder, key, radio_keys):
             if ',' in value:
                 for value in value.split(','):
                     filter_query.append((key, value))
@@ -159,14 +331,30 @@ def ungroup_request_filters(request_filters, content_builder):
     return tuple(filter_query)
 
 
-def is_radio_type(content_builer, key):
+def is_radio_type(content_builer, key, radio_keys=None):
+    """`radio_keys` can be the set returned by `get_radio_keys` for `content_builer`, to save searching its questions"""
     if key == 'lot':
         return True
 
+    if radio_keys is not None:
+        return key in radio_keys
+
     question = content_builer.get_question(key) or {}
     return question.get('type') == 'radios'
 
 
+def get_radio_keys(content_builder):
+    """Returns the set of all keys other than 'lot' that `is_radio_type` is true for with `content_builder`"""
+    keys = set()
+    for section in content_builder.sections:
+        for question in section.questions:
+            keys.add(question.id)
+            keys.update(question.get_question_ids())
+            keys.update((question.get('fields') or {}).values())
+
+    return frozenset(key for key in keys if key != 'lot' and is_radio_type(content_builder, key))
+
+
 def replace_g5_search_dots(keywords_query):
     """Replaces '.' with '-' in G5 service IDs to support old ID search format."""
 
@@ -207,8 +395,28 @@ def build_search_query(request_args, lot_filters, content_builder, lots_by_slug,
         lots_by_slug,
         for_aggregation=for_aggregation
     )
+    radio_keys = lot_filters.radio_keys if isinstance(lot_filters, FilterCatalogue) else None
+
+    return group_request_filters(query, content_builder, radio_keys=radio_keys)
+
+
+def search_with_cache(search_api_client, index, doc_type, **query):
+    """
+    `search_api_client.search`, with the response kept for `DM_SEARCH_RESPONSE_CACHE_TTL` seconds so popular searches
+    don't go to the search API every time, and identical searches made at the same time sharing a single request.
+
+    Views annotate the response in place, so every caller gets its own copy.
+    """
+    def search():
+        start = perf_counter()
+        try:
+            return search_api_client.search(index=index, doc_type=doc_type, **query)
+        finally:
+            SEARCH_API_SEARCH_DURATION.labels(index).observe(perf_counter() - start)
+
+    response = search_response_cache.get_or_set((index, doc_type, SearchQuery(query)), search)
 
-    return group_request_filters(query, content_builder)
+    return deepcopy(response) if search_response_cache.ttl else response
 
 
 def query_args_for_pagination(args: MultiDict) -> Dict[str, Sequence[str]]:
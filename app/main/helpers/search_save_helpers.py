@@ -5,8 +5,8 @@ from werkzeug.datastructures import MultiDict
 
 from app import content_loader
 from app.main.helpers.framework_helpers import get_lots_by_slug
-from app.main.helpers.search_helpers import clean_request_args
-from app.main.presenters.search_presenters import filters_for_lot
+from app.main.helpers.search_helpers import SearchQuery
+from app.main.presenters.search_presenters import get_filter_catalogue, get_framework_radio_keys
 from app.main.presenters.search_summary import SearchSummary
 from .search_helpers import ungroup_request_filters
 from ..helpers.shared_helpers import construct_url_from_base_and_params
@@ -30,12 +30,14 @@ class SearchMeta(object):
 
         # We need to get buyer-frontend query params from our saved search API URL.
         search_query_params = search_api_client.get_frontend_params_from_search_api_url(search_api_url)
-        search_query_params = ungroup_request_filters(search_query_params, content_manifest)
+        search_query_params = ungroup_request_filters(
+            search_query_params, content_manifest, radio_keys=get_framework_radio_keys(framework, content_manifest)
+        )
         search_query_params_multidict = MultiDict(search_query_params)
 
         current_lot_slug = search_query_params_multidict.get('lot', None)
-        filters = filters_for_lot(current_lot_slug, content_manifest, all_lots=framework['lots'])
-        clean_request_query_params = clean_request_args(search_query_params_multidict, filters.values(), lots_by_slug)
+        filters = get_filter_catalogue(framework, current_lot_slug, content_manifest)
+        clean_request_query_params = SearchQuery.from_request_args(search_query_params_multidict, filters, lots_by_slug)
 
         # Now build the buyer-frontend URL representing the saved Search API URL
         self.url = construct_url_from_base_and_params(url_for('main.search_services'), search_query_params)
@@ -44,7 +46,7 @@ class SearchMeta(object):
         search_api_response = search_api_client._get(search_api_url)
         self.search_summary = SearchSummary(
             search_api_response['meta']['total'],
-            clean_request_query_params.copy(),
+            clean_request_query_params,
             filters.values(),
             lots_by_slug
         )
@@ -0,0 +1,58 @@
+from flask import session
+from flask_login import current_user
+from gds_metrics.metrics import Counter
+
+from .cache_helpers import TTLCache
+from .etag_helpers import fingerprint
+
+
+SERVICE_PAGE_CACHE_TOTAL = Counter(
+    'buyer_frontend_service_page_cache_total',
+    'Service pages served from (hit), rendered into (miss) or waited for in (coalesced) the rendered service page '
+    'cache',
+    ['result'],
+)
+
+#: `(html, status_code)` of rendered service pages, keyed by `service_page_cache_key` and weighed by the size of their
+#: html in bytes. There's one of these in each worker, so nothing purges it from outside: a page is rendered again as
+#: soon as anything in its key changes, and `flask purge-edge-cache service-<id> supplier-<id>` purges edge caches
+rendered_service_page_cache = TTLCache(
+    'DM_SERVICE_PAGE_CACHE_TTL',
+    maxsize_config_key='DM_SERVICE_PAGE_CACHE_SIZE',
+    maxweight_config_key='DM_SERVICE_PAGE_CACHE_MAX_BYTES',
+    weigh=lambda page: len(page[0].encode('utf-8')),
+    metric=SERVICE_PAGE_CACHE_TOTAL,
+)
+
+
+def service_page_cache_key(service, framework, declaration, supplier, *parts):
+    """
+    Identifies a service page by its service and supplier ids and versions of everything it's built from: the `service`
+    API response's `updatedAt` and made-unavailable event, fingerprints of the `framework` record (its status, dates,
+    lots and so on), the supplier's `declaration` and `supplier` record, and any other `parts` the page depends on.
+    """
+    service_data = service['services']
+    return (
+        str(service_data['id']),
+        str(service_data['supplierId']),
+        service_data.get('updatedAt'),
+        fingerprint(service.get('serviceMadeUnavailableAuditEvent')),
+        framework['slug'],
+        fingerprint(framework),
+        fingerprint(declaration),
+        fingerprint(supplier),
+        fingerprint(*parts),
+    )
+
+
+def get_or_render_service_page(key, render):
+    """
+    The `(html, status_code)` of the service page identified by `key` from the rendered service page cache, or from
+    calling `render` (and caching it) if it's not there.
+
+    Pages for logged-in users, or with flashed messages waiting to be shown, are always rendered.
+    """
+    if current_user.is_authenticated or '_flashes' in session:
+        return render()
+
+    return rendered_service_page_cache.get_or_set(key, render)
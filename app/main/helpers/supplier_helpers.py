@@ -0,0 +1,29 @@
+from gds_metrics.metrics import Counter
+
+from .cache_helpers import TTLCache
+
+
+SUPPLIER_CACHE_TOTAL = Counter(
+    'buyer_frontend_supplier_cache_total',
+    'Supplier records served from (hit), fetched into (miss) or waited for in (coalesced) the supplier cache',
+    ['result'],
+)
+
+#: `data_api_client.get_supplier` responses, keyed by the supplier id as a string
+supplier_cache = TTLCache(
+    'DM_SUPPLIER_CACHE_TTL',
+    maxsize_config_key='DM_SUPPLIER_CACHE_SIZE',
+    metric=SUPPLIER_CACHE_TOTAL,
+)
+
+
+def get_supplier(data_api_client, supplier_id):
+    """
+    `data_api_client.get_supplier`, with the response kept for `DM_SUPPLIER_CACHE_TTL` seconds and shared between
+    service and supplier pages, so a crawl through one supplier's services fetches the supplier once. Requests for the
+    same supplier made at the same time share a single API call.
+
+    Each worker has its own copy, so changes to a supplier show up on its pages within `DM_SUPPLIER_CACHE_TTL` seconds
+    rather than straight away. The response is shared between requests and must not be modified.
+    """
+    return supplier_cache.get_or_set(str(supplier_id), lambda: data_api_client.get_supplier(supplier_id))
@@ -1,10 +1,22 @@
 from collections import OrderedDict
+from concurrent.futures import TimeoutError
+from time import perf_counter
 
+from flask import current_app
 from werkzeug.datastructures import MultiDict
 
-from ..helpers.framework_helpers import get_lots_by_slug
+from dmapiclient import APIError
+from dmutils.filters import capitalize_first
+from gds_metrics.metrics import Counter, Histogram
+
+from ..helpers.cache_helpers import TTLCache
+from ..helpers.concurrency_helpers import call_concurrently
+from ..helpers.framework_helpers import framework_content_cache, get_lots_by_slug
 from ..helpers.search_helpers import (
+    FilterCatalogue,
+    SearchQuery,
     get_filters_from_request,
+    get_radio_keys,
     get_valid_lot_from_args_or_none,
     get_filter_value_from_question_option,
     build_search_query,
@@ -13,6 +25,31 @@ from ..helpers.search_helpers import (
 from ..presenters.search_results import AggregationResults
 
 
+SEARCH_AGGREGATION_DURATION = Histogram(
+    'buyer_frontend_search_aggregation_duration_seconds',
+    'Time taken by the search API aggregation request for each lot in the lots and categories tree',
+    ['lot'],
+)
+SEARCH_AGGREGATION_FAILURES_TOTAL = Counter(
+    'buyer_frontend_search_aggregation_failures_total',
+    'Lot aggregations whose counts were shown as unavailable because the search API errored or was too slow',
+    ['lot', 'reason'],
+)
+SEARCH_AGGREGATION_CACHE_TOTAL = Counter(
+    'buyer_frontend_search_aggregation_cache_total',
+    'Lot aggregations answered from (hit), added to (miss) or waited for in (coalesced) the aggregation cache',
+    ['result'],
+)
+
+#: `AggregationResults` keyed by the index, doc type, fields aggregated on and `SearchQuery` of the search API query,
+#: so paging or re-sorting results, which don't change the counts, doesn't ask the search API for them again
+search_aggregation_cache = TTLCache(
+    'DM_SEARCH_AGGREGATION_CACHE_TTL',
+    maxsize_config_key='DM_SEARCH_AGGREGATION_CACHE_SIZE',
+    metric=SEARCH_AGGREGATION_CACHE_TOTAL,
+)
+
+
 def sections_for_lot(lot, builder, all_lots=[]):
     if lot is None or lot == 'all':
         for lot_slug in [x['slug'] for x in all_lots]:
@@ -43,6 +80,45 @@ def filters_for_lot(lot, builder, all_lots=[]):
     return lot_filters
 
 
+def get_filter_catalogue(framework, lot, content_manifest):
+    """
+    Returns a `FilterCatalogue` of the filter groups `filters_for_lot` would build for `lot` of `framework` from
+    `content_manifest`. These are only built once per framework and lot and are shared between requests, so they're
+    read-only - use `copy_filter_groups` to get a copy that can be annotated with the state of the current request.
+    """
+    lot_slugs = tuple(framework_lot['slug'] for framework_lot in framework['lots'])
+    return framework_content_cache.get_or_set(
+        (framework['slug'], framework['status'], 'filters', lot, lot_slugs),
+        lambda: FilterCatalogue(
+            filters_for_lot(lot, content_manifest, all_lots=framework['lots']),
+            radio_keys=get_framework_radio_keys(framework, content_manifest),
+        ),
+    )
+
+
+def get_framework_radio_keys(framework, content_manifest):
+    """The `get_radio_keys` of a framework's search filters `content_manifest`, only worked out once"""
+    return framework_content_cache.get_or_set(
+        (framework['slug'], framework['status'], 'radio_keys'),
+        lambda: get_radio_keys(content_manifest),
+    )
+
+
+def copy_filter_groups(filter_catalogue):
+    """Returns a mutable copy of the filter groups in `filter_catalogue`, in the form `filters_for_lot` returns them"""
+    return OrderedDict(
+        (key, dict(filter_group, filters=[_copy_filter(f) for f in filter_group['filters']]))
+        for key, filter_group in filter_catalogue.items()
+    )
+
+
+def _copy_filter(filter_item):
+    filter_copy = dict(filter_item)
+    if 'children' in filter_copy:
+        filter_copy['children'] = [_copy_filter(child) for child in filter_copy['children']]
+    return filter_copy
+
+
 def filters_for_question(question):
     question_filters = []
     if question['type'] == 'boolean':
@@ -96,6 +172,16 @@ def set_filter_states(filter_groups, request):
                 )
 
 
+def set_filter_display_attributes(filter_groups):
+    """Capitalises each filter's label, and sets the `text` and `attributes` that GOV.UK components use"""
+    for filter_group in filter_groups:
+        for filter_item in filter_group['filters']:
+            if 'label' in filter_item:
+                filter_item['label'] = capitalize_first(filter_item['label'])
+                filter_item['text'] = capitalize_first(filter_item['label'])
+            filter_item['attributes'] = {"aria-controls": "search-summary-accessible-hint-wrapper"}
+
+
 def _get_category_filter_key_set(category_filter_group):
     """
     Returns the set of keys used in the category filter group. In practice
@@ -112,10 +198,9 @@ def _get_category_filter_key_set(category_filter_group):
     return keys
 
 
-def _get_aggregations_for_lot_with_filters(
-    lot, content_manifest, framework, cleaned_request_args, doc_type, index, search_api_client
-):
-    filters = filters_for_lot(lot, content_manifest, all_lots=framework['lots'])
+def _get_aggregation_query(lot, content_manifest, framework, cleaned_request_args):
+    """Returns the fields to aggregate on and the search API query for the aggregations for a single lot"""
+    filters = get_filter_catalogue(framework, lot, content_manifest)
     lots_by_slug = get_lots_by_slug(framework)
 
     aggregate_request_args = cleaned_request_args.copy()
@@ -127,30 +212,160 @@ def _get_aggregations_for_lot_with_filters(
 
     aggregate_request_args['lot'] = lot
 
-    aggregate_api_response = search_api_client.aggregate(
-        index=index,
-        doc_type=doc_type,
-        aggregations=aggregate_on_fields,
-        **build_search_query(
-            aggregate_request_args,
-            filters.values(),
-            content_manifest,
-            lots_by_slug,
-            for_aggregation=True
-        )
+    return aggregate_on_fields, build_search_query(
+        aggregate_request_args,
+        filters,
+        content_manifest,
+        lots_by_slug,
+        for_aggregation=True
+    )
+
+
+def _aggregate(search_api_client, index, doc_type, lot_slugs, aggregations, query):
+    return search_aggregation_cache.get_or_set(
+        (index, doc_type, frozenset(aggregations), SearchQuery(query)),
+        lambda: _request_aggregations(search_api_client, index, doc_type, lot_slugs, aggregations, query),
     )
 
+
+def _request_aggregations(search_api_client, index, doc_type, lot_slugs, aggregations, query):
+    start = perf_counter()
+    try:
+        aggregate_api_response = search_api_client.aggregate(
+            index=index,
+            doc_type=doc_type,
+            aggregations=aggregations,
+            **query
+        )
+    finally:
+        SEARCH_AGGREGATION_DURATION.labels(','.join(lot_slugs)).observe(perf_counter() - start)
+
     return AggregationResults(aggregate_api_response)
 
 
+def _get_aggregations_for_lot_with_filters(
+    lot, content_manifest, framework, cleaned_request_args, doc_type, index, search_api_client
+):
+    aggregate_on_fields, query = _get_aggregation_query(lot, content_manifest, framework, cleaned_request_args)
+
+    return _aggregate(search_api_client, index, doc_type, (lot,), aggregate_on_fields, query)
+
+
+def _get_aggregation_calls(lots, current_lot_slug, content_manifest, framework, cleaned_request_args, doc_type,
+                           index, search_api_client):
+    """
+    Returns a dict of the aggregation requests to make for `lots`, keyed by the tuple of the lots each one is for.
+
+    With `DM_SEARCH_AGGREGATION_BATCHING` set, lots other than the current one only need their own count, so those
+    whose queries are otherwise the same are counted by a single request filtered on all of them and aggregated on
+    'lot'. The current lot still gets a request of its own, as its categories are counted too.
+    """
+    if not current_app.config.get('DM_SEARCH_AGGREGATION_BATCHING'):
+        return {
+            (lot['slug'],): (
+                lambda lot_slug=lot['slug']: _get_aggregations_for_lot_with_filters(
+                    lot_slug, content_manifest, framework, cleaned_request_args, doc_type, index, search_api_client
+                )
+            )
+            for lot in lots
+        }
+
+    calls, batches = {}, OrderedDict()
+    for lot in lots:
+        aggregate_on_fields, query = _get_aggregation_query(
+            lot['slug'], content_manifest, framework, cleaned_request_args
+        )
+        if lot['slug'] == current_lot_slug or 'lot' not in query:
+            calls[(lot['slug'],)] = (
+                lambda lot_slug=lot['slug'], aggregations=aggregate_on_fields, query=query: _aggregate(
+                    search_api_client, index, doc_type, (lot_slug,), aggregations, query
+                )
+            )
+        else:
+            batches.setdefault(SearchQuery(dict(query, lot=[])), (query, []))[1].append(lot['slug'])
+
+    for query, lot_slugs in batches.values():
+        calls[tuple(lot_slugs)] = (
+            lambda lot_slugs=tuple(lot_slugs), query=dict(query, lot=','.join(lot_slugs)): _aggregate(
+                search_api_client, index, doc_type, lot_slugs, {'lot'}, query
+            )
+        )
+
+    return calls
+
+
+def _get_aggregations_by_lot(lots, current_lot_slug, content_manifest, framework, cleaned_request_args, doc_type,
+                             index, search_api_client):
+    """
+    Makes the aggregation requests for the lots concurrently, so the tree takes as long as the slowest request rather
+    than all of them. Returns a dict of `AggregationResults` by lot slug, with None for lots whose request failed or
+    took longer than `DM_SEARCH_AGGREGATION_TIMEOUT` - their counts are shown as unavailable rather than failing the
+    page. If a request for several lots at once fails, those lots are retried one at a time.
+    """
+    def get_outcomes(calls):
+        return call_concurrently(
+            'search-aggregation',
+            calls,
+            max_workers=current_app.config['DM_SEARCH_AGGREGATION_WORKERS'],
+            timeout=current_app.config['DM_SEARCH_AGGREGATION_TIMEOUT'],
+        )
+
+    outcomes = get_outcomes(_get_aggregation_calls(
+        lots, current_lot_slug, content_manifest, framework, cleaned_request_args, doc_type, index, search_api_client
+    ))
+
+    failed_batches = [
+        lot_slugs for lot_slugs, (aggregations, error) in outcomes.items()
+        if len(lot_slugs) > 1 and isinstance(error, APIError)
+    ]
+    if failed_batches:
+        current_app.logger.warning(
+            "Batched search API aggregation for lots {lots} failed, falling back to one request per lot",
+            extra={'lots': ';'.join(','.join(lot_slugs) for lot_slugs in failed_batches)},
+        )
+        for lot_slugs in failed_batches:
+            del outcomes[lot_slugs]
+        outcomes.update(get_outcomes({
+            (lot_slug,): (
+                lambda lot_slug=lot_slug: _get_aggregations_for_lot_with_filters(
+                    lot_slug, content_manifest, framework, cleaned_request_args, doc_type, index, search_api_client
+                )
+            )
+            for lot_slugs in failed_batches for lot_slug in lot_slugs
+        }))
+
+    aggregations_by_lot = {}
+    for lot_slugs, (aggregations, error) in outcomes.items():
+        if isinstance(error, (APIError, TimeoutError)):
+            reason = 'timeout' if isinstance(error, TimeoutError) else 'error'
+            for lot_slug in lot_slugs:
+                SEARCH_AGGREGATION_FAILURES_TOTAL.labels(lot_slug, reason).inc()
+            current_app.logger.warning(
+                "Search API aggregation for lot {lot} failed ({reason}): {error}",
+                extra={'lot': ','.join(lot_slugs), 'reason': reason, 'error': str(error)},
+            )
+        elif error is not None:
+            raise error
+        aggregations_by_lot.update((lot_slug, aggregations) for lot_slug in lot_slugs)
+
+    return aggregations_by_lot
+
+
+def _get_service_count(aggregations, aggregation, key):
+    """The count for `key` in one of a lot's aggregations, or None if they're unavailable"""
+    if aggregations is None:
+        return None
+    return aggregations.results.get(aggregation, {}).get(key, 0)
+
+
 def _build_base_url_args(request_args, content_manifest, framework, lot_slug):
     """Returns a copy of request.args (MultiDict) with filters cleaned for the specified lot"""
     url_args = request_args.copy()
 
-    filters = filters_for_lot(lot_slug, content_manifest, all_lots=framework['lots'])
+    filters = get_filter_catalogue(framework, lot_slug, content_manifest)
     lots_by_slug = get_lots_by_slug(framework)
 
-    url_args = clean_request_args(url_args, filters.values(), lots_by_slug)
+    url_args = clean_request_args(url_args, filters, lots_by_slug)
 
     return url_args
 
@@ -176,9 +391,21 @@ def _update_base_url_args_for_lot_and_category(url_args, keys_to_remove, lot_slu
     return url_args
 
 
+def get_lot_aggregations(framework, lots, cleaned_request_args, content_manifest, doc_type, index, search_api_client):
+    """
+    The `AggregationResults` for each of `lots` by lot slug (None where they're unavailable) that
+    `build_lots_and_categories_link_tree` takes its counts from, for views that need them before building the tree.
+    """
+    current_lot_slug = get_valid_lot_from_args_or_none(cleaned_request_args, [lot['slug'] for lot in lots])
+
+    return _get_aggregations_by_lot(
+        lots, current_lot_slug, content_manifest, framework, cleaned_request_args, doc_type, index, search_api_client
+    )
+
+
 def build_lots_and_categories_link_tree(
     framework, lots, category_filter_group, request, cleaned_request_args,
-    content_manifest, doc_type, index, search_link_builder, search_api_client
+    content_manifest, doc_type, index, search_link_builder, search_api_client, aggregations_by_lot=None
 ):
     """
     Equivalent of set_filter_states but for where we are creating a tree of links i.e. the
@@ -197,6 +424,7 @@ def build_lots_and_categories_link_tree(
     :param search_link_builder: a werkzeug Href object instanciated with the view that the category tree links should
                                 link to as its base. It can be called with any number of positional and keyword
                                 arguments which than are used to assemble the full URL.
+    :param aggregations_by_lot: the `get_lot_aggregations` for `lots`, if they've already been fetched
     :return: list of selected category and lot filters, starting with the 'all categories' root node
     """
     current_lot_slug = get_valid_lot_from_args_or_none(cleaned_request_args, [lot['slug'] for lot in lots])
@@ -221,11 +449,10 @@ def build_lots_and_categories_link_tree(
 
     selected_filters.append(root_node)
 
-    aggregations_by_lot = {
-        lot['slug']: _get_aggregations_for_lot_with_filters(
-            lot['slug'], content_manifest, framework, cleaned_request_args, doc_type, index, search_api_client
-        ) for lot in lots
-    }
+    if aggregations_by_lot is None:
+        aggregations_by_lot = get_lot_aggregations(
+            framework, lots, cleaned_request_args, content_manifest, doc_type, index, search_api_client
+        )
 
     for lot in lots:
         selected_categories = []
@@ -235,7 +462,7 @@ def build_lots_and_categories_link_tree(
             'label': lot['name'],
             'name': 'lot',  # a filter's "name" is its key for form submission purposes
             'value': lot['slug'],
-            'service_count': aggregations_by_lot[lot['slug']].results['lot'].get(lot['slug'], 0),
+            'service_count': _get_service_count(aggregations_by_lot[lot['slug']], 'lot', lot['slug']),
         }
 
         url_args_for_lot = _build_base_url_args(preserved_request_args, content_manifest, framework, lot['slug'])
@@ -284,7 +511,7 @@ def _annotate_categories_with_selection(lot_slug, category_filters, cleaned_requ
     :param url_args_for_lot: MultiDict of arguments to be preserved when generating links
     :param content_manifest: a ContentManifest instance for G-Cloud search_filters.
     :param framework: the latest G-Cloud framework from the API
-    :param aggregations: A dict of aggregation results for categories, by lot slug.
+    :param aggregations: aggregation results for the lot, or None if they're unavailable
     :param keys_to_remove: set of lot/category keys to remove from dicts when building links.
     :param search_link_builder: a werkzeug Href object for the view category tree links link to
     :param parent_category: The name of the parent category; only set internally for recursion.
@@ -296,7 +523,7 @@ def _annotate_categories_with_selection(lot_slug, category_filters, cleaned_requ
 
     for category in category_filters:
         category['selected'] = False
-        category['service_count'] = aggregations.results.get('serviceCategories', {}).get(category['label'], 0)
+        category['service_count'] = _get_service_count(aggregations, 'serviceCategories', category['label'])
 
         param_values = request_filters.getlist(
             category['name'],
@@ -1,10 +1,12 @@
 from collections import defaultdict
-import os
+from types import MappingProxyType
 import yaml
 
 from flask import Markup, escape
 from lxml.html import document_fromstring
 
+from ...content_snapshot import SUMMARY_RULES_PATH
+
 
 class SearchSummary(object):
     """Provides a paragraph summarising the search performed and results"""
@@ -43,7 +45,6 @@ class SearchSummary(object):
             filter_groups
         )
         self.filters_fragments = []
-        SummaryRules.load_rules()
         for group in self.filter_groups:
             group_id = group[0]
             filters = group[1]
@@ -146,32 +147,66 @@ class SearchSummary(object):
         return _sort_groups(groups)
 
 
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class SummaryRuleTable(object):
+    """
+    Read-only search summary rules, compiled once from `search_summary_manifest.yml` (or a content snapshot).
+
+    `rules` maps each filter group id to that group's rules, and `filter_prepositions` maps the id of each group that
+    has filter rules to a mapping of filter id to the preposition to put before that filter.
+    """
+
+    def __init__(self, summary_rules):
+        self.rules = MappingProxyType({rule['id']: _freeze(rule) for rule in summary_rules})
+        self.filter_prepositions = MappingProxyType({
+            rule['id']: MappingProxyType({
+                filter_rule['id']: filter_rule['preposition'] for filter_rule in rule['filterRules']
+            })
+            for rule in summary_rules if rule.get('filterRules') is not None
+        })
+
+    @classmethod
+    def from_manifest(cls, manifest=SUMMARY_RULES_PATH):
+        with open(manifest, 'r') as file:
+            return cls(yaml.safe_load(file))
+
+
 class SummaryRules(object):
     """Provides access to the rules for a search summary fragment"""
 
-    _rules = {}
-    loaded = False
+    _table = None
 
     @staticmethod
-    def load_rules(manifest=os.path.join(
-        os.path.dirname(__file__),
-        '..',
-        'helpers',
-        'search_summary_manifest.yml'
-    )):
+    def load_rules(manifest=SUMMARY_RULES_PATH, summary_rules=None):
+        """
+        Compiles the rules from `summary_rules` if given, or else from the YAML `manifest`. The app does this once, at
+        startup, but rules are loaded on first use if that hasn't happened.
+        """
+        SummaryRules._table = (
+            SummaryRuleTable(summary_rules) if summary_rules is not None else SummaryRuleTable.from_manifest(manifest)
+        )
 
-        with open(manifest, 'r') as file:
-            summary_rules = yaml.safe_load(file)
-        SummaryRules._rules = {rule['id']: rule for rule in summary_rules}
-        SummaryRules.loaded = True
+    @staticmethod
+    def get_table():
+        if SummaryRules._table is None:
+            SummaryRules.load_rules()
+        return SummaryRules._table
 
     def __init__(self, group_id):
-        self.exist = group_id in SummaryRules._rules
+        table = SummaryRules.get_table()
+        self.exist = group_id in table.rules
         if self.exist is True:
-            self._rules = SummaryRules._rules[group_id]
-            if self.get('filterRules') is not None:
-                self.filter_rules_ids = [
-                    rule['id'] for rule in self._rules['filterRules']]
+            self._rules = table.rules[group_id]
+            if group_id in table.filter_prepositions:
+                self._filter_prepositions = table.filter_prepositions[group_id]
+                self.filter_rules_ids = self._filter_prepositions.keys()
 
     def get(self, key):
         if key in self._rules:
@@ -183,12 +218,11 @@ class SummaryRules(object):
             [preposition, filter_string])
 
     def _get_filter_preposition(self, filter):
-        if hasattr(self, 'filter_rules_ids'):
+        if hasattr(self, '_filter_prepositions'):
             try:
-                index = self.filter_rules_ids.index(filter)
-            except (AttributeError, TypeError, ValueError):
+                return self._filter_prepositions.get(filter)
+            except TypeError:  # unhashable filter
                 return None
-            return self._rules['filterRules'][index]['preposition']
 
 
 class SummaryFragment(object):
@@ -3,7 +3,7 @@ from datetime import datetime
 import inflection
 from operator import itemgetter
 
-from flask import abort, request, redirect, current_app, url_for, flash, escape
+from flask import abort, request, redirect, current_app, url_for, flash, escape, jsonify
 from flask_login import current_user
 from werkzeug.urls import Href, url_encode, url_decode
 
@@ -13,10 +13,10 @@ from dmcontent.questions import Pricing
 from dmutils.flask import timed_render_template as render_template
 from dmutils.forms.errors import get_errors_from_wtform, govuk_errors
 from dmutils.formats import dateformat, DATETIME_FORMAT, datetimeformat
-from dmutils.filters import capitalize_first
 from dmutils.forms.helpers import govuk_options
 from dmutils.ods import A as AnchorElement
 from dmutils.views import SimpleDownloadFileView
+from gds_metrics.metrics import Histogram
 
 from app import search_api_client, data_api_client, content_loader
 from ..exceptions import AuthException
@@ -29,24 +29,45 @@ from ..forms.direct_award_forms import (
     WhichServiceWonTheContractForm,
     WhyDidYouNotAwardForm
 )
+from ..helpers.cache_control_helpers import add_surrogate_keys, cache_publicly, surrogate_key
+from ..helpers.etag_helpers import (
+    aggregations_fingerprint,
+    not_modified_response,
+    search_results_fingerprint,
+    tag_response,
+    weak_etag,
+)
 from ..helpers.search_helpers import (
-    get_keywords_from_request, pagination,
-    get_page_from_request, query_args_for_pagination,
+    pagination,
+    query_args_for_pagination,
     get_valid_lot_from_args_or_none,
     build_search_query,
-    clean_request_args, get_request_url_without_any_filters,
+    get_live_results,
+    get_live_results_fragments,
+    get_live_results_hashes,
+    get_request_url_without_any_filters,
+    search_with_cache,
+    SearchQuery,
+    LIVE_RESULTS_FRAGMENTS,
 )
 from ..helpers import framework_helpers
+from ..helpers.concurrency_helpers import call_concurrently
 from ..helpers import dm_google_analytics
 from ..helpers.direct_award_helpers import (
     is_direct_award_project_accessible,
     get_direct_award_projects
 )
+from ..helpers.manifest_helpers import get_filtered_manifest
 from ..helpers.search_save_helpers import get_saved_search_banner_message_status, SearchMeta
+from ..helpers.service_page_helpers import get_or_render_service_page, service_page_cache_key
 from ..helpers.shared_helpers import get_fields_from_manifest, get_questions_from_manifest_by_id
+from ..helpers.supplier_helpers import get_supplier
 from ...main import main, direct_award, direct_award_public
 from ..presenters.search_presenters import (
-    filters_for_lot,
+    copy_filter_groups,
+    get_filter_catalogue,
+    get_lot_aggregations,
+    set_filter_display_attributes,
     set_filter_states,
     build_lots_and_categories_link_tree,
 )
@@ -55,12 +76,21 @@ from ..presenters.search_summary import SearchSummary
 from ..presenters.service_presenters import Service
 
 
+SERVICE_PAGE_FETCH_DURATION = Histogram(
+    'buyer_frontend_service_page_fetch_duration_seconds',
+    'Time taken by each of the API requests for a service page that are made once the service is known',
+    ['dependency'],
+)
+
 END_SEARCH_LIMIT = 30  # TODO: This should be done in the API.
 PROJECT_SAVED_MESSAGE = "Search saved."
 PROJECT_ENDED_MESSAGE = "Results exported. Your files are ready to download."
 TOO_MANY_RESULTS_MESSAGE = f"You have too many services to review. Refine your search until you have no more " \
                            f"than {END_SEARCH_LIMIT} results."
 CONFIRM_START_ASSESSING_MESSAGE = "You’ve confirmed that you have read and understood how to assess services."
+SERVICES_LIVE_RESULTS_FRAGMENTS = (
+    'results', 'categories', 'summary', 'summary-accessible-hint', 'save-form', 'filter-title',
+)
 
 
 def _can_end_search(search_meta):
@@ -76,8 +106,7 @@ def index_g_cloud():
 def pre_project_task_list(framework_family):
     if framework_family != "g-cloud":
         abort(404)
-    frameworks_by_slug = framework_helpers.get_frameworks_by_slug(data_api_client)
-    framework = framework_helpers.get_latest_live_framework(frameworks_by_slug.values(), "g-cloud")
+    framework = framework_helpers.get_framework_index(data_api_client).latest_live("g-cloud")
 
     content_loader.load_messages(framework['slug'], ['urls'])
     framework_urls = content_loader.get_message(framework['slug'], 'urls')
@@ -95,8 +124,7 @@ def pre_project_task_list(framework_family):
 @direct_award_public.route('/<string:framework_family>/choose-lot', methods=("GET", "POST"))
 def choose_lot(framework_family):
     # if there are multiple live g-cloud frameworks, assume they all have the same lots
-    all_frameworks = data_api_client.find_frameworks().get('frameworks')
-    framework = framework_helpers.get_latest_live_framework_or_404(all_frameworks, framework_family)
+    framework = framework_helpers.get_framework_index(data_api_client).latest_live_or_404(framework_family)
 
     content_loader.load_messages(framework['slug'], ['advice', 'descriptions'])
     gcloud_lot_messages = content_loader.get_message(framework['slug'], 'advice', 'lots')
@@ -172,7 +200,23 @@ def suppliers_guide_g_cloud():
     return redirect('https://www.gov.uk/guidance/g-cloud-suppliers-guide', 301)
 
 
+def _service_page_fetch_options():
+    return {
+        'max_workers': current_app.config['DM_SERVICE_PAGE_FETCH_WORKERS'],
+        'timeout': current_app.config['DM_SERVICE_PAGE_FETCH_TIMEOUT'],
+        'metric': SERVICE_PAGE_FETCH_DURATION,
+    }
+
+
+def _result_or_raise(outcome):
+    result, exception = outcome
+    if exception is not None:
+        raise exception
+    return result
+
+
 @main.route('/g-cloud/services/<service_id>')
+@cache_publicly('detail')
 def get_service_by_id(service_id):
     try:
         service = data_api_client.get_service(service_id)
@@ -185,6 +229,11 @@ def get_service_by_id(service_id):
 
         service_data = service['services']
         framework_slug = service_data['frameworkSlug']
+        add_surrogate_keys(
+            surrogate_key('framework', framework_slug),
+            surrogate_key('service', service_id),
+            surrogate_key('supplier', service_data['supplierId']),
+        )
 
         # Some frameworks don't actually have framework content of their own (e.g. G-Cloud 4 and 5) - they
         # use content from some other framework (for those examples, G-Cloud 6 content works fine). In those
@@ -194,54 +243,68 @@ def get_service_by_id(service_id):
         if override_framework_slug:
             framework_slug = override_framework_slug
 
-        framework = data_api_client.get_framework(framework_slug)['frameworks']
+        # everything else the page needs only depends on the service, so is fetched at once
+        outcomes = call_concurrently('service-page', {
+            'framework': lambda: data_api_client.get_framework(framework_slug),
+            # Get declaration info (including Modern Slavery statement document URL, if present)
+            'supplier_framework': lambda: data_api_client.get_supplier_framework_info(
+                service_data['supplierId'], framework_slug
+            ),
+            # get supplier data to add contact info to service object
+            'supplier': lambda: get_supplier(data_api_client, service_data['supplierId']),
+        }, **_service_page_fetch_options())
+
+        framework = _result_or_raise(outcomes['framework'])['frameworks']
         if framework['framework'] != 'g-cloud':
             abort(404)
 
-        # Get declaration info (including Modern Slavery statement document URL, if present)
-        supplier_framework = data_api_client.get_supplier_framework_info(service_data['supplierId'], framework_slug)
-
-        service_view_data = Service(
-            service_data,
-            content_loader.get_manifest(framework_slug, 'display_service').filter(service_data),
-            framework_helpers.get_lots_by_slug(framework),
-            declaration=supplier_framework['frameworkInterest'].get('declaration', {})
-        )
-
-        try:
-            # get supplier data and add contact info to service object
-            supplier = data_api_client.get_supplier(
-                service_data['supplierId']
+        supplier_framework = _result_or_raise(outcomes['supplier_framework'])
+        declaration = supplier_framework['frameworkInterest'].get('declaration', {})
+        supplier_data = _result_or_raise(outcomes['supplier'])['suppliers']
+        gcloud_framework_description = framework_helpers.get_framework_description(data_api_client, 'g-cloud')
+
+        def render_service_page():
+            service_view_data = Service(
+                service_data,
+                get_filtered_manifest(framework_slug, 'display_service', service_data),
+                framework_helpers.get_lots_by_slug(framework),
+                declaration=declaration
             )
-            supplier_data = supplier['suppliers']
+
+            # add contact info to service object
             service_view_data.meta.set_contact_attribute(
                 supplier_data['contactInformation'][0].get('contactName'),
                 supplier_data['contactInformation'][0].get('phoneNumber'),
                 supplier_data['contactInformation'][0].get('email')
             )
 
-        except HTTPError as e:
-            abort(e.status_code)
-
-        service_unavailability_information = None
-        framework_expires_at_date = dateformat(framework['frameworkExpiresAtUTC'])
-        status_code = 200
-        if service['serviceMadeUnavailableAuditEvent'] is not None:
-            service_unavailability_information = {
-                'date': dateformat(service['serviceMadeUnavailableAuditEvent']['createdAt']),
-                'type': service['serviceMadeUnavailableAuditEvent']['type']
-            }
-            # mark the resource as unavailable in the headers
-            status_code = 410
-
-        return render_template(
-            'service.html',
-            service=service_view_data,
-            service_unavailability_information=service_unavailability_information,
-            lot=service_view_data.lot,
-            gcloud_framework_description=framework_helpers.get_framework_description(data_api_client, 'g-cloud'),
-            framework_expires_at_date=framework_expires_at_date
-        ), status_code
+            service_unavailability_information = None
+            framework_expires_at_date = dateformat(framework['frameworkExpiresAtUTC'])
+            status_code = 200
+            if service['serviceMadeUnavailableAuditEvent'] is not None:
+                service_unavailability_information = {
+                    'date': dateformat(service['serviceMadeUnavailableAuditEvent']['createdAt']),
+                    'type': service['serviceMadeUnavailableAuditEvent']['type']
+                }
+                # mark the resource as unavailable in the headers
+                status_code = 410
+
+            return render_template(
+                'service.html',
+                service=service_view_data,
+                service_unavailability_information=service_unavailability_information,
+                lot=service_view_data.lot,
+                gcloud_framework_description=gcloud_framework_description,
+                framework_expires_at_date=framework_expires_at_date
+            ), status_code
+
+        # the page is the same for as long as everything it's built from is, so anonymous users can share it
+        return get_or_render_service_page(
+            service_page_cache_key(
+                service, framework, declaration, supplier_data, framework_slug, gcloud_framework_description
+            ),
+            render_service_page,
+        )
     except AuthException:
         abort(500, "Application error")
     except HTTPError as e:
@@ -249,26 +312,28 @@ def get_service_by_id(service_id):
 
 
 @main.route('/g-cloud/search')
+@cache_publicly('search')
 def search_services():
     # if there are multiple live g-cloud frameworks, we must assume the same filters work on them all
-    all_frameworks = data_api_client.find_frameworks().get('frameworks')
-    framework = framework_helpers.get_latest_live_framework(all_frameworks, 'g-cloud')
+    framework_index = framework_helpers.get_framework_index(data_api_client)
+    framework = framework_index.latest_live('g-cloud')
     doc_type = 'services'
+    add_surrogate_keys(surrogate_key('framework', framework['slug']))
 
-    lots_by_slug = framework_helpers.get_lots_by_slug(framework)
+    lots_by_slug = framework_index.lots_by_slug(framework['slug'])
 
     current_lot_slug = get_valid_lot_from_args_or_none(request.args, lots_by_slug)
     # the bulk of the possible filter parameters are defined through the content loader. they're all boolean and the
     # search api uses the same "question" labels as the content for its attributes, so we can really use those labels
     # verbatim. It also means we can use their human-readable names as defined in the content
     content_manifest = content_loader.get_manifest(framework['slug'], 'services_search_filters')
-    # filters - an OrderedDictionary of dicts describing each parameter group
-    filters = filters_for_lot(
-        current_lot_slug,
-        content_manifest,
-        all_lots=framework['lots']
-    )
-    clean_request_query_params = clean_request_args(request.args, filters.values(), lots_by_slug)
+    # filter_catalogue - a read-only OrderedDictionary of dicts describing each parameter group
+    filter_catalogue = get_filter_catalogue(framework, current_lot_slug, content_manifest)
+    # search_query - the cleaned args of this search, which identify it for the rest of the view
+    search_query = SearchQuery.from_request_args(request.args, filter_catalogue, lots_by_slug)
+    # a live search request only renders the fragments of the page it asks for, so only does the work for those
+    live_results_fragments = get_live_results_fragments(request.args, SERVICES_LIVE_RESULTS_FRAGMENTS)
+    live_results_hashes = get_live_results_hashes(request.args)
 
     try:
         if int(request.args.get('page', 1)) <= 0:
@@ -276,11 +341,34 @@ def search_services():
     except ValueError:
         abort(404)
 
-    search_api_response = search_api_client.search(
+    search_api_response = search_with_cache(
+        search_api_client,
         index=framework['slug'],
         doc_type=doc_type,
-        **build_search_query(clean_request_query_params, filters.values(), content_manifest, lots_by_slug)
+        **build_search_query(search_query, filter_catalogue, content_manifest, lots_by_slug)
+    )
+
+    lots = framework['lots']
+    aggregations_by_lot = None
+    if live_results_fragments is None or 'categories' in live_results_fragments:
+        aggregations_by_lot = get_lot_aggregations(
+            framework, lots, search_query, content_manifest, doc_type, framework['slug'], search_api_client
+        )
+
+    # the page is the same for as long as the results of its search and the counts in its category tree are, so
+    # browsers can revalidate their copy of it
+    etag = weak_etag(
+        framework['slug'],
+        search_query,
+        live_results_fragments,
+        live_results_hashes,
+        search_results_fingerprint(search_api_response),
+        aggregations_fingerprint(aggregations_by_lot),
     )
+    not_modified = not_modified_response(etag)
+    if not_modified is not None:
+        return not_modified
+
     search_results_obj = SearchResults(
         search_api_response,
         lots_by_slug,
@@ -297,41 +385,48 @@ def search_services():
     pagination_config = pagination(
         search_results_obj.total,
         results_per_page,
-        get_page_from_request(request)
+        search_query.page
     )
 
     search_summary = SearchSummary(
         search_api_response['meta']['total'],
-        clean_request_query_params.copy(),
-        filters.values(),
+        search_query,
+        filter_catalogue.values(),
         lots_by_slug
     )
 
+    # filters - our own copy of the filter groups, which we annotate with the state of this request for display
+    filters = copy_filter_groups(filter_catalogue)
+
     # for display purposes (but not for actual filtering purposes), we
     # remove 'categories' from the list of filters, and process them into a single structure with the lots
     category_filter_group = filters.pop('categories') if 'categories' in filters else None
 
-    lots = framework['lots']
     view_name = 'search_services'
-    selected_category_tree_filters = build_lots_and_categories_link_tree(
-        framework,
-        lots,
-        category_filter_group,
-        request,
-        clean_request_query_params,
-        content_manifest,
-        doc_type,
-        framework['slug'],
-        Href(url_for('.{}'.format(view_name))),
-        search_api_client
-    )
 
-    filter_form_hidden_fields_by_name = {
-        # Filter form should also filter by lot, and by category, when any of those are selected.
-        # (If a sub-category is selected, we also need the parent category id, so that the correct part
-        # of the category tree is displayed when the sub-category appears under multiple parents.)
-        f["name"]: f for f in selected_category_tree_filters[1:]
-    }
+    category_tree_root, filter_form_hidden_fields_by_name = None, {}
+    if aggregations_by_lot is not None:
+        selected_category_tree_filters = build_lots_and_categories_link_tree(
+            framework,
+            lots,
+            category_filter_group,
+            request,
+            search_query,
+            content_manifest,
+            doc_type,
+            framework['slug'],
+            Href(url_for('.{}'.format(view_name))),
+            search_api_client,
+            aggregations_by_lot=aggregations_by_lot,
+        )
+        category_tree_root = selected_category_tree_filters[0]
+
+        filter_form_hidden_fields_by_name = {
+            # Filter form should also filter by lot, and by category, when any of those are selected.
+            # (If a sub-category is selected, we also need the parent category id, so that the correct part
+            # of the category tree is displayed when the sub-category appears under multiple parents.)
+            f["name"]: f for f in selected_category_tree_filters[1:]
+        }
 
     current_lot = lots_by_slug.get(current_lot_slug)
 
@@ -339,18 +434,13 @@ def search_services():
     set_filter_states(filters.values(), request)
 
     # Create filters that can be used with GOV.UK components
-    for filter_groups in filters.values():
-        for filter_instance in filter_groups['filters']:
-            if 'label' in filter_instance:
-                filter_instance['label'] = capitalize_first(filter_instance['label'])
-                filter_instance['text'] = capitalize_first(filter_instance['label'])
-            filter_instance['attributes'] = {"aria-controls": "search-summary-accessible-hint-wrapper"}
+    set_filter_display_attributes(filters.values())
 
     clear_filters_url = get_request_url_without_any_filters(request, filters, view_name)
-    search_query = query_args_for_pagination(clean_request_query_params)
+    search_query_args = query_args_for_pagination(search_query)
 
     template_args = dict(
-        category_tree_root=selected_category_tree_filters[0],
+        category_tree_root=category_tree_root,
         clear_filters_url=clear_filters_url,
         current_lot=current_lot,
         doc_type=doc_type,
@@ -362,9 +452,9 @@ def search_services():
         lots=lots,
         pagination=pagination_config,
         search_count=search_api_response['meta']['total'],
-        search_keywords=get_keywords_from_request(request),
-        search_query=search_query,
-        search_query_url=url_encode(search_query),  # for save-search form
+        search_keywords=search_query.keywords,
+        search_query=search_query_args,
+        search_query_url=url_encode(search_query_args),  # for save-search form
         services=search_results_obj.search_results,
         summary=search_summary.markup(),
         title='Search results',
@@ -372,42 +462,17 @@ def search_services():
         view_name=view_name,
     )
 
-    if request.args.get('live-results'):
-        from flask import jsonify
-
-        live_results_dict = {
-            "results": {
-                "selector": "#js-dm-live-search-results",
-                "html": render_template("search/_results_wrapper.html", **template_args)
-            },
-            "categories": {
-                "selector": "#js-dm-live-search-categories",
-                "html": render_template("search/_categories_wrapper.html", **template_args)
-            },
-            "summary": {
-                "selector": "#js-dm-live-search-summary",
-                "html": render_template("search/_summary.html", **template_args)
-            },
-            "summary-accessible-hint": {
-                "selector": "#js-dm-live-search-summary-accessible-hint",
-                "html": render_template("search/_summary_accessible_hint.html", **template_args)
-            },
-            "save-form": {
-                "selector": "#js-dm-live-save-search-form",
-                "html": render_template("search/_services_save_search.html", **template_args)
-            },
-            "filter-title": {
-                "selector": "#js-dm-live-filter-title",
-                "html": render_template("search/_filter_title.html", **template_args)
-            },
+    if live_results_fragments is not None:
+        rendered_fragments = {
+            fragment: render_template(LIVE_RESULTS_FRAGMENTS[fragment].template_name, **template_args)
+            for fragment in live_results_fragments
         }
+        return tag_response(jsonify(get_live_results(rendered_fragments, live_results_hashes)), etag)
 
-        return jsonify(live_results_dict)
-
-    return render_template(
+    return tag_response(render_template(
         'search/services.html',
         **template_args
-    )
+    ), etag)
 
 
 @direct_award.route('/<string:framework_family>', methods=['GET'])
@@ -420,8 +485,7 @@ def saved_search_overview(framework_family):
         "awaiting_outcome": "Tell us the outcome"
     }
 
-    all_frameworks = data_api_client.find_frameworks().get('frameworks')
-    framework_helpers.get_last_live_framework_or_404(all_frameworks, framework_family)
+    framework_helpers.get_framework_index(data_api_client).last_live_or_404(framework_family)
 
     projects = get_direct_award_projects(data_api_client, current_user.id, latest_first=True)
     projects['closed_projects'].sort(key=itemgetter('lockedAt'), reverse=True)
@@ -490,9 +554,9 @@ def view_projects(framework_family):
 @direct_award.route('/<string:framework_family>/save-search', methods=['GET', 'POST'])
 def save_search(framework_family):
     # Get core data
-    all_frameworks = data_api_client.find_frameworks().get('frameworks')
-    framework = framework_helpers.get_latest_live_framework_or_404(all_frameworks, framework_family)
-    lots_by_slug = framework_helpers.get_lots_by_slug(framework)
+    framework_index = framework_helpers.get_framework_index(data_api_client)
+    framework = framework_index.latest_live_or_404(framework_family)
+    lots_by_slug = framework_index.lots_by_slug(framework['slug'])
 
     if "search_query" not in request.values:
         abort(400)
@@ -502,8 +566,8 @@ def save_search(framework_family):
     current_lot_slug = get_valid_lot_from_args_or_none(search_query, lots_by_slug)
 
     content_manifest = content_loader.get_manifest(framework['slug'], 'services_search_filters')
-    filters = filters_for_lot(current_lot_slug, content_manifest, all_lots=framework['lots'])
-    clean_request_query_params = clean_request_args(search_query, filters.values(), lots_by_slug)
+    filters = get_filter_catalogue(framework, current_lot_slug, content_manifest)
+    clean_request_query_params = SearchQuery.from_request_args(search_query, filters, lots_by_slug)
 
     projects = get_direct_award_projects(data_api_client, current_user.id, 'open_projects', 'name')
     projects.sort(key=lambda x: x['name'])
@@ -539,7 +603,7 @@ def save_search(framework_family):
 
         search_api_url = search_api_client.get_search_url(
             index=framework['slug'],
-            **build_search_query(search_query, filters.values(), content_manifest, lots_by_slug)
+            **build_search_query(search_query, filters, content_manifest, lots_by_slug)
         )
         try:
             data_api_client.create_direct_award_project_search(user_id=current_user.id,
@@ -562,9 +626,9 @@ def save_search(framework_family):
         search_api_response = search_api_client.search(
             index=framework['slug'],
             doc_type='services',
-            **build_search_query(search_query, filters.values(), content_manifest, lots_by_slug)
+            **build_search_query(search_query, filters, content_manifest, lots_by_slug)
         )
-        search_summary = SearchSummary(search_api_response['meta']['total'], clean_request_query_params.copy(),
+        search_summary = SearchSummary(search_api_response['meta']['total'], clean_request_query_params,
                                        filters.values(), lots_by_slug)
 
         return render_template('direct-award/save-search.html',
@@ -583,17 +647,17 @@ def save_new_search(framework_family):
         abort(400)
 
     # Get core data
-    all_frameworks = data_api_client.find_frameworks().get('frameworks')
-    framework = framework_helpers.get_latest_live_framework_or_404(all_frameworks, framework_family)
-    lots_by_slug = framework_helpers.get_lots_by_slug(framework)
+    framework_index = framework_helpers.get_framework_index(data_api_client)
+    framework = framework_index.latest_live_or_404(framework_family)
+    lots_by_slug = framework_index.lots_by_slug(framework['slug'])
 
     search_query = url_decode(request.values['search_query'])
 
     current_lot_slug = get_valid_lot_from_args_or_none(search_query, lots_by_slug)
 
     content_manifest = content_loader.get_manifest(framework['slug'], 'services_search_filters')
-    filters = filters_for_lot(current_lot_slug, content_manifest, all_lots=framework['lots'])
-    clean_request_query_params = clean_request_args(search_query, filters.values(), lots_by_slug)
+    filters = get_filter_catalogue(framework, current_lot_slug, content_manifest)
+    clean_request_query_params = SearchQuery.from_request_args(search_query, filters, lots_by_slug)
 
     form = CreateNewProjectForm()
 
@@ -609,7 +673,7 @@ def save_new_search(framework_family):
 
         search_api_url = search_api_client.get_search_url(
             index=framework['slug'],
-            **build_search_query(search_query, filters.values(), content_manifest, lots_by_slug)
+            **build_search_query(search_query, filters, content_manifest, lots_by_slug)
         )
         try:
             data_api_client.create_direct_award_project_search(user_id=current_user.id,
@@ -631,9 +695,9 @@ def save_new_search(framework_family):
         search_api_response = search_api_client.search(
             index=framework['slug'],
             doc_type='services',
-            **build_search_query(search_query, filters.values(), content_manifest, lots_by_slug)
+            **build_search_query(search_query, filters, content_manifest, lots_by_slug)
         )
-        search_summary = SearchSummary(search_api_response['meta']['total'], clean_request_query_params.copy(),
+        search_summary = SearchSummary(search_api_response['meta']['total'], clean_request_query_params,
                                        filters.values(), lots_by_slug)
 
         return render_template('direct-award/save-new-search.html',
@@ -655,7 +719,7 @@ def save_new_search(framework_family):
 
 @direct_award.route('/<string:framework_family>/projects/<int:project_id>', methods=['GET'])
 def view_project(framework_family, project_id):
-    frameworks_by_slug = framework_helpers.get_frameworks_by_slug(data_api_client)
+    framework_index = framework_helpers.get_framework_index(data_api_client)
     # Get the requested Direct Award Project.
     project = data_api_client.get_direct_award_project(project_id=project_id)['project']
     if not is_direct_award_project_accessible(project, current_user.id):
@@ -667,19 +731,19 @@ def view_project(framework_family, project_id):
     if searches:
         # A Direct Award project has one 'active' search which is what we will display on this overview page.
         search = list(filter(lambda x: x['active'], searches))[0]
-        search_meta = SearchMeta(search_api_client, search['searchUrl'], frameworks_by_slug)
+        search_meta = SearchMeta(search_api_client, search['searchUrl'], framework_index.by_slug)
 
         search_summary_sentence = search_meta.search_summary.markup()
         can_end_search = _can_end_search(search_meta)
-        framework = frameworks_by_slug[search_meta.framework_slug]
-        latest_live_framework = framework_helpers.get_latest_live_framework(frameworks_by_slug.values(), 'g-cloud')
+        framework = framework_index.by_slug[search_meta.framework_slug]
+        latest_live_framework = framework_index.latest_live('g-cloud')
         if not latest_live_framework:
             can_end_search = True
 
         buyer_search_page_url = search_meta.url
 
     else:
-        framework = framework_helpers.get_latest_live_framework(frameworks_by_slug.values(), 'g-cloud')
+        framework = framework_index.latest_live('g-cloud')
         latest_live_framework = framework
 
         search = None
@@ -745,9 +809,8 @@ def view_project(framework_family, project_id):
 
 @direct_award.route('/<string:framework_family>/projects/<int:project_id>/end-search', methods=['GET', 'POST'])
 def end_search(framework_family, project_id):
-    all_frameworks = data_api_client.find_frameworks().get('frameworks')
-    framework = framework_helpers.get_latest_live_framework_or_404(all_frameworks, framework_family)
-    frameworks_by_slug = framework_helpers.get_frameworks_by_slug(data_api_client)
+    framework_index = framework_helpers.get_framework_index(data_api_client)
+    framework = framework_index.latest_live_or_404(framework_family)
 
     # Get the requested Direct Award Project.
     project = data_api_client.get_direct_award_project(project_id=project_id)['project']
@@ -758,7 +821,7 @@ def end_search(framework_family, project_id):
                                                                   project_id=project['id'],
                                                                   only_active=True)['searches']
     search = searches[0]
-    search_meta = SearchMeta(search_api_client, search['searchUrl'], frameworks_by_slug)
+    search_meta = SearchMeta(search_api_client, search['searchUrl'], framework_index.by_slug)
     search_count = search_meta.search_count
     can_end_search = _can_end_search(search_meta)
     disable_end_search_btn = False
@@ -827,11 +890,7 @@ def update_project(framework_family, project_id):
     methods=['GET', 'POST']
 )
 def did_you_award_contract(framework_family, project_id):
-    all_frameworks = data_api_client.find_frameworks().get('frameworks')
-    framework = framework_helpers.get_last_live_framework_or_404(
-        all_frameworks,
-        framework_family
-    )
+    framework = framework_helpers.get_framework_index(data_api_client).last_live_or_404(framework_family)
 
     # Get the requested Direct Award Project.
     project = data_api_client.get_direct_award_project(project_id=project_id)['project']
@@ -897,11 +956,7 @@ def which_service_won_contract(framework_family, project_id):
     if project['outcome']:
         abort(410)
 
-    all_frameworks = data_api_client.find_frameworks().get('frameworks')
-    framework = framework_helpers.get_last_live_framework_or_404(
-        all_frameworks,
-        framework_family
-    )
+    framework = framework_helpers.get_framework_index(data_api_client).last_live_or_404(framework_family)
 
     search = data_api_client.find_direct_award_project_searches(user_id=current_user.id,
                                                                 project_id=project['id'],
@@ -950,11 +1005,7 @@ def which_service_won_contract(framework_family, project_id):
     methods=['GET', 'POST']
 )
 def tell_us_about_contract(framework_family, project_id, outcome_id):
-    all_frameworks = data_api_client.find_frameworks().get('frameworks')
-    framework = framework_helpers.get_last_live_framework_or_404(
-        all_frameworks,
-        framework_family
-    )
+    framework = framework_helpers.get_framework_index(data_api_client).last_live_or_404(framework_family)
 
     # Get the requested Direct Award Project.
     project = data_api_client.get_direct_award_project(project_id=project_id)['project']
@@ -1009,11 +1060,7 @@ def tell_us_about_contract(framework_family, project_id, outcome_id):
     methods=['GET', 'POST']
 )
 def why_did_you_not_award_the_contract(framework_family, project_id):
-    all_frameworks = data_api_client.find_frameworks().get('frameworks')
-    framework = framework_helpers.get_last_live_framework_or_404(
-        all_frameworks,
-        framework_family
-    )
+    framework = framework_helpers.get_framework_index(data_api_client).last_live_or_404(framework_family)
 
     project = data_api_client.get_direct_award_project(project_id=project_id)['project']
 
@@ -1131,7 +1178,7 @@ class DownloadResultsView(SimpleDownloadFileView):
         """All of the data required to generate what will go into the files"""
         project, search = self.get_project_and_search(kwargs['project_id'])
 
-        frameworks_by_slug = framework_helpers.get_frameworks_by_slug(data_api_client)
+        framework_index = framework_helpers.get_framework_index(data_api_client)
         framework_slug = self.search_api_client.get_index_from_search_api_url(search['searchUrl'])
 
         download_results_manifest = self.content_loader.get_manifest(framework_slug, 'download_results')
@@ -1158,10 +1205,10 @@ class DownloadResultsView(SimpleDownloadFileView):
 
             all_services.append(service)
 
-        search_meta = SearchMeta(search_api_client, search['searchUrl'], frameworks_by_slug)
+        search_meta = SearchMeta(search_api_client, search['searchUrl'], framework_index.by_slug)
 
         file_context = {
-            'framework': frameworks_by_slug[framework_slug]['name'],
+            'framework': framework_index.by_slug[framework_slug]['name'],
             'search': search,
             'project': project,
             'questions': manifest_questions,
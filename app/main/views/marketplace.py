@@ -2,7 +2,7 @@
 from urllib.parse import urljoin
 
 from flask_login import current_user
-from flask import abort, current_app, request, url_for
+from flask import abort, current_app, jsonify, request, url_for
 from lxml import html
 from werkzeug.urls import Href
 from werkzeug.datastructures import MultiDict
@@ -10,47 +10,67 @@ from werkzeug.datastructures import MultiDict
 from dmapiclient import APIError
 from dmcontent.content_loader import ContentNotFoundError
 from dmutils.errors import render_error_page
-from dmutils.filters import capitalize_first
 from dmutils.flask import timed_render_template as render_template
 from dmutils.dmp_so_status import are_new_frameworks_live
 from dmcontent.html import to_summary_list_rows, text_to_html
 from app import search_api_client, data_api_client, content_loader
 from ..helpers.brief_helpers import (
-    count_brief_responses_by_size_and_status, format_winning_supplier_size,
-    COMPLETED_BRIEF_RESPONSE_STATUSES, ALL_BRIEF_RESPONSE_STATUSES, PUBLISHED_BRIEF_STATUSES
+    format_winning_supplier_size, summarise_brief_responses,
+    ALL_BRIEF_RESPONSE_STATUSES, PUBLISHED_BRIEF_STATUSES
 )
 from ..helpers.framework_helpers import (
+    FrameworkIndex,
     abort_if_not_further_competition_framework,
-    get_latest_live_framework,
-    get_last_live_framework_or_404,
     get_framework_description,
-    get_lots_by_slug
+    get_framework_index,
 )
+from ..helpers.cache_control_helpers import add_surrogate_keys, cache_publicly, surrogate_key
+from ..helpers.etag_helpers import (
+    aggregations_fingerprint,
+    not_modified_response,
+    search_results_fingerprint,
+    tag_response,
+    weak_etag,
+)
+from ..helpers.manifest_helpers import get_filtered_manifest
 from ..helpers.search_helpers import (
     build_search_query,
-    clean_request_args,
-    get_keywords_from_request,
-    get_page_from_request,
+    get_live_results,
+    get_live_results_fragments,
+    get_live_results_hashes,
     get_request_url_without_any_filters,
     get_valid_lot_from_args_or_none,
     pagination,
     query_args_for_pagination,
+    search_with_cache,
+    SearchQuery,
+    LIVE_RESULTS_FRAGMENTS,
 )
 from ..helpers.shared_helpers import get_one_framework_by_status_in_order_of_preference
 from ...main import main
-from ..presenters.search_presenters import filters_for_lot, set_filter_states, build_lots_and_categories_link_tree
+from ..presenters.search_presenters import (
+    copy_filter_groups,
+    get_filter_catalogue,
+    get_lot_aggregations,
+    set_filter_display_attributes,
+    set_filter_states,
+    build_lots_and_categories_link_tree,
+)
 from ..presenters.search_results import SearchResults
 from ..presenters.search_summary import SearchSummary
 
 
+OPPORTUNITIES_LIVE_RESULTS_FRAGMENTS = ('results', 'categories', 'summary', 'summary-accessible-hint', 'filter-title')
+
+
 @main.route('/')
 def index():
     framework_status_message = {}
 
     try:
-        frameworks = data_api_client.find_frameworks().get('frameworks')
+        framework_index = get_framework_index(data_api_client)
         framework = get_one_framework_by_status_in_order_of_preference(
-            frameworks,
+            framework_index.frameworks,
             ['open', 'coming', 'pending']
         )
 
@@ -64,7 +84,7 @@ def index():
 
     # if there is a problem with the API we should still show the home page
     except APIError:
-        frameworks = []
+        framework_index = FrameworkIndex([])
     # if no message file is found (should never happen), throw a 500
     except ContentNotFoundError:
         current_app.logger.error(
@@ -74,12 +94,12 @@ def index():
 
     # Capture the slug for the most recent live framework. There will only be multiple if currently transitioning
     # between frameworks and more than one has a `live` status.
-    dos_framework = get_latest_live_framework(frameworks, 'digital-outcomes-and-specialists')
+    dos_framework = framework_index.latest_live('digital-outcomes-and-specialists')
 
     return render_template(
         'index.html',
         dos_slug=dos_framework['slug'] if dos_framework else None,
-        frameworks={framework['slug']: framework for framework in frameworks},
+        frameworks=framework_index.by_slug,
         framework_status_message=framework_status_message,
         gcloud_framework_description=get_framework_description(data_api_client, 'g-cloud'),
         are_new_frameworks_live=are_new_frameworks_live(request.args)
@@ -87,26 +107,31 @@ def index():
 
 
 @main.route('/help')
+@cache_publicly('content')
 def help():
     return render_template('help/index.html')
 
 
 @main.route('/cookies')
+@cache_publicly('content')
 def cookies():
     return render_template('content/cookies.html')
 
 
 @main.route('/privacy-notice')
+@cache_publicly('content')
 def privacy_notice():
     return render_template('content/privacy-notice.html')
 
 
 @main.route('/accessibility-statement')
+@cache_publicly('content')
 def accessibility_statement():
     return render_template('content/accessibility-statement.html')
 
 
 @main.route('/terms-and-conditions')
+@cache_publicly('content')
 def terms_and_conditions():
     return render_template('content/terms-and-conditions.html')
 
@@ -134,10 +159,9 @@ def external_404():
 
 
 @main.route('/<framework_family>/opportunities/<brief_id>')
+@cache_publicly('detail')
 def get_brief_by_id(framework_family, brief_id):
-    frameworks = data_api_client.find_frameworks()['frameworks']
-    frameworks = [framework for framework in frameworks if framework['framework'] == framework_family]
-    framework = get_last_live_framework_or_404(frameworks, framework_family)
+    framework = get_framework_index(data_api_client).last_live_or_404(framework_family)
 
     abort_if_not_further_competition_framework(framework)
 
@@ -146,6 +170,7 @@ def get_brief_by_id(framework_family, brief_id):
 
     if brief['status'] not in PUBLISHED_BRIEF_STATUSES or brief['framework']['family'] != framework_family:
         abort(404, "Opportunity '{}' can not be found".format(brief_id))
+    add_surrogate_keys(surrogate_key('framework', brief['frameworkSlug']), surrogate_key('brief', brief_id))
 
     brief_responses = data_api_client.find_brief_responses(
         brief_id=brief_id,
@@ -153,23 +178,20 @@ def get_brief_by_id(framework_family, brief_id):
         with_data=False,
     ).get('briefResponses')
 
-    winning_response, winning_supplier_size = None, None
-    if brief['status'] == 'awarded':
-        winning_response = next(response for response in brief_responses if response["id"] == brief[
-            'awardedBriefResponseId'
-        ])
-        winning_supplier_size = format_winning_supplier_size(winning_response["supplierOrganisationSize"])
+    brief_responses_summary = summarise_brief_responses(
+        brief_responses,
+        winning_response_id=brief.get('awardedBriefResponseId') if brief['status'] == 'awarded' else None,
+    )
+    brief_responses_stats = brief_responses_summary.counts
 
-    brief_responses_stats = count_brief_responses_by_size_and_status(brief_responses)
+    winning_response, winning_supplier_size = brief_responses_summary.winning_response, None
+    if winning_response is not None:
+        winning_supplier_size = format_winning_supplier_size(winning_response["supplierOrganisationSize"])
 
     if brief['status'] not in PUBLISHED_BRIEF_STATUSES or brief['framework']['family'] != framework_family:
         abort(404, "Opportunity '{}' can not be found".format(brief_id))
     try:
-        has_supplier_responded_to_brief = (
-            current_user.supplier_id in [
-                res['supplierId'] for res in brief_responses if res["status"] in COMPLETED_BRIEF_RESPONSE_STATUSES
-            ]
-        )
+        has_supplier_responded_to_brief = current_user.supplier_id in brief_responses_summary.completed_supplier_ids
     except AttributeError:
         has_supplier_responded_to_brief = False
 
@@ -181,7 +203,7 @@ def get_brief_by_id(framework_family, brief_id):
         }
         question["value"] = {"html": text_to_html(question["answer"], format_links=True, preserve_line_breaks=True)}
 
-    brief_content = content_loader.get_manifest(brief['frameworkSlug'], 'display_brief').filter(brief)
+    brief_content = get_filtered_manifest(brief['frameworkSlug'], 'display_brief', brief)
 
     # Get attributes in format suitable for govukSummaryList
     brief_summary = brief_content.summary(brief)
@@ -201,24 +223,24 @@ def get_brief_by_id(framework_family, brief_id):
 
 
 @main.route('/<framework_family>/opportunities')
+@cache_publicly('search')
 def list_opportunities(framework_family):
-    frameworks = data_api_client.find_frameworks()['frameworks']
-    frameworks = [v for v in frameworks if v['framework'] == framework_family]
-    framework = get_last_live_framework_or_404(frameworks, framework_family)
+    framework_index = get_framework_index(data_api_client)
+    framework = framework_index.last_live_or_404(framework_family)
 
     abort_if_not_further_competition_framework(framework)
+    add_surrogate_keys(surrogate_key('framework', framework['slug']))
 
-    lots_by_slug = get_lots_by_slug(framework)
+    lots_by_slug = framework_index.lots_by_slug(framework['slug'])
     current_lot_slug = get_valid_lot_from_args_or_none(request.args, lots_by_slug)
     content_manifest = content_loader.get_manifest(framework['slug'], 'briefs_search_filters')
 
-    filters = filters_for_lot(
-        current_lot_slug,
-        content_manifest,
-        all_lots=framework['lots']
-    )
+    filter_catalogue = get_filter_catalogue(framework, current_lot_slug, content_manifest)
 
-    clean_request_query_params = clean_request_args(request.args, filters.values(), lots_by_slug)
+    search_query = SearchQuery.from_request_args(request.args, filter_catalogue, lots_by_slug)
+    # a live search request only renders the fragments of the page it asks for, so only does the work for those
+    live_results_fragments = get_live_results_fragments(request.args, OPPORTUNITIES_LIVE_RESULTS_FRAGMENTS)
+    live_results_hashes = get_live_results_hashes(request.args)
 
     try:
         if int(request.args.get('page', 1)) <= 0:
@@ -228,26 +250,48 @@ def list_opportunities(framework_family):
 
     index = 'briefs-digital-outcomes-and-specialists'
     doc_type = 'briefs'
-    updated_request_args = None
 
     # This will exclude anything with a 'withdrawn' status
-    if 'statusOpenClosed' not in clean_request_query_params.keys():
-        updated_request_args = MultiDict(
-            [('statusOpenClosed', 'open'), ('statusOpenClosed', 'closed')]
-        )
-        updated_request_args.update(clean_request_query_params)
-
-    search_api_response = search_api_client.search(
+    if 'statusOpenClosed' not in search_query:
+        search_api_query = SearchQuery(MultiDict(
+            [('statusOpenClosed', 'open'), ('statusOpenClosed', 'closed')] + list(search_query.items(multi=True))
+        ))
+    else:
+        search_api_query = search_query
+
+    search_api_response = search_with_cache(
+        search_api_client,
         index=index,
         doc_type=doc_type,
         **build_search_query(
-            updated_request_args if updated_request_args else clean_request_query_params,
-            filters.values(),
+            search_api_query,
+            filter_catalogue,
             content_manifest,
             lots_by_slug
         )
     )
 
+    lots = [lot for lot in framework['lots'] if lot['allowsBrief']]
+    aggregations_by_lot = None
+    if live_results_fragments is None or 'categories' in live_results_fragments:
+        aggregations_by_lot = get_lot_aggregations(
+            framework, lots, search_api_query, content_manifest, doc_type, index, search_api_client
+        )
+
+    # the page is the same for as long as the results of its search and the counts in its category tree are, so
+    # browsers can revalidate their copy of it
+    etag = weak_etag(
+        framework['slug'],
+        search_api_query,
+        live_results_fragments,
+        live_results_hashes,
+        search_results_fingerprint(search_api_response),
+        aggregations_fingerprint(aggregations_by_lot),
+    )
+    not_modified = not_modified_response(etag)
+    if not_modified is not None:
+        return not_modified
+
     # Convert the values of certain attributes to their label counterparts
     content = content_loader.get_manifest(framework['slug'], 'briefs_search_filters')
     for brief in search_api_response['documents']:
@@ -270,55 +314,56 @@ def list_opportunities(framework_family):
     pagination_config = pagination(
         search_results_obj.total,
         results_per_page,
-        get_page_from_request(request)
+        search_query.page
     )
 
     search_summary = SearchSummary(
         search_api_response['meta']['total'],
-        clean_request_query_params.copy(),
-        filters.values(),
+        search_query,
+        filter_catalogue.values(),
         lots_by_slug
     )
 
+    # our own copy of the filter groups, which we annotate with the state of this request for display
+    filters = copy_filter_groups(filter_catalogue)
     category_filter_group = filters.pop('categories') if 'categories' in filters else None
-    lots = [lot for lot in framework['lots'] if lot['allowsBrief']]
 
     view_name = 'list_opportunities'
-    selected_category_tree_filters = build_lots_and_categories_link_tree(
-        framework,
-        lots,
-        category_filter_group,
-        request,
-        updated_request_args if updated_request_args else clean_request_query_params,
-        content_manifest,
-        doc_type,
-        index,
-        Href(url_for('.{}'.format(view_name), framework_family=framework['framework'])),
-        search_api_client
-    )
 
-    filter_form_hidden_fields_by_name = {
-        f["name"]: f for f in selected_category_tree_filters[1:]
-    }
+    category_tree_root, filter_form_hidden_fields_by_name = None, {}
+    if aggregations_by_lot is not None:
+        selected_category_tree_filters = build_lots_and_categories_link_tree(
+            framework,
+            lots,
+            category_filter_group,
+            request,
+            search_api_query,
+            content_manifest,
+            doc_type,
+            index,
+            Href(url_for('.{}'.format(view_name), framework_family=framework['framework'])),
+            search_api_client,
+            aggregations_by_lot=aggregations_by_lot,
+        )
+        category_tree_root = selected_category_tree_filters[0]
+
+        filter_form_hidden_fields_by_name = {
+            f["name"]: f for f in selected_category_tree_filters[1:]
+        }
     current_lot = lots_by_slug.get(current_lot_slug)
 
     set_filter_states(filters.values(), request)
 
-    for filter_groups in filters.values():
-        for filter_instance in filter_groups['filters']:
-            if 'label' in filter_instance:
-                filter_instance['label'] = capitalize_first(filter_instance['label'])
-                filter_instance['text'] = capitalize_first(filter_instance['label'])
-            filter_instance['attributes'] = {'aria-controls': 'search-summary-accessible-hint-wrapper'}
+    set_filter_display_attributes(filters.values())
 
     clear_filters_url = get_request_url_without_any_filters(
         request, filters, view_name, framework_family=framework_family
     )
-    search_query = query_args_for_pagination(clean_request_query_params)
+    search_query_args = query_args_for_pagination(search_query)
 
     template_args = dict(
         briefs=search_results_obj.search_results,
-        category_tree_root=selected_category_tree_filters[0],
+        category_tree_root=category_tree_root,
         clear_filters_url=clear_filters_url,
         current_lot=current_lot,
         doc_type=doc_type,
@@ -336,42 +381,21 @@ def list_opportunities(framework_family):
             'unsuccessful': 'no suitable suppliers'
         },
         pagination=pagination_config,
-        search_keywords=get_keywords_from_request(request),
-        search_query=search_query,
+        search_keywords=search_query.keywords,
+        search_query=search_query_args,
         summary=search_summary.markup(),
         total=search_results_obj.total,
         view_name=view_name,
     )
 
-    if request.args.get('live-results'):
-        from flask import jsonify
-
-        live_results_dict = {
-            "results": {
-                "selector": "#js-dm-live-search-results",
-                "html": render_template("search/_results_wrapper.html", **template_args)
-            },
-            "categories": {
-                "selector": "#js-dm-live-search-categories",
-                "html": render_template("search/_categories_wrapper.html", **template_args)
-            },
-            "summary": {
-                "selector": "#js-dm-live-search-summary",
-                "html": render_template("search/_summary.html", **template_args)
-            },
-            "summary-accessible-hint": {
-                "selector": "#js-dm-live-search-summary-accessible-hint",
-                "html": render_template("search/_summary_accessible_hint.html", **template_args)
-            },
-            "filter-title": {
-                "selector": "#js-dm-live-filter-title",
-                "html": render_template("search/_filter_title.html", **template_args)
-            },
+    if live_results_fragments is not None:
+        rendered_fragments = {
+            fragment: render_template(LIVE_RESULTS_FRAGMENTS[fragment].template_name, **template_args)
+            for fragment in live_results_fragments
         }
+        return tag_response(jsonify(get_live_results(rendered_fragments, live_results_hashes)), etag)
 
-        return jsonify(live_results_dict)
-
-    return render_template(
+    return tag_response(render_template(
         'search/briefs.html',
         **template_args
-    )
+    ), etag)
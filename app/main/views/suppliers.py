@@ -10,8 +10,11 @@ from dmutils.flask import timed_render_template as render_template
 
 from app import data_api_client
 from app.main import main
+from ..helpers.cache_control_helpers import add_surrogate_keys, cache_publicly, surrogate_key
+from ..helpers.etag_helpers import not_modified_response, tag_response, weak_etag
 from ..helpers.shared_helpers import parse_link
-from ..helpers.framework_helpers import get_framework_description, get_latest_live_framework
+from ..helpers.framework_helpers import get_framework_description, get_framework_index
+from ..helpers.supplier_helpers import get_supplier
 
 
 def process_prefix(prefix=None):
@@ -28,10 +31,9 @@ def is_alpha(character):
 
 
 @main.route('/g-cloud/suppliers')
+@cache_publicly('search')
 def suppliers_list_by_prefix():
-    all_frameworks = data_api_client.find_frameworks().get('frameworks')
-
-    if get_latest_live_framework(all_frameworks, 'g-cloud'):
+    if get_framework_index(data_api_client).latest_live('g-cloud'):
         prefix = process_prefix(prefix=request.args.get('prefix', default=u"A"))
         page = request.args.get('page', default=1, type=int)
 
@@ -40,7 +42,14 @@ def suppliers_list_by_prefix():
             suppliers = api_result["suppliers"]
             links = api_result["links"]
 
-            return render_template(
+            gcloud_framework_description = get_framework_description(data_api_client, 'g-cloud')
+
+            etag = weak_etag(prefix, page, suppliers, links, gcloud_framework_description)
+            not_modified = not_modified_response(etag)
+            if not_modified is not None:
+                return not_modified
+
+            return tag_response(render_template(
                 'suppliers_list.html',
                 suppliers=suppliers,
                 nav=ascii_uppercase,
@@ -48,8 +57,8 @@ def suppliers_list_by_prefix():
                 prev_link=parse_link(links, 'prev'),
                 next_link=parse_link(links, 'next'),
                 prefix=prefix,
-                gcloud_framework_description=get_framework_description(data_api_client, 'g-cloud'),
-            )
+                gcloud_framework_description=gcloud_framework_description,
+            ), etag)
         except APIError as e:
             if e.status_code == 404:
                 abort(404, "No suppliers for prefix {} page {}".format(prefix, page))
@@ -60,11 +69,14 @@ def suppliers_list_by_prefix():
 
 
 @main.route('/g-cloud/supplier/<supplier_id>')
+@cache_publicly('detail')
 def suppliers_details(supplier_id):
-    supplier = data_api_client.get_supplier(supplier_id=supplier_id)["suppliers"]
+    supplier = get_supplier(data_api_client, supplier_id)["suppliers"]
+    add_surrogate_keys(surrogate_key('supplier', supplier_id))
 
-    all_frameworks = data_api_client.find_frameworks().get('frameworks')
-    live_framework_names = [f['name'] for f in all_frameworks if f['status'] == 'live' and f['framework'] == 'g-cloud']
+    live_framework_names = [
+        f['name'] for f in get_framework_index(data_api_client).by_family_and_status('g-cloud', 'live')
+    ]
 
     if any(supplier.get('service_counts', {}).get(framework_name, 0) > 0 for framework_name in live_framework_names):
         first_character_of_supplier_name = supplier["name"][:1]
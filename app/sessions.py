@@ -0,0 +1,71 @@
+from time import time
+
+import flask_session
+from flask import current_app, request, session
+from flask_login import current_user
+
+
+class RedisSessionInterface(flask_session.RedisSessionInterface):
+    """
+    flask_session's Redis session interface, except that it only saves a session and re-issues its cookie when the
+    session has changed (or `SESSION_REFRESH_EACH_REQUEST` is set), as Flask's own session interface does. Left to
+    itself flask_session sets the cookie on every response with a session, which is every response.
+
+    New sessions start out empty, rather than holding just the permanent flag, so that they aren't saved (and don't
+    trip flask_login's session protection, which would change them) unless something is put in them. They're made
+    permanent when they are saved.
+    """
+
+    def __init__(self, redis, key_prefix, use_signer=False):
+        super().__init__(redis, key_prefix, use_signer, permanent=False)
+
+    def save_session(self, app, session, response):
+        if not self.should_set_cookie(app, session):
+            return
+
+        if session and not session.permanent:
+            session.permanent = True
+        super().save_session(app, session, response)
+
+
+def refresh_session():
+    """
+    Keeps a logged-in user's session alive by saving it, which re-issues its cookie, once `DM_SESSION_REFRESH_FRACTION`
+    of `PERMANENT_SESSION_LIFETIME` has passed since it was last saved. Other requests leave the session alone, so
+    anonymous responses don't set a cookie at all.
+    """
+    if not current_user.is_authenticated:
+        return
+
+    refreshed_at = session.get('_refreshed_at')
+    refresh_after = current_app.permanent_session_lifetime.total_seconds() * current_app.config[
+        'DM_SESSION_REFRESH_FRACTION'
+    ]
+    if refreshed_at is None or time() - refreshed_at >= refresh_after:
+        session.permanent = True
+        session['_refreshed_at'] = time()
+
+
+def drop_repeated_cookie_probe(response):
+    """Doesn't re-send the cookie probe dmutils sets on every response to clients that already have it"""
+    name = current_app.config['DM_COOKIE_PROBE_COOKIE_NAME']
+    if request.cookies.get(name) == current_app.config['DM_COOKIE_PROBE_COOKIE_VALUE']:
+        cookies = response.headers.getlist('Set-Cookie')
+        del response.headers['Set-Cookie']
+        for cookie in cookies:
+            if not cookie.startswith(name + '='):
+                response.headers.add('Set-Cookie', cookie)
+
+    return response
+
+
+def init_app(application):
+    if isinstance(application.session_interface, flask_session.RedisSessionInterface):
+        session_interface = application.session_interface
+        application.session_interface = RedisSessionInterface(
+            session_interface.redis,
+            session_interface.key_prefix,
+            session_interface.use_signer,
+        )
+
+    application.before_request(refresh_session)
@@ -22,6 +22,10 @@ class Config(object):
     SESSION_COOKIE_SAMESITE = "Lax"
 
     PERMANENT_SESSION_LIFETIME = 3600  # 1 hour
+    # Only save sessions (and re-issue their cookies) when they've changed...
+    SESSION_REFRESH_EACH_REQUEST = False
+    # ...or when this fraction of PERMANENT_SESSION_LIFETIME has passed since a logged-in user's session was last saved
+    DM_SESSION_REFRESH_FRACTION = 0.25
 
     DM_COOKIE_PROBE_EXPECT_PRESENT = True
 
@@ -41,6 +45,71 @@ class Config(object):
     # matches api(s)
     DM_SEARCH_PAGE_SIZE = 100
 
+    # Seconds before the cached frameworks list is refreshed in the background (0 disables the cache)
+    DM_FRAMEWORKS_CACHE_TTL = 60
+    # Seconds to keep strings derived from framework content (e.g. descriptions) - these are also dropped as soon as
+    # the framework changes status
+    DM_FRAMEWORK_CONTENT_CACHE_TTL = 3600
+
+    # Only hit the APIs once for identical GET requests made while handling a single request
+    DM_API_REQUEST_MEMOIZATION = True
+
+    # Share one read-only copy of the framework content between all threads instead of deep-copying it per thread
+    DM_SHARED_CONTENT_LOADER = True
+    # Load each framework content manifest the first time it's used rather than all of them at startup...
+    DM_LAZY_LOAD_CONTENT = True
+    # ...while loading those of frameworks that haven't expired in a background thread, starting with live ones
+    DM_WARM_CONTENT_IN_BACKGROUND = True
+    # Precompiled content built by scripts/build_content_snapshot.py (run when building docker-aws/Dockerfile.wsgi),
+    # used instead of the YAML in app/content unless the content has changed since it was built
+    DM_CONTENT_SNAPSHOT_PATH = 'app/content/snapshot.pickle'
+
+    # Threads shared by all requests for making the search API aggregation request for each lot at once (0 makes them
+    # one after another)...
+    DM_SEARCH_AGGREGATION_WORKERS = 8
+    # ...and seconds to wait for them before showing a lot's counts as unavailable
+    DM_SEARCH_AGGREGATION_TIMEOUT = 5
+    # Count the lots other than the one being searched with a single aggregation request rather than one for each
+    DM_SEARCH_AGGREGATION_BATCHING = True
+    # Seconds to keep the counts from each aggregation request, and how many to keep at most
+    DM_SEARCH_AGGREGATION_CACHE_TTL = 60
+    DM_SEARCH_AGGREGATION_CACHE_SIZE = 2000
+    # Threads shared by all requests for fetching the framework, declaration and supplier of a service page at once
+    # (0 fetches them one after another)...
+    DM_SERVICE_PAGE_FETCH_WORKERS = 16
+    # ...and seconds to wait for them, beyond the API clients' own timeouts
+    DM_SERVICE_PAGE_FETCH_TIMEOUT = 30
+    # Seconds to keep rendered service pages for anonymous users, and how many and how many bytes of them to keep at
+    # most (they're around 50KB each)
+    DM_SERVICE_PAGE_CACHE_TTL = 300
+    DM_SERVICE_PAGE_CACHE_SIZE = 1000
+    DM_SERVICE_PAGE_CACHE_MAX_BYTES = 50 * 1024 * 1024
+    # Seconds to keep supplier records shared by service and supplier pages, and how many to keep at most
+    DM_SUPPLIER_CACHE_TTL = 60
+    DM_SUPPLIER_CACHE_SIZE = 5000
+    # Seconds to keep display manifests filtered for each lot (or whatever else they depend on), and how many to keep
+    # at most
+    DM_FILTERED_MANIFEST_CACHE_TTL = 3600
+    DM_FILTERED_MANIFEST_CACHE_SIZE = 500
+    # Seconds to keep search API responses for, and how many to keep at most
+    DM_SEARCH_RESPONSE_CACHE_TTL = 30
+    DM_SEARCH_RESPONSE_CACHE_SIZE = 500
+
+    # Seconds edge caches may share anonymous users' responses for, by kind of page (0 keeps them private)
+    DM_PUBLIC_CACHE_MAX_AGES = {
+        'content': 3600,
+        'detail': 300,
+        'search': 60,
+    }
+    # The request header edge caches keep a separate copy of each shared page for each value of. Cookie is safe
+    # without any help from the edge cache, but splits the cache by every analytics cookie too. An edge cache that sets
+    # a header of its own from the session cookie (and strips any copy of it sent by the client) can name that header
+    # here instead, so that all anonymous users share the same copy, and logged-in users still never get it
+    DM_PUBLIC_CACHE_VARY = 'Cookie'
+    # Where to ask the edge cache to drop pages by surrogate key (will be read from env vars)
+    DM_EDGE_CACHE_PURGE_URL = None
+    DM_EDGE_CACHE_PURGE_TOKEN = None
+
     # This is just a placeholder
     ES_ENABLED = True
 
@@ -127,6 +196,19 @@ class Test(Config):
 
     GOOGLE_SITE_VERIFICATION = "NotARealVerificationKey"
 
+    DM_FRAMEWORKS_CACHE_TTL = 0
+    DM_FRAMEWORK_CONTENT_CACHE_TTL = 0
+    DM_LAZY_LOAD_CONTENT = False
+    DM_CONTENT_SNAPSHOT_PATH = None
+    DM_SEARCH_AGGREGATION_WORKERS = 0
+    DM_SEARCH_AGGREGATION_BATCHING = False
+    DM_SEARCH_AGGREGATION_CACHE_TTL = 0
+    DM_SEARCH_RESPONSE_CACHE_TTL = 0
+    DM_SERVICE_PAGE_FETCH_WORKERS = 0
+    DM_SERVICE_PAGE_CACHE_TTL = 0
+    DM_SUPPLIER_CACHE_TTL = 0
+    DM_FILTERED_MANIFEST_CACHE_TTL = 0
+
 
 class Development(Config):
     DEBUG = True
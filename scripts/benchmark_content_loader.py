@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Measure the memory used by, and first-access latency of, the per-thread content loaders with
+DM_SHARED_CONTENT_LOADER switched on ("shared") and off ("deepcopy").
+
+Each combination of mode and thread count is measured in a fresh subprocess, so RSS figures aren't skewed by earlier
+runs. Must be run from the root of the repo with the framework content in app/content (see scripts/build.sh).
+
+Usage:
+    scripts/benchmark_content_loader.py [--threads=<counts>] [--modes=<modes>]
+
+Options:
+    --threads=<counts>  Comma-separated numbers of threads [default: 1,8,32]
+    --modes=<modes>     Comma-separated modes to compare [default: deepcopy,shared]
+"""
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.insert(0, '.')
+
+from docopt import docopt  # noqa: E402
+
+
+def get_rss_kb():
+    # ru_maxrss is the peak, but every thread's loader is kept alive until we measure so that's what we want
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_worker(mode, thread_count):
+    from flask import Flask
+
+    import app
+    from app.content_snapshot import get_frameworks_from_content
+
+    application = Flask('benchmark')
+    application.config['DM_SHARED_CONTENT_LOADER'] = mode == 'shared'
+    frameworks = get_frameworks_from_content('app/content')
+    g_cloud_slug = max(f['slug'] for f in frameworks if f['framework'] == 'g-cloud')
+
+    app._content_loader_factory = app._make_content_loader_factory(application, frameworks)
+    rss_before = get_rss_kb()
+
+    timings, loaders = [], []
+
+    def first_access():
+        start = time.perf_counter()
+        content_loader = app.get_content_loader()
+        content_loader.get_manifest(g_cloud_slug, 'display_service')
+        timings.append(time.perf_counter() - start)
+        loaders.append(content_loader)
+
+    threads = [threading.Thread(target=first_access) for _ in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {
+        'rss_increase_mb': (get_rss_kb() - rss_before) / 1024,
+        'median_ms': statistics.median(timings) * 1000,
+        'max_ms': max(timings) * 1000,
+    }
+
+
+def main(arguments):
+    print(f"{'mode':<10}{'threads':>8}{'RSS increase (MB)':>20}{'median first access (ms)':>27}{'max (ms)':>10}")
+    for mode in arguments['--modes'].split(','):
+        for thread_count in arguments['--threads'].split(','):
+            output = subprocess.check_output([sys.executable, __file__, '--worker', mode, thread_count])
+            result = json.loads(output)
+            print(
+                f"{mode:<10}{thread_count:>8}{result['rss_increase_mb']:>20.1f}"
+                f"{result['median_ms']:>27.1f}{result['max_ms']:>10.1f}"
+            )
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--worker']:
+        print(json.dumps(run_worker(sys.argv[2], int(sys.argv[3]))))
+    else:
+        main(docopt(__doc__))
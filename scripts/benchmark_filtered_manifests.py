@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+"""
+Check that the display manifests shared by `get_filtered_manifest` give exactly the same service and brief pages as
+filtering the manifest for every document (as the app used to), and measure the time taken by each.
+
+Every G-Cloud service fixture is shown as a service of every G-Cloud framework, in each of the lots the framework's
+display_service manifest depends on, and likewise the DOS brief fixtures with display_brief. Must be run from the root
+of the repo with the framework content in app/content (see scripts/build.sh).
+
+Usage:
+    scripts/benchmark_filtered_manifests.py [--iterations=<n>]
+
+Options:
+    --iterations=<n>  Number of times to filter the manifest for each document in each mode [default: 100]
+"""
+import glob
+import json
+import sys
+import time
+from unittest import mock
+
+sys.path.insert(0, '.')
+
+from dmcontent.content_loader import ContentLoader  # noqa: E402
+from dmcontent.html import to_summary_list_rows  # noqa: E402
+from docopt import docopt  # noqa: E402
+from flask import Flask  # noqa: E402
+
+from app.content_loaders import load_framework_content  # noqa: E402
+from app.content_snapshot import get_frameworks_from_content  # noqa: E402
+from app.main.helpers import manifest_helpers  # noqa: E402
+from app.main.helpers.manifest_helpers import filtered_manifest_cache, get_filtered_manifest  # noqa: E402
+
+
+DISPLAY_MANIFESTS = {
+    'g-cloud': ('display_service', 'tests/fixtures/g*_service_fixture.json', 'services'),
+    'digital-outcomes-and-specialists': ('display_brief', 'tests/fixtures/dos_*brief*_fixture.json', 'briefs'),
+}
+
+
+def get_lots(manifest):
+    """Every lot slug that a question in `manifest` depends on"""
+    lots = set()
+    questions = [question for section in manifest.sections for question in section.questions]
+    while questions:
+        question = questions.pop()
+        questions.extend(getattr(question, 'questions', ()))
+        for depends in question.get('depends', ()):
+            if depends['on'] == 'lot':
+                lots.update(depends['being'])
+
+    return sorted(lots)
+
+
+def get_fixture_documents(pattern, key):
+    for path in sorted(glob.glob(pattern)):
+        with open(path) as f:
+            fixture = json.load(f)
+        fixture = fixture.get(key, fixture)
+        yield from (fixture if isinstance(fixture, list) else [fixture])
+
+
+def get_documents(content_loader, frameworks):
+    for framework in frameworks:
+        if framework['framework'] not in DISPLAY_MANIFESTS:
+            continue
+        manifest_name, pattern, key = DISPLAY_MANIFESTS[framework['framework']]
+        lots = get_lots(content_loader.get_manifest(framework['slug'], manifest_name))
+        for fixture in get_fixture_documents(pattern, key):
+            for lot in lots or [fixture.get('lot')]:
+                yield framework['slug'], manifest_name, dict(fixture, frameworkSlug=framework['slug'], lot=lot)
+
+
+def render(manifest, document):
+    return [
+        (section.name, to_summary_list_rows(section.questions, format_links=True, filter_empty=False))
+        for section in manifest.summary(document)
+    ]
+
+
+def filter_documents(content_loader, documents, iterations, shared):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for framework_slug, manifest_name, document in documents:
+            if shared:
+                get_filtered_manifest(framework_slug, manifest_name, document)
+            else:
+                content_loader.get_manifest(framework_slug, manifest_name).filter(document)
+
+    return (time.perf_counter() - start) / (iterations * len(documents))
+
+
+if __name__ == '__main__':
+    iterations = int(docopt(__doc__)['--iterations'])
+
+    application = Flask('benchmark')
+    application.config['DM_FILTERED_MANIFEST_CACHE_TTL'] = 3600
+    filtered_manifest_cache.init_app(application)
+
+    content_loader = ContentLoader('app/content')
+    frameworks = get_frameworks_from_content('app/content')
+    load_framework_content(application, content_loader, frameworks)
+    documents = list(get_documents(content_loader, frameworks))
+
+    with mock.patch.object(manifest_helpers, 'content_loader', content_loader):
+        mismatches = [
+            (framework_slug, document.get('id'), document['lot'])
+            for framework_slug, manifest_name, document in documents
+            if render(get_filtered_manifest(framework_slug, manifest_name, document), document) != render(
+                content_loader.get_manifest(framework_slug, manifest_name).filter(document), document
+            )
+        ]
+        filtered_manifest_cache.clear()
+
+        print(f"{'mode':<24}{'per document (us)':>18}")
+        for mode, shared in (('filtered every time', False), ('shared', True)):
+            per_document = filter_documents(content_loader, documents, iterations, shared)
+            print(f"{mode:<24}{per_document * 1e6:>18.1f}")
+
+    print(f"{len(documents)} documents checked, {len(mismatches)} rendered differently")
+    for mismatch in mismatches:
+        print("  {} {} ({})".format(*mismatch))
+
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+"""
+Measure the time taken to build a SearchSummary and the number of files opened while doing so, both with the summary
+rules compiled once (as the app now does) and with them reloaded for every summary (as it used to).
+
+Usage:
+    scripts/benchmark_search_summary.py [--iterations=<n>]
+
+Options:
+    --iterations=<n>  Number of summaries to build in each mode [default: 1000]
+"""
+import builtins
+import sys
+import time
+from unittest import mock
+
+sys.path.insert(0, '.')
+
+from docopt import docopt  # noqa: E402
+from werkzeug.datastructures import MultiDict  # noqa: E402
+
+from app.main.presenters.search_summary import SearchSummary, SummaryRules  # noqa: E402
+
+
+FILTER_GROUPS = [
+    {
+        'label': 'Minimum contract period',
+        'filters': [
+            {'name': 'minimumContractPeriod', 'value': value.lower(), 'label': value}
+            for value in ('Hour', 'Day', 'Month', 'Year', 'Other')
+        ],
+    },
+    {
+        'label': 'Categories',
+        'filters': [{'name': 'serviceCategories', 'value': 'accounting', 'label': 'Accounting and finance'}],
+    },
+]
+REQUEST_ARGS = MultiDict([
+    ('q', 'email'),
+    ('minimumContractPeriod', 'hour'),
+    ('minimumContractPeriod', 'day'),
+    ('serviceCategories', 'accounting'),
+])
+
+
+def build_summaries(iterations, reload_rules):
+    SummaryRules.load_rules()
+    with mock.patch.object(builtins, 'open', wraps=builtins.open) as open_:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            if reload_rules:
+                SummaryRules.load_rules()
+            SearchSummary(123, REQUEST_ARGS, FILTER_GROUPS, {}).markup()
+        elapsed = time.perf_counter() - start
+
+    return elapsed / iterations, open_.call_count
+
+
+if __name__ == '__main__':
+    iterations = int(docopt(__doc__)['--iterations'])
+
+    print(f"{'mode':<24}{'per summary (us)':>18}{'files opened':>14}")
+    for mode, reload_rules in (('reloaded every request', True), ('compiled once', False)):
+        per_summary, files_opened = build_summaries(iterations, reload_rules)
+        print(f"{mode:<24}{per_summary * 1e6:>18.1f}{files_opened:>14}")
@@ -0,0 +1,30 @@
+#!/usr/bin/env python
+"""
+Precompile the framework content in app/content and the search summary rules into a single snapshot, which app
+workers load at startup instead of parsing all the YAML. Workers ignore the snapshot (and parse the YAML) if it was
+built with a different Python or dmcontent version, or if any of the content files has changed since.
+
+Usage:
+    scripts/build_content_snapshot.py [<snapshot_path>]
+
+Options:
+    <snapshot_path>  Where to write the snapshot [default: app/content/snapshot.pickle]
+"""
+import sys
+import time
+
+sys.path.insert(0, '.')
+
+from docopt import docopt  # noqa: E402
+from flask import Flask  # noqa: E402
+
+from app.content_snapshot import build_content_snapshot  # noqa: E402
+
+
+if __name__ == '__main__':
+    arguments = docopt(__doc__)
+    snapshot_path = arguments['<snapshot_path>'] or 'app/content/snapshot.pickle'
+
+    start = time.perf_counter()
+    snapshot = build_content_snapshot(Flask('build_content_snapshot'), 'app/content', snapshot_path)
+    print(f"Wrote content snapshot {snapshot.version[:12]} to {snapshot_path} in {time.perf_counter() - start:.1f}s")
@@ -13,7 +13,8 @@ from dmtestutils.api_model_stubs import FrameworkStub
 from dmtestutils.api_model_stubs.lot import dos_lots, as_a_service_lots, cloud_lots
 from dmutils.formats import DATETIME_FORMAT
 
-from app import create_app, data_api_client, _make_content_loader_factory
+from app import create_app, data_api_client, _local, _make_content_loader_factory
+from config import configs
 from tests import login_for_tests
 
 
@@ -141,6 +142,9 @@ class BaseAPIClientMixin:
 
 class BaseApplicationTest(object):
     injected_content_loader = ContentLoader('app/content')
+    # test classes that load extra content into `app.content_loader` need their own copy of it, as the shared content
+    # loader is read-only
+    shared_content_loader = True
 
     def setup_method(self, method):
         """
@@ -173,6 +177,12 @@ class BaseApplicationTest(object):
             _make_content_loader_factory,
             initial_instance=self.injected_content_loader,
         )
+        self.shared_content_loader_patch = mock.patch.object(
+            configs['test'], 'DM_SHARED_CONTENT_LOADER', self.shared_content_loader
+        )
+        self.shared_content_loader_patch.start()
+        # each test's app makes its own content loader factory, so forget any loader made by an earlier test's
+        _local.__release_local__()
 
         self.app = create_app('test')
         self.app.register_blueprint(login_for_tests)
@@ -182,6 +192,7 @@ class BaseApplicationTest(object):
     def teardown_method(self, method):
         self.teardown_login()
         self.make_content_loader_factory_mock.stop()
+        self.shared_content_loader_patch.stop()
         self.app_env_var_mock.stop()
         self.session_mock.stop()
 
@@ -1,6 +1,7 @@
 from app.main.helpers.brief_helpers import (
     count_brief_responses_by_size_and_status,
-    format_winning_supplier_size
+    format_winning_supplier_size,
+    summarise_brief_responses,
 )
 from ...helpers import BaseApplicationTest
 
@@ -18,6 +19,21 @@ class TestBriefHelpers(BaseApplicationTest):
         }
         assert count_brief_responses_by_size_and_status(brief_responses) == expected_result
 
+    def test_summarise_brief_responses(self):
+        brief_responses = self._get_dos_brief_responses_fixture_data()["briefResponses"]
+
+        summary = summarise_brief_responses(brief_responses, winning_response_id=14276)
+
+        assert summary.counts == count_brief_responses_by_size_and_status(brief_responses)
+        assert summary.winning_response is brief_responses[1]
+        assert summary.completed_supplier_ids == {1234, 123456, 706029, 706031, 706032}
+
+    def test_summarise_brief_responses_without_a_winner(self):
+        brief_responses = self._get_dos_brief_responses_fixture_data()["briefResponses"]
+
+        assert summarise_brief_responses(brief_responses).winning_response is None
+        assert summarise_brief_responses(brief_responses, winning_response_id=1).winning_response is None
+
     def test_format_winning_supplier_size(self):
         assert format_winning_supplier_size("micro") == "SME"
         assert format_winning_supplier_size("small") == "SME"
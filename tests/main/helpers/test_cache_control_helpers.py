@@ -0,0 +1,112 @@
+import flask
+import mock
+import pytest
+from flask_login import LoginManager, UserMixin, login_user
+
+from app.main.helpers.cache_control_helpers import (
+    add_surrogate_keys,
+    cache_publicly,
+    purge_surrogate_keys,
+    set_public_cache_headers,
+    surrogate_key,
+)
+
+
+class User(UserMixin):
+    def __init__(self, user_id):
+        self.id = user_id
+
+
+class TestCachePublicly():
+    def setup_method(self, method):
+        self.app = flask.Flask(__name__)
+        self.app.config.update(
+            SECRET_KEY='secret',
+            DM_PUBLIC_CACHE_MAX_AGES={'detail': 300, 'search': 0},
+            DM_PUBLIC_CACHE_VARY='Cookie',
+            DM_EDGE_CACHE_PURGE_URL=None,
+        )
+        LoginManager(self.app).user_loader(User)
+        self.app.after_request(set_public_cache_headers)
+
+        @self.app.after_request
+        def set_cookie(response):
+            if 'cookie' in flask.request.args:
+                response.set_cookie('probe', 'yum')
+            return response
+
+        @self.app.route('/services/<service_id>')
+        @cache_publicly('detail')
+        def service(service_id):
+            add_surrogate_keys(surrogate_key('service', service_id), surrogate_key('framework', 'g-cloud-12'))
+            add_surrogate_keys(surrogate_key('service', service_id))
+            if 'login' in flask.request.args:
+                login_user(User('123'))
+            if 'flash' in flask.request.args:
+                flask.flash('Saved')
+            if 'missing' in flask.request.args:
+                return 'Not found', 404
+            return 'service'
+
+        @self.app.route('/search')
+        @cache_publicly('search')
+        def search():
+            return 'search'
+
+        self.client = self.app.test_client()
+
+    def test_anonymous_responses_can_be_shared_by_edge_caches(self):
+        response = self.client.get('/services/123')
+
+        assert set(response.headers['Cache-Control'].split(', ')) == {'public', 'max-age=0', 's-maxage=300'}
+        assert response.headers['Surrogate-Key'] == 'detail service-123 framework-g-cloud-12'
+        assert response.headers['Vary'] == 'Cookie'
+
+    def test_shared_responses_vary_on_the_configured_header(self):
+        self.app.config['DM_PUBLIC_CACHE_VARY'] = 'X-Session-State'
+
+        response = self.client.get('/services/123')
+
+        assert response.headers['Vary'] == 'X-Session-State'
+
+    @pytest.mark.parametrize('query', ('login', 'flash', 'cookie'))
+    def test_responses_for_logged_in_users_or_setting_cookies_are_private(self, query):
+        response = self.client.get('/services/123?{}'.format(query))
+
+        assert set(response.headers['Cache-Control'].split(', ')) == {'private', 'no-cache'}
+        assert 'Surrogate-Key' not in response.headers
+
+    def test_policies_without_a_max_age_are_private(self):
+        response = self.client.get('/search')
+
+        assert set(response.headers['Cache-Control'].split(', ')) == {'private', 'no-cache'}
+
+    def test_other_statuses_are_left_alone(self):
+        response = self.client.get('/services/123?missing')
+
+        assert 'Cache-Control' not in response.headers
+        assert 'Surrogate-Key' not in response.headers
+
+
+class TestPurgeSurrogateKeys():
+    def setup_method(self, method):
+        self.app = flask.Flask(__name__)
+
+    def test_does_nothing_without_an_edge_cache(self):
+        with self.app.app_context(), mock.patch('app.main.helpers.cache_control_helpers.requests') as requests:
+            assert purge_surrogate_keys('service-123') is False
+
+        assert requests.post.call_args_list == []
+
+    def test_purges_keys(self):
+        self.app.config.update(DM_EDGE_CACHE_PURGE_URL='https://edge.example.com/purge', DM_EDGE_CACHE_PURGE_TOKEN='t')
+
+        with self.app.app_context(), mock.patch('app.main.helpers.cache_control_helpers.requests') as requests:
+            assert purge_surrogate_keys('service-123', 'supplier-456') is True
+
+        assert requests.post.call_args_list == [mock.call(
+            'https://edge.example.com/purge',
+            headers={'Authorization': 'Bearer t', 'Surrogate-Key': 'service-123 supplier-456'},
+            timeout=10,
+        )]
+        assert requests.post.return_value.raise_for_status.called
@@ -0,0 +1,150 @@
+import threading
+import time
+
+import mock
+import pytest
+from flask import Flask
+
+from app.main.helpers.cache_helpers import TTLCache
+
+
+class TestTTLCache():
+    def setup_method(self, method):
+        self.app = Flask(__name__)
+        self.app.config['TEST_CACHE_TTL'] = 60
+
+        self.monotonic_patch = mock.patch('app.main.helpers.cache_helpers.monotonic', return_value=1000)
+        self.monotonic = self.monotonic_patch.start()
+
+        self.cache = TTLCache('TEST_CACHE_TTL')
+        self.cache.init_app(self.app)
+
+    def teardown_method(self, method):
+        self.monotonic_patch.stop()
+
+    def test_get_or_set_only_creates_value_once(self):
+        create_value = mock.Mock(return_value='value')
+
+        assert self.cache.get_or_set('key', create_value) == 'value'
+        assert self.cache.get_or_set('key', create_value) == 'value'
+
+        assert create_value.call_count == 1
+        assert (self.cache.hits, self.cache.misses) == (1, 1)
+
+    def test_entries_expire_after_ttl(self):
+        self.cache.set('key', 'value')
+
+        self.monotonic.return_value = 1060
+        assert self.cache.get('key') == 'value'
+
+        self.monotonic.return_value = 1061
+        assert self.cache.get('key') is None
+        assert len(self.cache) == 0
+
+    def test_ttl_of_zero_disables_cache(self):
+        self.app.config['TEST_CACHE_TTL'] = 0
+        self.cache.init_app(self.app)
+        create_value = mock.Mock(return_value='value')
+
+        self.cache.get_or_set('key', create_value)
+        self.cache.get_or_set('key', create_value)
+
+        assert create_value.call_count == 2
+
+    def test_invalidate_where(self):
+        self.cache.set(('g-cloud-11', 'live'), 'eleven')
+        self.cache.set(('g-cloud-12', 'live'), 'twelve')
+
+        self.cache.invalidate_where(lambda key: key[0] == 'g-cloud-11')
+
+        assert self.cache.get(('g-cloud-11', 'live')) is None
+        assert self.cache.get(('g-cloud-12', 'live')) == 'twelve'
+
+    def test_init_app_clears_cache(self):
+        self.cache.set('key', 'value')
+
+        self.cache.init_app(self.app)
+
+        assert self.cache.get('key') is None
+
+    def test_maxsize_drops_least_recently_used_entries(self):
+        self.cache.maxsize = 2
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.cache.get('a')
+
+        self.cache.set('c', 3)
+
+        assert len(self.cache) == 2
+        assert self.cache.get('b') is None
+        assert (self.cache.get('a'), self.cache.get('c')) == (1, 3)
+
+    def test_maxsize_is_read_from_config(self):
+        self.app.config['TEST_CACHE_SIZE'] = 1
+        cache = TTLCache('TEST_CACHE_TTL', maxsize_config_key='TEST_CACHE_SIZE')
+        cache.init_app(self.app)
+
+        cache.set('a', 1)
+        cache.set('b', 2)
+
+        assert (cache.get('a'), cache.get('b')) == (None, 2)
+
+    def test_maxweight_drops_least_recently_used_entries(self):
+        self.app.config['TEST_CACHE_BYTES'] = 10
+        cache = TTLCache('TEST_CACHE_TTL', maxweight_config_key='TEST_CACHE_BYTES', weigh=len)
+        cache.init_app(self.app)
+
+        cache.set('a', 'aaaa')
+        cache.set('b', 'bbbb')
+        cache.get('a')
+        cache.set('c', 'cccc')
+
+        assert (cache.get('a'), cache.get('b'), cache.get('c')) == ('aaaa', None, 'cccc')
+        assert cache.weight == 8
+
+        cache.set('a', 'a')
+        cache.invalidate('c')
+        assert cache.weight == 1
+
+        cache.set('d', 'd' * 11)
+        assert (len(cache), cache.weight) == (0, 0)
+
+    def test_get_or_set_coalesces_concurrent_calls_for_the_same_key(self):
+        metric = mock.Mock()
+        self.cache.metric = metric
+        created = threading.Event()
+        release = threading.Event()
+
+        def create_value():
+            created.set()
+            release.wait(1)
+            return 'value'
+
+        create_value = mock.Mock(side_effect=create_value)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.cache.get_or_set('key', create_value)))
+            for _ in range(5)
+        ]
+        threads[0].start()
+        created.wait(1)
+        for thread in threads[1:]:
+            thread.start()
+        while self.cache.coalesced < 4:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert results == ['value'] * 5
+        assert create_value.call_count == 1
+        assert sorted(call[0][0] for call in metric.labels.call_args_list) == ['coalesced'] * 4 + ['miss']
+
+    def test_get_or_set_shares_errors_with_coalesced_calls_but_does_not_cache_them(self):
+        create_value = mock.Mock(side_effect=[ValueError('failed'), 'value'])
+
+        with pytest.raises(ValueError):
+            self.cache.get_or_set('key', create_value)
+
+        assert self.cache.get_or_set('key', create_value) == 'value'
+        assert self.cache._in_flight == {}
@@ -0,0 +1,74 @@
+import threading
+import time
+from concurrent.futures import TimeoutError
+
+import flask
+import mock
+import pytest
+
+from app.main.helpers.concurrency_helpers import call_concurrently
+
+
+class TestCallConcurrently():
+    def setup_method(self, method):
+        self.app = flask.Flask(__name__)
+
+    def test_makes_calls_on_other_threads_in_the_request_context(self):
+        with self.app.test_request_context('/search?q=email'):
+            outcomes = call_concurrently('test', {
+                key: (lambda key=key: (key, flask.request.args['q'], threading.current_thread().name))
+                for key in ('a', 'b')
+            }, max_workers=2, timeout=1)
+
+        assert outcomes['a'][0][:2] == ('a', 'email')
+        assert outcomes['b'][0][:2] == ('b', 'email')
+        assert all(result[2].startswith('test') for result, error in outcomes.values())
+
+    def test_waits_for_the_slowest_call_not_the_sum_of_them(self):
+        start = time.perf_counter()
+        with self.app.app_context():
+            outcomes = call_concurrently('test', {
+                key: (lambda: time.sleep(0.2)) for key in ('a', 'b', 'c')
+            }, max_workers=3, timeout=1)
+
+        assert time.perf_counter() - start < 0.5
+        assert outcomes == {'a': (None, None), 'b': (None, None), 'c': (None, None)}
+
+    def test_returns_errors_and_timeouts(self):
+        def fail():
+            raise ValueError('failed')
+
+        outcomes = call_concurrently('test', {
+            'ok': lambda: 1,
+            'failed': fail,
+            'slow': lambda: time.sleep(0.5),
+        }, max_workers=3, timeout=0.1)
+
+        assert outcomes['ok'] == (1, None)
+        assert isinstance(outcomes['failed'][1], ValueError)
+        assert outcomes['slow'][0] is None
+        assert isinstance(outcomes['slow'][1], TimeoutError)
+
+    @pytest.mark.parametrize('max_workers', (0, None))
+    def test_makes_calls_serially_without_workers(self, max_workers):
+        def fail():
+            raise ValueError('failed')
+
+        outcomes = call_concurrently('test', {
+            'ok': threading.current_thread,
+            'failed': fail,
+        }, max_workers=max_workers, timeout=0)
+
+        assert outcomes['ok'] == (threading.current_thread(), None)
+        assert isinstance(outcomes['failed'][1], ValueError)
+
+    @pytest.mark.parametrize('max_workers', (0, 2))
+    def test_records_how_long_each_call_took(self, max_workers):
+        def fail():
+            raise ValueError('failed')
+
+        metric = mock.Mock()
+        call_concurrently('test', {'ok': lambda: 1, 'failed': fail}, max_workers=max_workers, timeout=1, metric=metric)
+
+        assert sorted(call[0][0] for call in metric.labels.call_args_list) == ['failed', 'ok']
+        assert metric.labels.return_value.observe.call_count == 2
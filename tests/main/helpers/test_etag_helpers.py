@@ -0,0 +1,65 @@
+import flask
+import pytest
+from flask_login import LoginManager, UserMixin, login_user
+
+from app.main.helpers.etag_helpers import not_modified_response, tag_response, weak_etag
+
+
+class User(UserMixin):
+    def __init__(self, user_id):
+        self.id = user_id
+
+
+class TestETags():
+    def setup_method(self, method):
+        self.app = flask.Flask(__name__)
+        self.app.config.update(VERSION='release-1', SECRET_KEY='secret')
+        LoginManager(self.app).user_loader(User)
+
+    def etag(self, *parts, version='release-1', user_id=None, path='/'):
+        self.app.config['VERSION'] = version
+        with self.app.test_request_context(path):
+            if user_id is not None:
+                login_user(User(user_id))
+            return weak_etag(*parts)
+
+    def test_etag_depends_on_parts_version_and_user(self):
+        etag = self.etag({'q': ['email']}, 9)
+
+        assert etag == self.etag({'q': ['email']}, 9)
+        assert etag != self.etag({'q': ['email']}, 10)
+        assert etag != self.etag({'q': ['email'], 'lot': ['saas']}, 9)
+        assert etag != self.etag({'q': ['email']}, 9, version='release-2')
+        assert etag != self.etag({'q': ['email']}, 9, user_id=123)
+        assert self.etag({'q': ['email']}, 9, user_id=123) != self.etag({'q': ['email']}, 9, user_id=124)
+
+    @pytest.mark.parametrize('if_none_match, not_modified', (
+        (None, False),
+        ('W/"abc"', True),
+        ('"abc"', True),
+        ('W/"def", W/"abc"', True),
+        ('W/"def"', False),
+        ('*', True),
+    ))
+    def test_not_modified_response(self, if_none_match, not_modified):
+        headers = {'If-None-Match': if_none_match} if if_none_match else {}
+        with self.app.test_request_context('/', headers=headers):
+            response = not_modified_response('abc')
+
+        if not_modified:
+            assert response.status_code == 304
+            assert response.headers['ETag'] == 'W/"abc"'
+        else:
+            assert response is None
+
+    def test_pages_with_flashed_messages_are_rendered(self):
+        with self.app.test_request_context('/', headers={'If-None-Match': 'W/"abc"'}):
+            flask.flash('Your search has been saved')
+            assert not_modified_response('abc') is None
+
+    def test_tag_response(self):
+        with self.app.test_request_context('/'):
+            response = tag_response('<p>page</p>', 'abc')
+
+        assert response.status_code == 200
+        assert response.headers['ETag'] == 'W/"abc"'
@@ -3,15 +3,23 @@ import pytest
 
 from dmapiclient import HTTPError
 from dmtestutils.api_model_stubs import FrameworkStub
+from flask import Flask
 from werkzeug.exceptions import NotFound
 
 from app.main.helpers.framework_helpers import (
+    FrameworkIndex,
+    FrameworkRegistry,
     get_framework_or_500,
     get_latest_live_framework,
     get_lots_by_slug,
     get_last_live_framework_or_404
 )
-from ...helpers import BaseApplicationTest, CustomAbortException
+from ...helpers import (
+    BaseApplicationTest,
+    CustomAbortException,
+    get_expired_frameworks_list_fixture_data,
+    get_frameworks_list_fixture_data,
+)
 
 
 class TestBuildSearchQueryHelpers(BaseApplicationTest):
@@ -101,3 +109,137 @@ class TestGetLastLiveFrameworkOr404(BaseApplicationTest):
         latest_live_framework = get_last_live_framework_or_404(available_frameworks, 'g-cloud')
 
         assert latest_live_framework['slug'] == 'g-cloud-9'
+
+
+class TestFrameworkIndex():
+    def setup_method(self, method):
+        self.frameworks = get_frameworks_list_fixture_data()['frameworks']
+        self.framework_index = FrameworkIndex(self.frameworks)
+
+    def test_get(self):
+        assert self.framework_index.get('g-cloud-8')['id'] == 6
+        assert self.framework_index.get('g-cloud-99') is None
+
+    def test_by_family_and_status(self):
+        assert [f['slug'] for f in self.framework_index.by_family('g-cloud')] == [
+            'g-cloud-7', 'g-cloud-6', 'g-cloud-8', 'g-cloud-5', 'g-cloud-4', 'g-cloud-9',
+        ]
+        assert [f['slug'] for f in self.framework_index.by_family_and_status('g-cloud', 'expired')] == [
+            'g-cloud-6', 'g-cloud-5', 'g-cloud-4',
+        ]
+        assert self.framework_index.by_family_and_status('g-cloud', 'open') == ()
+
+    @pytest.mark.parametrize('framework_family', ('g-cloud', 'digital-outcomes-and-specialists', 'xenoblade'))
+    def test_latest_live_matches_get_latest_live_framework(self, framework_family):
+        assert (
+            self.framework_index.latest_live(framework_family)
+            == get_latest_live_framework(self.frameworks, framework_family)
+        )
+
+    def test_latest_live_or_404(self):
+        assert self.framework_index.latest_live_or_404('g-cloud')['slug'] == 'g-cloud-9'
+
+        with pytest.raises(NotFound, match='No latest framework found for `xenoblade` family'):
+            self.framework_index.latest_live_or_404('xenoblade')
+
+    def test_last_live_or_404(self):
+        assert self.framework_index.last_live_or_404('g-cloud')['slug'] == 'g-cloud-9'
+        expired_framework_index = FrameworkIndex(get_expired_frameworks_list_fixture_data()['frameworks'])
+        assert expired_framework_index.last_live_or_404('g-cloud')['slug'] == 'g-cloud-9'
+
+        with pytest.raises(NotFound, match='No frameworks found for `xenoblade` family'):
+            self.framework_index.last_live_or_404('xenoblade')
+
+    def test_lots_by_slug(self):
+        g_cloud_9 = self.framework_index.get('g-cloud-9')
+        assert self.framework_index.lots_by_slug('g-cloud-9') == get_lots_by_slug(g_cloud_9)
+
+    def test_is_read_only(self):
+        with pytest.raises(TypeError):
+            self.framework_index.by_slug['g-cloud-10'] = {}
+        with pytest.raises(TypeError):
+            self.framework_index.lots_by_slug('g-cloud-9')['cloud-hosting'] = {}
+
+
+G_CLOUD_10 = FrameworkStub(id=10, slug='g-cloud-10', status='live').response()
+G_CLOUD_11 = FrameworkStub(id=11, slug='g-cloud-11', status='live').response()
+
+
+class TestFrameworkRegistry():
+    def setup_method(self, method):
+        self.app = Flask(__name__)
+        self.app.config['DM_FRAMEWORKS_CACHE_TTL'] = 60
+
+        self.data_api_client = mock.Mock()
+        self.data_api_client.find_frameworks.return_value = {'frameworks': [G_CLOUD_10]}
+
+        self.registry = FrameworkRegistry()
+        self.registry.init_app(self.app)
+
+    def test_calls_api_every_time_if_disabled(self):
+        self.app.config['DM_FRAMEWORKS_CACHE_TTL'] = 0
+        self.registry.init_app(self.app)
+
+        self.registry.get_frameworks(self.data_api_client)
+        self.registry.get_frameworks(self.data_api_client)
+
+        assert self.data_api_client.find_frameworks.call_count == 2
+
+    def test_serves_cached_frameworks_within_ttl(self):
+        assert self.registry.get_frameworks(self.data_api_client) == [G_CLOUD_10]
+        assert self.registry.get_frameworks(self.data_api_client) == [G_CLOUD_10]
+
+        assert self.data_api_client.find_frameworks.call_count == 1
+
+    def test_builds_index_once_per_snapshot(self):
+        assert self.registry.get_index(self.data_api_client) is self.registry.get_index(self.data_api_client)
+        assert self.registry.get_index(self.data_api_client).get('g-cloud-10') == G_CLOUD_10
+
+    @mock.patch('app.main.helpers.framework_helpers.Thread')
+    def test_serves_stale_frameworks_while_refreshing_in_background(self, thread):
+        self.registry.get_frameworks(self.data_api_client)
+        self.registry._fetched_at -= 61
+        self.data_api_client.find_frameworks.return_value = {'frameworks': [G_CLOUD_11]}
+
+        assert self.registry.get_frameworks(self.data_api_client) == [G_CLOUD_10]
+        # a refresh is already in progress so we don't start another one
+        assert self.registry.get_frameworks(self.data_api_client) == [G_CLOUD_10]
+        assert thread.call_count == 1
+
+        thread.call_args[1]['target'](*thread.call_args[1]['args'])
+
+        assert self.registry.get_frameworks(self.data_api_client) == [G_CLOUD_11]
+        assert self.data_api_client.find_frameworks.call_count == 2
+
+    @mock.patch('app.main.helpers.framework_helpers.Thread')
+    def test_keeps_stale_frameworks_if_background_refresh_fails(self, thread):
+        self.registry.get_frameworks(self.data_api_client)
+        self.registry._fetched_at -= 61
+        self.data_api_client.find_frameworks.side_effect = HTTPError(mock.Mock(status_code=503), 'Unavailable')
+
+        self.registry.get_frameworks(self.data_api_client)
+        thread.call_args[1]['target'](*thread.call_args[1]['args'])
+
+        assert self.registry.get_frameworks(self.data_api_client) == [G_CLOUD_10]
+        assert thread.call_count == 2
+
+    def test_notifies_listeners_of_framework_status_changes(self):
+        listener = mock.Mock()
+        self.registry.add_status_change_listener(listener)
+        self.data_api_client.find_frameworks.return_value = {'frameworks': [
+            FrameworkStub(id=11, slug='g-cloud-11', status='live').response(),
+            FrameworkStub(id=12, slug='g-cloud-12', status='live').response(),
+        ]}
+
+        self.registry._fetch(self.data_api_client)
+        self.registry._fetch(self.data_api_client)
+        assert listener.call_args_list == []
+
+        self.data_api_client.find_frameworks.return_value = {'frameworks': [
+            FrameworkStub(id=11, slug='g-cloud-11', status='expired').response(),
+            FrameworkStub(id=12, slug='g-cloud-12', status='live').response(),
+            FrameworkStub(id=13, slug='g-cloud-13', status='coming').response(),
+        ]}
+        self.registry._fetch(self.data_api_client)
+
+        assert listener.call_args_list == [mock.call({'g-cloud-11', 'g-cloud-13'})]
@@ -0,0 +1,98 @@
+import flask
+import mock
+import pytest
+from dmcontent.content_loader import ContentLoader
+
+from app.main.helpers import manifest_helpers
+from app.main.helpers.manifest_helpers import filtered_manifest_cache, get_context_fields, get_filtered_manifest
+
+
+QUESTIONS = {
+    'serviceName': 'question: Service name\ntype: text\n',
+    'cloudDeployment': (
+        'question: Cloud deployment\ntype: text\ndepends:\n  - "on": lot\n    being:\n      - cloud-hosting\n'
+    ),
+    'supportHours': 'question: Support hours for {{ lot }}\ntype: text\n',
+    'essentialRequirements': (
+        'name: Essential requirements\nquestion: Essential requirements\ntype: dynamic_list\n'
+        'dynamic_field: brief.essentialRequirements\nquestions:\n  - evidence\n'
+    ),
+    'evidence': 'question: Evidence\ntype: text\n',
+}
+
+
+def _section(name, question_ids):
+    return '- name: {}\n  questions:\n'.format(name) + ''.join('    - {}\n'.format(id) for id in question_ids)
+
+
+@pytest.fixture
+def loader(tmp_path):
+    framework_path = tmp_path / 'frameworks' / 'g-cloud-12'
+    (framework_path / 'questions' / 'services').mkdir(parents=True)
+    (framework_path / 'manifests').mkdir()
+    for question_id, question in QUESTIONS.items():
+        (framework_path / 'questions' / 'services' / '{}.yml'.format(question_id)).write_text(question)
+    (framework_path / 'manifests' / 'display_service.yml').write_text(
+        _section('About', ['serviceName', 'supportHours']) + _section('Hosting', ['cloudDeployment'])
+    )
+    (framework_path / 'manifests' / 'display_dynamic.yml').write_text(
+        _section('Requirements', ['essentialRequirements'])
+    )
+
+    loader = ContentLoader(str(tmp_path))
+    loader.load_manifest('g-cloud-12', 'services', 'display_service')
+    loader.load_manifest('g-cloud-12', 'services', 'display_dynamic')
+
+    app = flask.Flask(__name__)
+    app.config['DM_FILTERED_MANIFEST_CACHE_TTL'] = 60
+    filtered_manifest_cache.init_app(app)
+    with mock.patch.object(manifest_helpers, 'content_loader', loader):
+        yield loader
+
+    filtered_manifest_cache.ttl = 0
+    filtered_manifest_cache.clear()
+
+
+def _rendered(manifest, document):
+    return [
+        (section.name, [(question.id, question.question, question.value) for question in section.questions])
+        for section in manifest.summary(document)
+    ]
+
+
+class TestGetFilteredManifest():
+    def test_context_fields_are_those_depended_on_and_templated(self, loader):
+        assert get_context_fields(loader.get_manifest('g-cloud-12', 'display_service')) == {'lot'}
+        assert get_context_fields(loader.get_manifest('g-cloud-12', 'display_dynamic')) is None
+
+    @pytest.mark.parametrize('document', (
+        {'lot': 'cloud-hosting', 'serviceName': 'Hosting'},
+        {'lot': 'cloud-software', 'serviceName': 'Software'},
+    ))
+    def test_matches_filtering_by_the_whole_document(self, loader, document):
+        other_document = dict(document, id='2', serviceName='Other')
+        get_filtered_manifest('g-cloud-12', 'display_service', other_document)
+
+        assert _rendered(get_filtered_manifest('g-cloud-12', 'display_service', document), document) == _rendered(
+            loader.get_manifest('g-cloud-12', 'display_service').filter(document), document
+        )
+
+    def test_documents_in_the_same_lot_share_a_filtered_manifest(self, loader):
+        first = get_filtered_manifest('g-cloud-12', 'display_service', {'lot': 'cloud-hosting', 'id': '1'})
+        second = get_filtered_manifest('g-cloud-12', 'display_service', {'lot': 'cloud-hosting', 'id': '2'})
+        other_lot = get_filtered_manifest('g-cloud-12', 'display_service', {'lot': 'cloud-support', 'id': '3'})
+
+        assert first is second
+        assert other_lot is not first
+        assert [section.name for section in other_lot] == ['About']
+
+    def test_manifests_with_dynamic_lists_are_filtered_every_time(self, loader):
+        brief = {'essentialRequirements': ['Fast', 'Cheap']}
+
+        first = get_filtered_manifest('g-cloud-12', 'display_dynamic', {'brief': brief})
+        second = get_filtered_manifest('g-cloud-12', 'display_dynamic', {'brief': brief})
+
+        assert first is not second
+        assert len(first.sections[0].questions[0].questions) == 2
+        assert filtered_manifest_cache.get(('g-cloud-12', 'display_dynamic'), 'missing') is None
+        assert len(filtered_manifest_cache) == 1
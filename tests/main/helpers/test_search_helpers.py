@@ -296,3 +296,201 @@ class TestBuildSearchQueryHelpers(BaseApplicationTest):
 
         assert search_helpers.build_search_query(request.args, self.lot_filters, self._loader(),
                                                  self._lots_by_slug) == {}
+
+
+class TestFilterCatalogue():
+    def setup_method(self, method):
+        self.filter_groups = {
+            'section1': {'label': 'section1', 'filters': [
+                {'name': 'question1', 'value': 'true'},
+                {'name': 'question3', 'value': 'option1'},
+                {'name': 'question3', 'value': 'option2'},
+            ]},
+            'section2': {'label': 'section2', 'filters': [
+                {'name': 'question6', 'value': 'option1', 'children': [{'name': 'question7', 'value': 'child'}]},
+            ]},
+        }
+        self.catalogue = search_helpers.FilterCatalogue(self.filter_groups, radio_keys=frozenset(['question3']))
+        self.content_builder = mock.Mock()
+        self.content_builder.get_question.side_effect = AssertionError("questions shouldn't be searched")
+
+    def test_allowed_filters_match_allowed_request_lot_filters(self):
+        assert self.catalogue.allowed_filters == search_helpers.allowed_request_lot_filters(
+            self.filter_groups.values()
+        )
+
+    def test_filter_groups_are_read_only(self):
+        assert list(self.catalogue) == ['section1', 'section2']
+        with pytest.raises(TypeError):
+            self.catalogue['section1']['label'] = 'changed'
+        with pytest.raises(TypeError):
+            self.catalogue['section2']['filters'][0]['children'][0]['value'] = 'changed'
+
+    def test_clean_request_args_with_catalogue_matches_filter_groups(self):
+        request_args = MultiDict([
+            ('question1', 'true'), ('question3', 'option2'), ('question3', 'option5'), ('question7', 'child'),
+            ('unknown', 'key'), ('q', 'email'),
+        ])
+
+        assert search_helpers.clean_request_args(request_args, self.catalogue, {}) == (
+            search_helpers.clean_request_args(request_args, list(self.filter_groups.values()), {})
+        )
+
+    def test_build_search_query_uses_radio_keys(self):
+        request_args = MultiDict([('question3', 'option1'), ('question3', 'option2'), ('question1', 'true')])
+
+        assert search_helpers.build_search_query(request_args, self.catalogue, self.content_builder, {}) == {
+            'question1': 'true',
+            'question3': 'option1,option2',
+        }
+
+    def test_ungroup_request_filters_uses_radio_keys(self):
+        assert search_helpers.ungroup_request_filters(
+            (('question3', 'option1,option2'), ('question1', 'true')), self.content_builder, radio_keys={'question3'}
+        ) == (('question3', 'option1'), ('question3', 'option2'), ('question1', 'true'))
+
+    def test_get_radio_keys(self):
+        questions = {
+            'question1': {'type': 'boolean'},
+            'question3': {'type': 'radios'},
+            'lot': {'type': 'radios'},
+        }
+        content_builder = mock.Mock(sections=[mock.Mock(questions=[
+            mock.Mock(id=question_id, **{
+                'get_question_ids.return_value': [question_id],
+                'get.return_value': None,
+            })
+            for question_id in questions
+        ])])
+        content_builder.get_question.side_effect = questions.get
+
+        assert search_helpers.get_radio_keys(content_builder) == {'question3'}
+
+
+class TestSearchQuery():
+    def test_same_search_gives_equal_queries(self):
+        query = search_helpers.SearchQuery(MultiDict([
+            ('q', 'email'), ('question3', 'option2'), ('lot', 'saas'), ('question3', 'option1'), ('q', 'email'),
+        ]))
+        same_query = search_helpers.SearchQuery(MultiDict([
+            ('question3', 'option2'), ('lot', 'saas'), ('q', 'email'), ('question3', 'option1'),
+        ]))
+
+        assert list(query.items(multi=True)) == [
+            ('lot', 'saas'), ('q', 'email'), ('question3', 'option2'), ('question3', 'option1'),
+        ]
+        assert query == same_query
+        assert hash(query) == hash(same_query)
+        assert {query: 'cached'}[same_query] == 'cached'
+
+    def test_is_immutable(self):
+        query = search_helpers.SearchQuery({'q': 'email'})
+
+        with pytest.raises(TypeError):
+            query['q'] = 'cloud'
+        copy = query.copy()
+        copy['q'] = 'cloud'
+        assert query['q'] == 'email'
+
+    def test_from_request_args_cleans_args(self):
+        lot_filters = [{'label': 'section1', 'filters': [{'name': 'question1', 'value': 'true'}]}]
+        query = search_helpers.SearchQuery.from_request_args(
+            MultiDict({'question1': ['true', 'false'], 'unknown': 'key', 'lot': 'saas', 'q': 'email', 'page': '2'}),
+            lot_filters,
+            {'saas': {}},
+        )
+
+        assert query == search_helpers.SearchQuery({'question1': 'true', 'lot': 'saas', 'q': 'email', 'page': '2'})
+        assert (query.lot, query.keywords, query.page) == ('saas', 'email', 2)
+
+    @pytest.mark.parametrize('args, page', (({}, None), ({'page': 'two'}, None), ({'page': '3'}, 3)))
+    def test_page(self, args, page):
+        assert search_helpers.SearchQuery(args).page == page
+
+
+class TestSearchWithCache():
+    def setup_method(self, method):
+        self.search_api_client = mock.Mock()
+        self.search_api_client.search.return_value = {'documents': [{'lot': 'cloud-software'}], 'meta': {'total': 1}}
+        search_helpers.search_response_cache.ttl = 30
+
+    def teardown_method(self, method):
+        search_helpers.search_response_cache.ttl = 0
+        search_helpers.search_response_cache.clear()
+
+    def test_identical_searches_only_reach_search_api_once(self):
+        for query in ({'q': 'email', 'lot': 'cloud-software'}, {'lot': 'cloud-software', 'q': 'email'}):
+            search_helpers.search_with_cache(self.search_api_client, index='g-cloud-12', doc_type='services', **query)
+
+        search_helpers.search_with_cache(
+            self.search_api_client, index='g-cloud-12', doc_type='services', q='email', lot='cloud-support'
+        )
+
+        assert self.search_api_client.search.call_args_list == [
+            mock.call(index='g-cloud-12', doc_type='services', q='email', lot='cloud-software'),
+            mock.call(index='g-cloud-12', doc_type='services', q='email', lot='cloud-support'),
+        ]
+
+    def test_each_caller_gets_its_own_copy_of_the_response(self):
+        response = search_helpers.search_with_cache(self.search_api_client, index='g-cloud-12', doc_type='services')
+        response['documents'][0]['lot'] = {'slug': 'cloud-software'}
+
+        assert search_helpers.search_with_cache(self.search_api_client, index='g-cloud-12', doc_type='services') == {
+            'documents': [{'lot': 'cloud-software'}], 'meta': {'total': 1},
+        }
+
+
+class TestGetLiveResultsFragments():
+    available_fragments = ('results', 'categories', 'summary', 'filter-title')
+
+    def test_not_a_live_results_request(self):
+        assert search_helpers.get_live_results_fragments(
+            MultiDict({'q': 'email', 'live-results-fragments': 'summary'}), self.available_fragments
+        ) is None
+
+    def test_all_available_fragments_if_none_are_asked_for(self):
+        assert search_helpers.get_live_results_fragments(
+            MultiDict({'live-results': 'true'}), self.available_fragments
+        ) == self.available_fragments
+
+    @pytest.mark.parametrize('requested, fragments', (
+        ('filter-title,summary', ('summary', 'filter-title')),
+        ('summary,save-form', ('summary',)),
+        ('', ()),
+    ))
+    def test_only_available_fragments_asked_for(self, requested, fragments):
+        assert search_helpers.get_live_results_fragments(
+            MultiDict({'live-results': 'true', 'live-results-fragments': requested}), self.available_fragments
+        ) == fragments
+
+
+class TestGetLiveResults():
+    def test_get_live_results_hashes(self):
+        assert search_helpers.get_live_results_hashes(
+            MultiDict({'live-results-hashes': 'summary:abc123,categories:def456,nonsense'})
+        ) == {'summary': 'abc123', 'categories': 'def456'}
+        assert search_helpers.get_live_results_hashes(MultiDict()) == {}
+
+    def test_gives_each_fragment_with_its_selector_and_hash(self):
+        assert search_helpers.get_live_results({'results': '<div>results</div>', 'summary': '<div>summary</div>'}) == {
+            'results': {
+                'selector': '#js-dm-live-search-results',
+                'hash': search_helpers.hash_live_results_fragment('<div>results</div>'),
+                'html': '<div>results</div>',
+            },
+            'summary': {
+                'selector': '#js-dm-live-search-summary',
+                'hash': search_helpers.hash_live_results_fragment('<div>summary</div>'),
+                'html': '<div>summary</div>',
+            },
+        }
+
+    def test_leaves_out_html_of_fragments_with_known_hashes(self):
+        summary_hash = search_helpers.hash_live_results_fragment('<div>summary</div>')
+        data = search_helpers.get_live_results(
+            {'results': '<div>results</div>', 'summary': '<div>summary</div>'},
+            {'results': 'stale', 'summary': summary_hash},
+        )
+
+        assert data['summary'] == {'selector': '#js-dm-live-search-summary', 'hash': summary_hash, 'unchanged': True}
+        assert data['results']['html'] == '<div>results</div>'
@@ -0,0 +1,89 @@
+from copy import deepcopy
+
+import flask
+import mock
+import pytest
+from flask_login import LoginManager, UserMixin, login_user
+
+from app.main.helpers.service_page_helpers import (
+    get_or_render_service_page,
+    rendered_service_page_cache,
+    service_page_cache_key,
+)
+
+
+SERVICE = {
+    'services': {'id': '1234', 'supplierId': 567, 'updatedAt': '2020-01-01T00:00:00.000000Z'},
+    'serviceMadeUnavailableAuditEvent': None,
+}
+FRAMEWORK = {'slug': 'g-cloud-12', 'status': 'live'}
+DECLARATION = {'modernSlaveryStatement': 'https://example.com/statement.pdf'}
+SUPPLIER = {'id': 567, 'name': 'Supplier', 'contactInformation': [{'contactName': 'Contact'}]}
+
+
+class User(UserMixin):
+    def __init__(self, user_id):
+        self.id = user_id
+
+
+class TestServicePageCacheKey():
+    def key(self, changes=()):
+        service, framework, declaration, supplier = deepcopy((SERVICE, FRAMEWORK, DECLARATION, SUPPLIER))
+        for change in changes:
+            change(service, framework, declaration, supplier)
+        return service_page_cache_key(service, framework, declaration, supplier, 'G-Cloud 12')
+
+    def test_is_the_same_for_the_same_upstream_versions(self):
+        assert self.key() == self.key()
+        assert self.key()[:2] == ('1234', '567')
+
+    @pytest.mark.parametrize('change', (
+        lambda service, framework, declaration, supplier: service['services'].update(updatedAt='2020-02-01'),
+        lambda service, framework, declaration, supplier: service.update(
+            serviceMadeUnavailableAuditEvent={'type': 'update_service_status', 'createdAt': '2020-02-01'}
+        ),
+        lambda service, framework, declaration, supplier: framework.update(status='expired'),
+        lambda service, framework, declaration, supplier: framework.update(frameworkExpiresAtUTC='2021-01-01'),
+        lambda service, framework, declaration, supplier: declaration.update(modernSlaveryStatement=None),
+        lambda service, framework, declaration, supplier: supplier['contactInformation'][0].update(contactName='New'),
+    ))
+    def test_changes_with_upstream_versions(self, change):
+        assert self.key([change]) != self.key()
+
+
+class TestGetOrRenderServicePage():
+    def setup_method(self, method):
+        self.app = flask.Flask(__name__)
+        self.app.config.update(SECRET_KEY='secret', DM_SERVICE_PAGE_CACHE_TTL=60)
+        LoginManager(self.app).user_loader(User)
+        rendered_service_page_cache.init_app(self.app)
+
+        self.render = mock.Mock(return_value=('<p>Service</p>', 410))
+        self.key = service_page_cache_key(SERVICE, FRAMEWORK, DECLARATION, SUPPLIER)
+
+    def teardown_method(self, method):
+        rendered_service_page_cache.ttl = 0
+        rendered_service_page_cache.clear()
+
+    def test_pages_for_anonymous_users_are_rendered_once_with_their_status(self):
+        for _ in range(2):
+            with self.app.test_request_context('/g-cloud/services/1234'):
+                assert get_or_render_service_page(self.key, self.render) == ('<p>Service</p>', 410)
+
+        assert self.render.call_count == 1
+
+    def test_pages_for_logged_in_users_are_always_rendered(self):
+        for _ in range(2):
+            with self.app.test_request_context('/g-cloud/services/1234'):
+                login_user(User('123'))
+                get_or_render_service_page(self.key, self.render)
+
+        assert self.render.call_count == 2
+        assert len(rendered_service_page_cache) == 0
+
+    def test_pages_are_weighed_in_bytes(self):
+        self.render.return_value = ('<p>Servi\u00e7e</p>', 200)
+        with self.app.test_request_context('/g-cloud/services/1234'):
+            get_or_render_service_page(self.key, self.render)
+
+        assert rendered_service_page_cache.weight == len('<p>Servi\u00e7e</p>') + 1
@@ -0,0 +1,53 @@
+import threading
+
+import flask
+import mock
+
+from app.main.helpers.supplier_helpers import get_supplier, supplier_cache
+
+
+class TestGetSupplier():
+    def setup_method(self, method):
+        app = flask.Flask(__name__)
+        app.config['DM_SUPPLIER_CACHE_TTL'] = 60
+        supplier_cache.init_app(app)
+
+        self.data_api_client = mock.Mock()
+        self.data_api_client.get_supplier.side_effect = lambda supplier_id: {'suppliers': {'id': supplier_id}}
+
+    def teardown_method(self, method):
+        supplier_cache.ttl = 0
+        supplier_cache.clear()
+
+    def test_fetches_each_supplier_once(self):
+        assert get_supplier(self.data_api_client, 567) == {'suppliers': {'id': 567}}
+        assert get_supplier(self.data_api_client, '567') == {'suppliers': {'id': 567}}
+        assert get_supplier(self.data_api_client, 568) == {'suppliers': {'id': 568}}
+
+        assert self.data_api_client.get_supplier.call_args_list == [mock.call(567), mock.call(568)]
+
+    def test_concurrent_requests_for_a_supplier_share_one_fetch(self):
+        release = threading.Event()
+
+        def get_slow_supplier(supplier_id):
+            release.wait(1)
+            return {'suppliers': {'id': supplier_id}}
+
+        self.data_api_client.get_supplier.side_effect = get_slow_supplier
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_supplier(self.data_api_client, 567)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for _ in range(100):
+            if supplier_cache.coalesced == 4:
+                break
+            threading.Event().wait(0.01)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert self.data_api_client.get_supplier.call_count == 1
+        assert results == [{'suppliers': {'id': 567}}] * 5
@@ -1,6 +1,7 @@
 import itertools
 import json
 import os
+import time
 
 import flask
 import mock
@@ -8,14 +9,20 @@ import pytest
 from werkzeug.datastructures import MultiDict
 from werkzeug.urls import Href
 
+from dmapiclient import HTTPError
 from dmcontent.content_loader import ContentLoader
 
+from app.main.helpers.framework_helpers import framework_content_cache
 from app.main.presenters.search_presenters import (
+    copy_filter_groups,
     filters_for_lot,
+    get_filter_catalogue,
+    search_aggregation_cache,
     set_filter_states,
     build_lots_and_categories_link_tree,
 )
 from ...helpers import BaseApplicationTest
+from ...search_api_stub import SearchAPIStub
 
 content_loader = ContentLoader('tests/fixtures/content')
 content_loader.load_manifest('g6', 'data', 'manifest')
@@ -303,6 +310,51 @@ class TestSearchFilters(BaseApplicationTest):
         assert 'Radios example' in filter_group_labels
 
 
+class TestFilterCatalogue:
+    def setup_method(self, method):
+        self.framework = {'slug': 'g-cloud-9', 'status': 'live', 'lots': _get_framework_lots('g-cloud-9')}
+
+    def teardown_method(self, method):
+        framework_content_cache.clear()
+
+    def test_copy_matches_filters_for_lot(self):
+        filter_catalogue = get_filter_catalogue(self.framework, 'cloud-software', g9_builder)
+
+        assert copy_filter_groups(filter_catalogue) == filters_for_lot('cloud-software', g9_builder)
+
+    def test_is_read_only(self):
+        filter_catalogue = get_filter_catalogue(self.framework, 'cloud-software', g9_builder)
+        category_filter = filter_catalogue['categories-example']['filters'][1]
+
+        with pytest.raises(TypeError):
+            category_filter['selected'] = True
+        with pytest.raises(TypeError):
+            category_filter['children'][0]['link'] = '/g-cloud/search'
+        with pytest.raises(AttributeError):
+            filter_catalogue['categories-example']['filters'].append({})
+
+    def test_copies_can_be_annotated_independently(self):
+        filter_catalogue = get_filter_catalogue(self.framework, 'cloud-software', g9_builder)
+        filters = copy_filter_groups(filter_catalogue)
+
+        set_filter_states(filters.values(), mock.Mock(args=MultiDict([('checkboxTreeExample', 'option 1')])))
+        filters['categories-example']['filters'][1]['children'].pop()
+
+        assert filters['categories-example']['filters'][0]['checked'] is True
+        assert copy_filter_groups(filter_catalogue) == filters_for_lot('cloud-software', g9_builder)
+
+    @mock.patch('app.main.presenters.search_presenters.filters_for_lot', wraps=filters_for_lot)
+    def test_is_only_built_once_per_framework_and_lot(self, filters_for_lot_mock):
+        with mock.patch.object(framework_content_cache, 'ttl', 60):
+            assert (
+                get_filter_catalogue(self.framework, 'cloud-software', g9_builder)
+                is get_filter_catalogue(self.framework, 'cloud-software', g9_builder)
+            )
+            get_filter_catalogue(self.framework, 'cloud-hosting', g9_builder)
+
+        assert filters_for_lot_mock.call_count == 2
+
+
 class TestLotsAndCategoriesSelection(BaseApplicationTest):
     def setup_method(self, method):
         super().setup_method(method)
@@ -444,6 +496,124 @@ class TestLotsAndCategoriesSelection(BaseApplicationTest):
                 }
             ]
 
+    def _build_tree(self, url):
+        with self.app.test_request_context(url):
+            return build_lots_and_categories_link_tree(
+                self.framework,
+                self.framework['lots'],
+                self.category_filter_group,
+                flask.request,
+                flask.request.args,
+                g9_builder,
+                'services',
+                'g-cloud-9',
+                Href(flask.url_for('.search_services')),
+                self.search_api_client
+            )
+
+    @pytest.mark.parametrize('url', (
+        "/g-cloud/search",
+        "/g-cloud/search?lot=cloud-software&checkboxTreeExample=option+2.2",
+    ))
+    def test_build_lots_and_categories_link_tree_concurrently_matches_serial(self, url):
+        serial_tree = self._build_tree(url)
+
+        self.app.config['DM_SEARCH_AGGREGATION_WORKERS'] = 4
+        assert self._build_tree(url) == serial_tree
+        assert self.search_api_client.aggregate.call_count == 6
+
+    @pytest.mark.parametrize('workers', (0, 4))
+    def test_build_lots_and_categories_link_tree_shows_unavailable_counts_for_failed_lots(self, workers):
+        def aggregate(**kwargs):
+            if kwargs['lot'] == 'cloud-software':
+                raise HTTPError(mock.Mock(status_code=503))
+            return _get_g9_aggregations_fixture_data()
+
+        self.search_api_client.aggregate.side_effect = aggregate
+        self.app.config['DM_SEARCH_AGGREGATION_WORKERS'] = workers
+
+        tree = self._build_tree("/g-cloud/search")
+
+        assert [lot_filter['service_count'] for lot_filter in tree[0]['children']] == [500, None, 500]
+        assert tree[0]['children'][1]['link'] == '/g-cloud/search?lot=cloud-software'
+
+        selected_lot = self._build_tree("/g-cloud/search?lot=cloud-software")[1]
+
+        assert selected_lot['service_count'] is None
+        assert all(category['service_count'] is None for category in selected_lot['children'])
+
+    def test_build_lots_and_categories_link_tree_shows_unavailable_counts_for_slow_lots(self):
+        def aggregate(**kwargs):
+            if kwargs['lot'] == 'cloud-support':
+                time.sleep(0.5)
+            return _get_g9_aggregations_fixture_data()
+
+        self.search_api_client.aggregate.side_effect = aggregate
+        self.app.config['DM_SEARCH_AGGREGATION_WORKERS'] = 4
+        self.app.config['DM_SEARCH_AGGREGATION_TIMEOUT'] = 0.1
+
+        tree = self._build_tree("/g-cloud/search")
+
+        assert [lot_filter['service_count'] for lot_filter in tree[0]['children']] == [500, 500, None]
+
+    def test_build_lots_and_categories_link_tree_does_not_hide_other_errors(self):
+        self.search_api_client.aggregate.side_effect = KeyError('lot')
+        self.app.config['DM_SEARCH_AGGREGATION_WORKERS'] = 4
+
+        with pytest.raises(KeyError):
+            self._build_tree("/g-cloud/search")
+
+    def _use_search_api_stub(self, **kwargs):
+        stub = SearchAPIStub([
+            {'lot': lot, 'filterExample': filter_value, 'checkboxTreeExample': [category]}
+            for lot in ('cloud-hosting', 'cloud-software', 'cloud-support')
+            for filter_value in ('option 1', 'option 2')
+            for category in ('option 1', 'option 2.1')
+        ] + [{'lot': 'cloud-software', 'filterExample': 'option 1', 'checkboxTreeExample': ['option 3']}], **kwargs)
+        self.search_api_client.aggregate.side_effect = stub.aggregate
+        return stub
+
+    @pytest.mark.parametrize('url, expected_calls', (
+        ("/g-cloud/search", 1),
+        ("/g-cloud/search?filterExample=option+1", 2),
+        ("/g-cloud/search?lot=cloud-software&filterExample=option+1", 2),
+        ("/g-cloud/search?lot=cloud-software&checkboxTreeExample=option+1", 2),
+    ))
+    def test_build_lots_and_categories_link_tree_batched_matches_one_request_per_lot(self, url, expected_calls):
+        stub = self._use_search_api_stub()
+        per_lot_tree = self._build_tree(url)
+        assert len(stub.aggregate_calls) == 3
+
+        stub.aggregate_calls.clear()
+        self.app.config['DM_SEARCH_AGGREGATION_BATCHING'] = True
+
+        assert self._build_tree(url) == per_lot_tree
+        assert len(stub.aggregate_calls) == expected_calls
+
+    def test_build_lots_and_categories_link_tree_falls_back_to_one_request_per_lot(self):
+        stub = self._use_search_api_stub(reject_multiple_lots=True)
+        per_lot_tree = self._build_tree("/g-cloud/search")
+
+        stub.aggregate_calls.clear()
+        self.app.config['DM_SEARCH_AGGREGATION_BATCHING'] = True
+
+        assert self._build_tree("/g-cloud/search") == per_lot_tree
+        assert [call['lot'] for call in stub.aggregate_calls] == [
+            'cloud-hosting,cloud-software,cloud-support', 'cloud-hosting', 'cloud-software', 'cloud-support',
+        ]
+
+    def test_build_lots_and_categories_link_tree_caches_aggregations(self):
+        stub = self._use_search_api_stub()
+        self.app.config['DM_SEARCH_AGGREGATION_CACHE_TTL'] = 60
+        search_aggregation_cache.init_app(self.app)
+
+        tree = self._build_tree("/g-cloud/search?lot=cloud-software&filterExample=option+1")
+        assert self._build_tree("/g-cloud/search?lot=cloud-software&filterExample=option+1&page=2") == tree
+        assert len(stub.aggregate_calls) == 3
+
+        self._build_tree("/g-cloud/search?lot=cloud-software&filterExample=option+2")
+        assert len(stub.aggregate_calls) == 4  # only cloud-software's counts depend on filterExample
+
     def test_build_lots_and_categories_link_tree_with_lot(self):
         url = "/g-cloud/search?lot=cloud-software"
         with self.app.test_request_context(url):
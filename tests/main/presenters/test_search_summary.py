@@ -1,14 +1,16 @@
 import json
 import os
 
+import mock
+import pytest
 from mock import Mock
+from dmcontent.content_loader import ContentLoader
 from werkzeug.datastructures import MultiDict
 
-from app import content_loader
 from app.main.presenters.search_presenters import filters_for_lot
 from app.main.presenters.search_results import SearchResults
 from app.main.presenters.search_summary import SearchSummary, \
-    SummaryRules, SummaryFragment
+    SummaryRules, SummaryRuleTable, SummaryFragment
 from app.main.helpers import framework_helpers
 from ...helpers import BaseApplicationTest
 
@@ -18,6 +20,8 @@ g9_filter_groups = None
 
 def setup_module(module):
     # TODO we should have example subset search_filter manifests as fixtures
+    # (loaded into a content loader of our own, as the app's is read-only)
+    content_loader = ContentLoader('app/content')
     content_loader.load_manifest('g-cloud-6', 'services', 'services_search_filters')
     content_loader.load_manifest('g-cloud-9', 'services', 'services_search_filters')
 
@@ -347,15 +351,10 @@ class TestSearchSummary(BaseApplicationTest):
 
 class TestSummaryRules:
     def setup_method(self, method):
-        if SummaryRules.loaded is False:
-            SummaryRules.load_rules(manifest=os.path.join(
-                os.path.dirname(__file__),
-                '..',
-                '..',
-                'app',
-                'helpers',
-                'search_summary_manifest.yml'
-            ))
+        SummaryRules.load_rules()
+
+    def teardown_method(self, method):
+        SummaryRules.load_rules()
 
     def test_set_up_where_rules_do_not_exist(self):
         summary_rules = SummaryRules('Sites')
@@ -376,7 +375,7 @@ class TestSummaryRules:
     def test_filter_rules_ids_are_set_if_filterRules_exist(self):
         summary_rules = SummaryRules('Minimum contract period')
         assert hasattr(summary_rules, "filter_rules_ids")
-        assert summary_rules.filter_rules_ids == ['Hour', 'Day', 'Month', 'Year', 'Other']
+        assert list(summary_rules.filter_rules_ids) == ['Hour', 'Day', 'Month', 'Year', 'Other']
 
     def test_add_preposition_with_a_filter_that_has_one(self):
         summary_rules = SummaryRules('Minimum contract period')
@@ -393,17 +392,31 @@ class TestSummaryRules:
         ) == u"<strong>Trial option</strong>"
 
     def test_add_preposition_with_a_filter_without_in_a_group_with_some(self):
-        SummaryRules._rules['Minimum contract period']['filterRules'].remove({
-            'preposition': 'an',
-            'id': 'Hour'
-        })
+        SummaryRules.load_rules(summary_rules=[{
+            'id': 'Minimum contract period',
+            'filterRules': [{'preposition': 'a', 'id': 'Day'}],
+        }])
         summary_rules = SummaryRules('Minimum contract period')
         assert summary_rules.add_filter_preposition(
             filter_id='Hour',
             filter_string=u"<strong>Hour</strong>",
         ) == u"<strong>Hour</strong>"
-        # Make SummaryRules to reload its data
-        SummaryRules.loaded = False
+
+    def test_rules_are_read_only(self):
+        summary_rules = SummaryRules('Minimum contract period')
+        with pytest.raises(TypeError):
+            summary_rules._rules['conjunction'] = 'and'
+        with pytest.raises(AttributeError):
+            summary_rules.get('filterRules').remove({'preposition': 'an', 'id': 'Hour'})
+
+    def test_rules_are_only_read_from_the_manifest_once(self):
+        from_manifest = mock.Mock(wraps=SummaryRuleTable.from_manifest)
+        with mock.patch.object(SummaryRuleTable, 'from_manifest', from_manifest):
+            SummaryRules._table = None
+            SummaryRules('Categories')
+            SummaryRules('Pricing')
+
+        assert from_manifest.call_count == 1
 
 
 class TestSummaryFragment:
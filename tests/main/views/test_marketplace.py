@@ -401,6 +401,18 @@ class TestStaticMarketplacePages(BaseApplicationTest):
         document = html.fromstring(res.get_data(as_text=True))
         assert len(document.xpath('//h1[contains(text(), "Cookies on Digital Marketplace")]')) == 1
 
+    def test_content_pages_are_only_shared_by_edge_caches_once_the_cookie_probe_is_set(self):
+        res = self.client.get('/cookies')
+        assert res.status_code == 200
+        assert any(cookie.startswith('dm_cookie_probe=') for cookie in res.headers.getlist('Set-Cookie'))
+        assert set(res.headers['Cache-Control'].split(', ')) == {'private', 'no-cache'}
+
+        self.client.set_cookie('localhost', 'dm_cookie_probe', 'yum')
+        res = self.client.get('/cookies')
+        assert res.status_code == 200
+        assert 'Set-Cookie' not in res.headers
+        assert set(res.headers['Cache-Control'].split(', ')) == {'public', 'max-age=0', 's-maxage=3600'}
+
     def test_terms_and_conditions_page(self):
         res = self.client.get('/terms-and-conditions')
         assert res.status_code == 200
@@ -1922,7 +1934,7 @@ class TestCatalogueOfBriefsFilterOnClick(APIClientMixin, BaseApplicationTest):
         ))
 
         for k, v in data.items():
-            assert set(v.keys()) == {'selector', 'html'}
+            assert set(v.keys()) == {'selector', 'hash', 'html'}
 
             # We want to enforce using css IDs to describe the nodes which should be replaced.
             assert v['selector'].startswith('#')
@@ -1950,6 +1962,24 @@ class TestCatalogueOfBriefsFilterOnClick(APIClientMixin, BaseApplicationTest):
 
         assert urls == tuple(x[0][0] for x in render_template_patch.call_args_list)
 
+    @mock.patch('app.main.views.marketplace.render_template', autospec=True)
+    def test_live_results_renders_only_requested_fragments(self, render_template_patch):
+        render_template_patch.return_value = '<p>some html</p>'
+
+        res = self.client.get(
+            '/digital-outcomes-and-specialists/opportunities'
+            '?live-results=true&live-results-fragments=summary,filter-title,not-a-fragment'
+        )
+        data = json.loads(res.get_data(as_text=True))
+
+        assert sorted(data.keys()) == ['filter-title', 'summary']
+        assert tuple(x[0][0] for x in render_template_patch.call_args_list) == (
+            "search/_summary.html",
+            "search/_filter_title.html",
+        )
+        # the category tree isn't needed, so neither are the aggregations to count its services
+        assert self.search_api_client.aggregate.call_args_list == []
+
     def test_form_has_filter_button_by_default(self):
         res = self.client.get('/digital-outcomes-and-specialists/opportunities')
         assert res.status_code == 200
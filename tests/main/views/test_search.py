@@ -716,7 +716,7 @@ class TestSearchFilterOnClick(APIClientMixin, BaseApplicationTest):
         ))
 
         for k, v in data.items():
-            assert set(v.keys()) == {'selector', 'html'}
+            assert set(v.keys()) == {'selector', 'hash', 'html'}
 
             # We want to enforce using css IDs to describe the nodes which should be replaced.
             assert v['selector'].startswith('#')
@@ -745,6 +745,54 @@ class TestSearchFilterOnClick(APIClientMixin, BaseApplicationTest):
 
         assert urls == tuple(x[0][0] for x in render_template_patch.call_args_list)
 
+    @mock.patch('app.main.views.g_cloud.render_template', autospec=True)
+    def test_live_results_renders_only_requested_fragments(self, render_template_patch):
+        render_template_patch.return_value = '<p>some html</p>'
+
+        res = self.client.get(
+            '/g-cloud/search?live-results=true&live-results-fragments=summary,filter-title,not-a-fragment'
+        )
+        data = json.loads(res.get_data(as_text=True))
+
+        assert sorted(data.keys()) == ['filter-title', 'summary']
+        assert tuple(x[0][0] for x in render_template_patch.call_args_list) == (
+            "search/_summary.html",
+            "search/_filter_title.html",
+        )
+        # the category tree isn't needed, so neither are the aggregations to count its services
+        assert self.search_api_client.aggregate.call_args_list == []
+
+    def test_search_returns_not_modified_if_results_have_not_changed(self):
+        etag = self.client.get('/g-cloud/search?q=email').headers['ETag']
+        self.search_api_client.aggregate.reset_mock()
+
+        with mock.patch('app.main.views.g_cloud.render_template', autospec=True) as render_template:
+            res = self.client.get('/g-cloud/search?q=email', headers={'If-None-Match': etag})
+
+        assert res.status_code == 304
+        assert res.headers['ETag'] == etag
+        assert render_template.call_args_list == []
+
+        for url, search_results in (
+            ('/g-cloud/search?q=email&page=2', self.search_results),
+            ('/g-cloud/search?q=email&live-results=true', self.search_results),
+            ('/g-cloud/search?q=email', self.search_results_multiple_page),
+        ):
+            self.search_api_client.search.return_value = search_results
+            assert self.client.get(url, headers={'If-None-Match': etag}).status_code == 200
+
+    def test_search_returns_page_if_category_counts_have_changed(self):
+        etag = self.client.get('/g-cloud/search?q=email').headers['ETag']
+
+        aggregations = self._get_fixture_data('g9_aggregations_fixture.json')
+        aggregations['aggregations']['serviceCategories'] = {}
+        self.search_api_client.aggregate.return_value = aggregations
+
+        res = self.client.get('/g-cloud/search?q=email', headers={'If-None-Match': etag})
+
+        assert res.status_code == 200
+        assert res.headers['ETag'] != etag
+
     def test_g_cloud_search_has_filter_button_by_default(self):
         res = self.client.get('/g-cloud/search')
         assert res.status_code == 200
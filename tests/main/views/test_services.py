@@ -1,7 +1,12 @@
 import re
 
+import mock
+import pytest
+from dmapiclient import HTTPError
 from lxml import html
 
+from app import content_loader
+from app.content_loaders import SharedContentLoader
 from app.main.helpers import framework_helpers
 from ...helpers import BaseApplicationTest, BaseAPIClientMixin
 
@@ -188,6 +193,12 @@ class TestServicePage(DataAPIClientMixin, BaseApplicationTest):
     def test_g6_service_page_url(self):
         self._assert_service_page_url()
 
+    def test_service_page_is_rendered_from_the_shared_content_loader(self):
+        self._assert_service_page_url()
+
+        assert isinstance(content_loader._get_current_object(), SharedContentLoader)
+        assert content_loader._content['g-cloud-6'] is self.injected_content_loader._content['g-cloud-6']
+
     def test_published_service_doesnt_have_unavailable_banner(self):
         service_id = self.service['services']['id']
         res = self.client.get('/g-cloud/services/{}'.format(service_id))
@@ -322,6 +333,31 @@ class TestServicePage(DataAPIClientMixin, BaseApplicationTest):
 
         assert 'Certifications' not in attribute_headings
 
+    @pytest.mark.parametrize('workers', (0, 3))
+    def test_fetches_framework_declaration_and_supplier_once_service_is_known(self, workers):
+        self.app.config['DM_SERVICE_PAGE_FETCH_WORKERS'] = workers
+        service_id = self.service['services']['id']
+
+        res = self.client.get(f'/g-cloud/services/{service_id}')
+
+        assert res.status_code == 200
+        assert self.data_api_client.get_framework.call_args_list == [mock.call('g-cloud-6')]
+        assert self.data_api_client.get_supplier_framework_info.call_args_list == [
+            mock.call(self.service['services']['supplierId'], 'g-cloud-6')
+        ]
+        assert self.data_api_client.get_supplier.call_args_list == [mock.call(self.service['services']['supplierId'])]
+        self._assert_contact_details(html.fromstring(res.get_data(as_text=True)))
+
+    @pytest.mark.parametrize('workers', (0, 3))
+    @pytest.mark.parametrize('failing_call', ('get_framework', 'get_supplier_framework_info', 'get_supplier'))
+    def test_api_errors_fetching_service_page_dependencies_are_passed_on(self, failing_call, workers):
+        self.app.config['DM_SERVICE_PAGE_FETCH_WORKERS'] = workers
+        getattr(self.data_api_client, failing_call).side_effect = HTTPError(mock.Mock(status_code=503))
+
+        res = self.client.get('/g-cloud/services/{}'.format(self.service['services']['id']))
+
+        assert res.status_code == 503
+
     def test_deleted_service_causes_404(self):
         self.service["services"]["status"] = "deleted"
         self.data_api_client.get_service.return_value = self.service
@@ -329,3 +365,22 @@ class TestServicePage(DataAPIClientMixin, BaseApplicationTest):
         service_id = self.service['services']['id']
         res = self.client.get(f'/g-cloud/services/{service_id}')
         assert res.status_code == 404
+
+
+class TestServicePageWithOwnContentLoader(DataAPIClientMixin, BaseApplicationTest):
+    shared_content_loader = False
+
+    def setup_method(self, method):
+        super().setup_method(method)
+
+        self.data_api_client.get_supplier.return_value = self._get_supplier_fixture_data()
+        self.data_api_client.get_framework.return_value = self._get_framework_fixture_data('g-cloud-6')
+        self.data_api_client.get_service.return_value = self._get_g6_service_fixture_data()
+
+    def test_service_page_is_rendered_from_a_copy_of_the_content_loader(self):
+        res = self.client.get('/g-cloud/services/1234567890123456')
+        assert res.status_code == 200
+
+        assert not isinstance(content_loader._get_current_object(), SharedContentLoader)
+        assert content_loader._content is not self.injected_content_loader._content
+        assert content_loader.get_manifest('g-cloud-6', 'display_service').sections
@@ -219,6 +219,19 @@ class TestSuppliersPage(DataAPIClientMixin, BaseApplicationTest):
             pg="page=3",
         )
 
+    def test_should_return_not_modified_if_suppliers_have_not_changed(self):
+        etag = self.client.get('/g-cloud/suppliers?prefix=M').headers['ETag']
+
+        with mock.patch('app.main.views.suppliers.render_template', autospec=True) as render_template:
+            res = self.client.get('/g-cloud/suppliers?prefix=M', headers={'If-None-Match': etag})
+
+        assert res.status_code == 304
+        assert res.headers['ETag'] == etag
+        assert render_template.call_args_list == []
+
+        self.data_api_client.find_suppliers.return_value = self.suppliers_by_prefix_page_2
+        assert self.client.get('/g-cloud/suppliers?prefix=M', headers={'If-None-Match': etag}).status_code == 200
+
     def test_should_redirect_to_apply_to_supply_when_no_live_frameworks(self):
         gcloud9_framework = self._get_expired_framework_fixture_data('g-cloud-9')['frameworks']
         self.data_api_client.find_frameworks.return_value = {'frameworks': [gcloud9_framework]}
@@ -0,0 +1,49 @@
+from collections import Counter
+
+from dmapiclient import HTTPError
+
+
+class SearchAPIStub(object):
+    """
+    Stand-in for the search API's aggregations endpoint that counts a fixed list of documents, for checking that
+    different ways of asking for the same counts agree.
+
+    Filters follow the search API's rules: a comma-separated string matches documents with any of the values, a list
+    matches documents with all of them.
+    """
+
+    def __init__(self, documents, reject_multiple_lots=False):
+        self.documents = documents
+        self.reject_multiple_lots = reject_multiple_lots
+        self.aggregate_calls = []
+
+    @staticmethod
+    def _values(document, field):
+        value = document.get(field, ())
+        return set(value) if isinstance(value, (list, tuple)) else {value}
+
+    def _matches(self, document, filters):
+        for field, value in filters.items():
+            values = self._values(document, field)
+            if isinstance(value, list):
+                if not set(value) <= values:
+                    return False
+            elif not values.intersection(value.split(',')):
+                return False
+
+        return True
+
+    def aggregate(self, index, doc_type, q=None, aggregations=(), **filters):
+        self.aggregate_calls.append(dict(filters, index=index, doc_type=doc_type, aggregations=set(aggregations)))
+        if self.reject_multiple_lots and ',' in filters.get('lot', ''):
+            raise HTTPError(message="Unsupported filter")
+
+        documents = [document for document in self.documents if self._matches(document, filters)]
+
+        return {
+            'aggregations': {
+                field: dict(Counter(value for document in documents for value in self._values(document, field)))
+                for field in aggregations
+            },
+            'meta': {'total': len(documents), 'query': dict(filters, q=q) if q else filters},
+        }
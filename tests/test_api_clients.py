@@ -0,0 +1,76 @@
+import mock
+import pytest
+from flask import Flask
+
+from app.api_clients import DataAPIClient, SearchAPIClient, get_request_memo
+
+
+class TestRequestMemoization():
+    def setup_method(self, method):
+        self.app = Flask(__name__)
+        self.app.config['DM_API_REQUEST_MEMOIZATION'] = True
+
+        self.request_patch = mock.patch('dmapiclient.base.BaseAPIClient._request')
+        self._request = self.request_patch.start()
+        self._request.side_effect = lambda method, url, **kwargs: {'url': url, 'params': kwargs['params']}
+
+        self.data_api_client = DataAPIClient('http://data-api', 'token')
+        self.search_api_client = SearchAPIClient('http://search-api', 'token')
+
+    def teardown_method(self, method):
+        self.request_patch.stop()
+
+    def test_identical_reads_only_hit_the_api_once(self):
+        with self.app.test_request_context('/'):
+            assert self.data_api_client.get_framework('g-cloud-12') == self.data_api_client.get_framework('g-cloud-12')
+
+            assert self._request.call_count == 1
+            assert (get_request_memo().hits, get_request_memo().misses) == (1, 1)
+
+    def test_different_reads_are_not_memoized_together(self):
+        with self.app.test_request_context('/'):
+            self.data_api_client.get_framework('g-cloud-12')
+            self.data_api_client.get_framework('g-cloud-11')
+            self.search_api_client.search(index='g-cloud-12', doc_type='services', q='email')
+            self.search_api_client.search(index='g-cloud-12', doc_type='services', q='cloud')
+
+            assert self._request.call_count == 4
+            assert (get_request_memo().hits, get_request_memo().misses) == (0, 4)
+
+    def test_callers_can_not_change_memoized_responses(self):
+        with self.app.test_request_context('/'):
+            self.data_api_client.get_framework('g-cloud-12')['url'] = 'changed'
+
+            assert self.data_api_client.get_framework('g-cloud-12')['url'] != 'changed'
+
+    def test_writes_clear_the_memo(self):
+        with self.app.test_request_context('/'):
+            self.data_api_client.get_direct_award_project(1)
+            self.data_api_client.update_direct_award_project(1, {'readyToAssess': True}, 'buyer@example.com')
+            self.data_api_client.get_direct_award_project(1)
+
+            assert [c[0][0] for c in self._request.call_args_list] == ['GET', 'PATCH', 'GET']
+
+    def test_memo_is_not_shared_between_requests(self):
+        with self.app.test_request_context('/'):
+            self.data_api_client.get_framework('g-cloud-12')
+        with self.app.test_request_context('/'):
+            self.data_api_client.get_framework('g-cloud-12')
+
+        assert self._request.call_count == 2
+
+    @pytest.mark.parametrize('enabled, expected_call_count', ((True, 1), (False, 2)))
+    def test_memoization_can_be_disabled(self, enabled, expected_call_count):
+        self.app.config['DM_API_REQUEST_MEMOIZATION'] = enabled
+        with self.app.test_request_context('/'):
+            self.data_api_client.get_framework('g-cloud-12')
+            self.data_api_client.get_framework('g-cloud-12')
+
+        assert self._request.call_count == expected_call_count
+
+    def test_no_memoization_outside_a_request(self):
+        with self.app.app_context():
+            self.data_api_client.get_framework('g-cloud-12')
+            self.data_api_client.get_framework('g-cloud-12')
+
+        assert self._request.call_count == 2
@@ -0,0 +1,141 @@
+import mock
+import pytest
+
+from dmcontent.content_loader import ContentLoader
+from dmcontent.errors import ContentNotFoundError
+from flask import Flask
+
+from app.content_loaders import LazyManifests, SharedContentLoader, lazy_load_manifests, warm_manifests
+
+
+class TestSharedContentLoader():
+    @pytest.fixture(autouse=True)
+    def primary(self, tmp_path):
+        messages_path = tmp_path / 'frameworks' / 'g-cloud-12' / 'messages'
+        messages_path.mkdir(parents=True)
+        (messages_path / 'urls.yml').write_text('framework_agreement_url: https://example.com/agreement\n')
+        (messages_path / 'descriptions.yml').write_text('framework: G-Cloud 12\n')
+
+        self.primary = ContentLoader(str(tmp_path))
+        self.primary._content['g-cloud-12']['display_service'] = []
+        self.primary.load_messages('g-cloud-12', ['urls'])
+        self.primary._metadata['g-cloud-12']['following_framework'] = {'framework': {'slug': 'g-cloud-13'}}
+
+    def test_shares_content_with_primary(self):
+        view = SharedContentLoader(self.primary)
+
+        assert view._content['g-cloud-12'] is self.primary._content['g-cloud-12']
+        assert view.get_manifest('g-cloud-12', 'display_service').sections == []
+        assert view.get_metadata('g-cloud-12', 'following_framework', 'framework')['slug'] == 'g-cloud-13'
+
+    @pytest.mark.parametrize('method, args', (
+        ('get_manifest', ('g-cloud-99', 'display_service')),
+        ('get_metadata', ('g-cloud-99', 'following_framework')),
+        ('get_question', ('g-cloud-99', 'services', 'serviceName')),
+        ('get_question', ('g-cloud-12', 'services', 'serviceName')),
+    ))
+    def test_looking_up_missing_content_does_not_add_to_shared_content(self, method, args):
+        view = SharedContentLoader(self.primary)
+
+        with pytest.raises(ContentNotFoundError):
+            getattr(view, method)(*args)
+
+        assert set(self.primary._content) == set(self.primary._metadata) == {'g-cloud-12'}
+        assert dict(self.primary._questions) == {}
+
+    def test_sees_messages_loaded_into_primary(self):
+        view = SharedContentLoader(self.primary)
+
+        assert view.get_message('g-cloud-12', 'urls', 'framework_agreement_url') == 'https://example.com/agreement'
+
+    def test_messages_loaded_into_a_view_are_not_shared(self):
+        view = SharedContentLoader(self.primary)
+        other_view = SharedContentLoader(self.primary)
+
+        view.load_messages('g-cloud-12', ['descriptions'])
+
+        assert view.get_message('g-cloud-12', 'descriptions', 'framework') == 'G-Cloud 12'
+        assert 'descriptions' not in other_view._messages['g-cloud-12']
+        assert 'descriptions' not in self.primary._messages['g-cloud-12']
+
+    def test_does_not_reload_messages_it_already_has(self):
+        view = SharedContentLoader(self.primary)
+
+        with mock.patch.object(view, '_load_message', wraps=view._load_message) as _load_message:
+            view.load_messages('g-cloud-12', ['urls', 'descriptions'])
+            view.load_messages('g-cloud-12', ['urls', 'descriptions'])
+
+        assert _load_message.call_args_list == [mock.call('g-cloud-12', 'descriptions')]
+
+    @pytest.mark.parametrize('method, args', (
+        ('load_manifest', ('g-cloud-12', 'services', 'display_service')),
+        ('lazy_load_manifests', ('g-cloud-12', {'display_service': 'services'})),
+        ('load_metadata', ('g-cloud-12', ['following_framework'])),
+    ))
+    def test_cannot_load_shared_content(self, method, args):
+        view = SharedContentLoader(self.primary)
+
+        with pytest.raises(TypeError):
+            getattr(view, method)(*args)
+
+
+class TestLazyManifests():
+    def setup_method(self, method):
+        self.generate_manifest = mock.Mock(side_effect=lambda slug, question_set, manifest: [manifest])
+        self.manifests = LazyManifests(self.generate_manifest, 'g-cloud-12', {
+            'display_service': 'services',
+            'download_results': 'services',
+        })
+
+    def test_generates_each_manifest_once_on_first_access(self):
+        assert self.generate_manifest.call_args_list == []
+
+        assert self.manifests['display_service'] == ['display_service']
+        assert self.manifests['display_service'] == ['display_service']
+
+        assert self.generate_manifest.call_args_list == [mock.call('g-cloud-12', 'services', 'display_service')]
+        assert self.manifests.is_loaded('display_service')
+        assert not self.manifests.is_loaded('download_results')
+
+    def test_contains_does_not_generate_manifest(self):
+        assert 'display_service' in self.manifests
+        assert 'services_search_filters' not in self.manifests
+        assert self.generate_manifest.call_args_list == []
+
+    def test_forgets_missing_manifests(self):
+        self.generate_manifest.side_effect = ContentNotFoundError('No manifest')
+
+        with pytest.raises(ContentNotFoundError):
+            self.manifests['display_service']
+        with pytest.raises(KeyError):
+            self.manifests['display_service']
+
+        assert self.generate_manifest.call_count == 1
+
+    def test_lazy_load_manifests_keeps_loaded_manifests(self):
+        content_loader = ContentLoader('app/content')
+        content_loader._content['g-cloud-12']['display_service'] = ['loaded']
+        content_loader.generate_manifest = self.generate_manifest
+
+        lazy_load_manifests(content_loader, 'g-cloud-12', {'download_results': 'services'})
+
+        assert content_loader._content['g-cloud-12']['display_service'] == ['loaded']
+        assert content_loader._content['g-cloud-12']['download_results'] == ['download_results']
+
+    def test_warm_manifests_loads_live_frameworks_first_and_skips_expired_ones(self):
+        content_loader = ContentLoader('app/content')
+        content_loader.generate_manifest = self.generate_manifest
+        for framework_slug in ('g-cloud-11', 'g-cloud-12', 'g-cloud-13'):
+            lazy_load_manifests(content_loader, framework_slug, {'display_service': 'services'})
+
+        warm_manifests(Flask(__name__), content_loader, [
+            {'slug': 'g-cloud-11', 'status': 'expired'},
+            {'slug': 'g-cloud-13', 'status': 'open'},
+            {'slug': 'g-cloud-12', 'status': 'live'},
+        ]).join()
+
+        assert self.generate_manifest.call_args_list == [
+            mock.call('g-cloud-12', 'services', 'display_service'),
+            mock.call('g-cloud-13', 'services', 'display_service'),
+        ]
+        assert not content_loader._content['g-cloud-11'].is_loaded('display_service')
@@ -0,0 +1,100 @@
+import shutil
+
+import dmcontent
+import mock
+import pytest
+from flask import Flask
+
+from app.content_snapshot import build_content_snapshot, get_content_version, load_content_snapshot
+
+
+class TestContentSnapshot():
+    @pytest.fixture(autouse=True)
+    def content(self, tmp_path):
+        self.content_path = tmp_path / 'content'
+        framework_path = self.content_path / 'frameworks' / 'g-cloud-12'
+        for directory in ('manifests', 'messages', 'questions/services'):
+            (framework_path / directory).mkdir(parents=True)
+        for manifest in ('services_search_filters', 'display_service', 'download_results'):
+            (framework_path / 'manifests' / f'{manifest}.yml').write_text(
+                '- name: About the service\n  questions:\n    - serviceName\n'
+            )
+        (framework_path / 'questions' / 'services' / 'serviceName.yml').write_text(
+            'question: Service name\nhint: "Up to {{ limit }} characters"\ntype: text\n'
+        )
+        (framework_path / 'messages' / 'urls.yml').write_text('framework_agreement_url: https://example.com\n')
+
+        self.summary_rules_path = tmp_path / 'search_summary_manifest.yml'
+        self.summary_rules_path.write_text('- id: categories\n  labelPreposition: in the category\n')
+
+        self.snapshot_path = tmp_path / 'snapshot.pickle'
+        self.app = Flask(__name__)
+        self.app.config['DM_CONTENT_SNAPSHOT_PATH'] = str(self.snapshot_path)
+
+    def build(self):
+        return build_content_snapshot(
+            self.app, str(self.content_path), str(self.snapshot_path), str(self.summary_rules_path)
+        )
+
+    def load(self):
+        return load_content_snapshot(self.app)
+
+    def test_round_trips_content_and_summary_rules(self):
+        self.build()
+        snapshot = self.load()
+
+        manifest = snapshot.content_loader.get_manifest('g-cloud-12', 'display_service')
+        assert manifest.get_question('serviceName').question == 'Service name'
+        hint = snapshot.content_loader._content['g-cloud-12']['display_service'][0]['questions'][0]['hint']
+        assert hint.render({'limit': 100}) == 'Up to 100 characters'
+        assert snapshot.content_loader.get_message('g-cloud-12', 'urls', 'framework_agreement_url') == (
+            'https://example.com'
+        )
+        assert snapshot.summary_rules == [{'id': 'categories', 'labelPreposition': 'in the category'}]
+
+    def test_loads_snapshot_of_unchanged_content(self):
+        content_version = get_content_version(str(self.content_path), str(self.summary_rules_path))
+        self.build()
+
+        assert self.load().version == content_version
+
+    @pytest.mark.parametrize('change', (
+        lambda content_path, summary_rules_path: (
+            content_path / 'frameworks' / 'g-cloud-12' / 'questions' / 'services' / 'serviceName.yml'
+        ).write_text('question: Name of the service\ntype: text\n'),
+        lambda content_path, summary_rules_path: (
+            content_path / 'frameworks' / 'g-cloud-12' / 'messages' / 'dates.yml'
+        ).write_text('framework_live_at: 2020-01-01\n'),
+        lambda content_path, summary_rules_path: summary_rules_path.write_text('- id: categories\n'),
+    ))
+    def test_ignores_snapshot_if_content_has_changed(self, change):
+        self.build()
+        change(self.content_path, self.summary_rules_path)
+
+        assert self.load() is None
+
+    def test_ignores_snapshot_if_content_has_gone(self):
+        self.build()
+        shutil.rmtree(self.content_path)
+
+        assert self.load() is None
+
+    def test_ignores_snapshot_built_with_another_dmcontent_version(self):
+        self.build()
+
+        with mock.patch.object(dmcontent, '__version__', '0.0.0'):
+            assert self.load() is None
+
+    def test_ignores_missing_snapshot(self):
+        assert self.load() is None
+
+    def test_ignores_corrupt_snapshot(self):
+        self.snapshot_path.write_bytes(b'not a pickle')
+
+        assert self.load() is None
+
+    def test_disabled_without_a_snapshot_path(self):
+        self.build()
+        self.app.config['DM_CONTENT_SNAPSHOT_PATH'] = None
+
+        assert self.load() is None
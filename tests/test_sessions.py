@@ -0,0 +1,105 @@
+from datetime import timedelta
+import pickle
+
+import flask
+import flask_session
+import mock
+import pytest
+from flask_login import LoginManager, UserMixin, login_user
+
+from app import sessions
+
+
+class User(UserMixin):
+    def __init__(self, user_id):
+        self.id = user_id
+
+
+@pytest.fixture
+def app():
+    app = flask.Flask(__name__)
+    app.config.update(
+        SECRET_KEY='secret',
+        PERMANENT_SESSION_LIFETIME=timedelta(hours=1),
+        SESSION_REFRESH_EACH_REQUEST=False,
+        DM_SESSION_REFRESH_FRACTION=0.25,
+        DM_COOKIE_PROBE_COOKIE_NAME='dm_cookie_probe',
+        DM_COOKIE_PROBE_COOKIE_VALUE='yum',
+    )
+    LoginManager(app).user_loader(User)
+
+    @app.route('/')
+    def page():
+        return 'page'
+
+    @app.route('/login')
+    def login():
+        login_user(User('123'))
+        return 'logged in'
+
+    @app.route('/probe')
+    def probe():
+        response = flask.make_response('probe')
+        response.set_cookie('dm_cookie_probe', 'yum')
+        response.set_cookie('other', 'cookie')
+        return sessions.drop_repeated_cookie_probe(response)
+
+    return app
+
+
+class TestRefreshSession():
+    @pytest.fixture(autouse=True)
+    def client(self, app):
+        sessions.init_app(app)
+        self.client = app.test_client()
+
+    def test_anonymous_responses_do_not_set_cookie(self):
+        assert self.client.get('/').headers.getlist('Set-Cookie') == []
+
+    def test_logged_in_session_is_only_refreshed_after_fraction_of_lifetime(self):
+        with mock.patch('app.sessions.time', return_value=1000):
+            assert self.client.get('/login').headers.getlist('Set-Cookie')
+            assert self.client.get('/').headers.getlist('Set-Cookie')
+
+        for now, refreshed in ((1000 + 899, False), (1000 + 900, True), (1000 + 901, False)):
+            with mock.patch('app.sessions.time', return_value=now):
+                assert bool(self.client.get('/').headers.getlist('Set-Cookie')) is refreshed
+
+        with self.client.session_transaction() as session:
+            assert session.permanent
+            assert session['_refreshed_at'] == 1900
+
+
+class TestRedisSessionInterface():
+    @pytest.fixture(autouse=True)
+    def client(self, app):
+        self.redis = mock.Mock()
+        self.redis.get.return_value = None
+        app.session_interface = flask_session.RedisSessionInterface(self.redis, 'session:', True, True)
+        sessions.init_app(app)
+        self.client = app.test_client()
+
+    def test_replaces_flask_sessions_interface(self, app):
+        assert isinstance(app.session_interface, sessions.RedisSessionInterface)
+        assert app.session_interface.redis is self.redis
+
+    def test_unchanged_sessions_are_not_saved(self):
+        assert self.client.get('/').headers.getlist('Set-Cookie') == []
+        assert self.redis.setex.call_args_list == []
+
+    def test_changed_sessions_are_saved_as_permanent(self):
+        assert self.client.get('/login').headers.getlist('Set-Cookie')
+        assert self.redis.setex.call_count == 1
+        assert pickle.loads(self.redis.setex.call_args[1]['value'])['_permanent'] is True
+
+
+@pytest.mark.parametrize('cookies, probe_sent', (({}, True), ({'dm_cookie_probe': 'yum'}, False)))
+def test_drop_repeated_cookie_probe(app, cookies, probe_sent):
+    client = app.test_client()
+    for name, value in cookies.items():
+        client.set_cookie('localhost', name, value)
+
+    set_cookies = client.get('/probe').headers.getlist('Set-Cookie')
+
+    assert any(cookie.startswith('dm_cookie_probe=') for cookie in set_cookies) is probe_sent
+    assert any(cookie.startswith('other=') for cookie in set_cookies)